@@ -0,0 +1,5 @@
+"""
+DFW HVAC demographics pipeline
+Shared Census ACS fetch/processing code used by merge_service_area.py
+and housing_analysis.py
+"""
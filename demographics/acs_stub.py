@@ -0,0 +1,211 @@
+"""
+Local stand-in for the Census ACS API
+A threaded HTTP server on 127.0.0.1 that answers ZCTA queries the way
+api.census.gov does ([headers, *rows] JSON, only the requested variables,
+ZCTAs it has no data for left out), replaying rows from a recording. Latency
+and error rates are configurable, so the client's concurrency, retries and
+bisection can be exercised and benchmarked with no network.
+
+    recording = Recording.from_cache()          # rows from cached real responses
+    with ACSStub(recording, latency=0.05, error_rate=0.02) as stub:
+        client = CensusClient(base_url=stub.url)
+
+A recording is a JSON file {"headers": [...], "rows": {zcta: [...]}};
+Recording.synthetic() makes a deterministic one of any size.
+"""
+
+import gzip
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+from demographics.cache import SUFFIX
+from demographics.client import ZCTA_FIELD
+from demographics.config import CACHE_DIR, HOUSING_VARIABLES
+
+
+class Recording:
+    """ACS rows by ZCTA; `headers` are the variables each row holds, in order"""
+
+    def __init__(self, headers, rows):
+        self.headers = list(headers)
+        self.rows = dict(rows)
+        self._index = {name: i for i, name in enumerate(self.headers)}
+
+    def __len__(self):
+        return len(self.rows)
+
+    def zctas(self):
+        return sorted(self.rows)
+
+    def table(self, variables, zctas):
+        """[headers, *rows] for `variables`; raises KeyError for a variable not recorded"""
+        columns = [self._index[v] for v in variables]
+        if zctas == ["*"]:
+            zctas = self.zctas()
+        rows = [[self.rows[z][i] for i in columns] + [z] for z in zctas if z in self.rows]
+        return [list(variables) + [ZCTA_FIELD]] + rows
+
+    @classmethod
+    def synthetic(cls, zctas, variables=HOUSING_VARIABLES):
+        """Deterministic plausible rows: NAME, counts with a consistent total, medians"""
+        rows = {}
+        for z in zctas:
+            n = int(z)
+            total = 200 + n % 5000
+            values = []
+            for v in variables:
+                if v == "NAME":
+                    values.append(f"ZCTA5 {z}")
+                elif v == "B25024_001E":
+                    values.append(str(total))
+                elif v == "B25035_001E":
+                    values.append(str(1950 + n % 70))
+                elif v in ("B19013_001E", "B25077_001E"):
+                    values.append(str(35000 + (n * 37) % 150000))
+                else:
+                    values.append(str(total * (n % 10) // 10))
+            rows[z] = values
+        return cls(variables, rows)
+
+    @classmethod
+    def from_tables(cls, tables):
+        """Recording from [headers, *rows] ZCTA tables (the first table's variables)"""
+        tables = [t for t in tables if t]
+        if not tables:
+            raise ValueError("No ACS tables to record")
+        headers = [h for h in tables[0][0] if h != ZCTA_FIELD]
+        rows = {}
+        for table in tables:
+            if [h for h in table[0] if h != ZCTA_FIELD] != headers:
+                continue
+            zcta_col = table[0].index(ZCTA_FIELD)
+            for row in table[1:]:
+                rows[row[zcta_col]] = [v for i, v in enumerate(row) if i != zcta_col]
+        return cls(headers, rows)
+
+    @classmethod
+    def from_cache(cls, directory=CACHE_DIR):
+        """Recording from every cached ZCTA response with the most common variable list"""
+        tables = []
+        for path in sorted(Path(directory).glob(f"*{SUFFIX}")):
+            with gzip.open(path, "rb") as f:
+                data = json.loads(f.read())
+            if data and ZCTA_FIELD in data[0]:
+                tables.append(data)
+        if not tables:
+            raise ValueError(f"No cached ZCTA responses in {directory}")
+        headers = [tuple(t[0]) for t in tables]
+        common = max(set(headers), key=headers.count)
+        return cls.from_tables([t for t in tables if tuple(t[0]) == common])
+
+    @classmethod
+    def load(cls, path):
+        with open(path, encoding="utf-8") as f:
+            payload = json.load(f)
+        return cls(payload["headers"], payload["rows"])
+
+    def save(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"headers": self.headers, "rows": self.rows}, f, separators=(",", ":"))
+
+
+class ACSStub:
+    """Serves a Recording over HTTP with injected latency and errors
+
+    latency: seconds added to every response (plus up to `jitter` more)
+    error_rate: share of requests answered with one of `error_statuses`
+    """
+
+    def __init__(self, recording, latency=0.0, jitter=0.0, error_rate=0.0,
+                 error_statuses=(503, 429), seed=0, port=0):
+        self.recording = recording
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_statuses = tuple(error_statuses)
+        self.requests = 0
+        self.errors = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        """Dataset base URL to pass to CensusClient"""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/data/acs/acs5"
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                status, body = stub.respond(self.path)
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def respond(self, path):
+        """(status, body) for a request path; also usable without the server"""
+        with self._lock:
+            self.requests += 1
+            delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0)
+            failed = self._random.random() < self.error_rate
+            if failed:
+                self.errors += 1
+                status = self._random.choice(self.error_statuses)
+        if delay:
+            time.sleep(delay)
+        if failed:
+            return status, b"error"
+
+        query = parse_qs(urlsplit(path).query)
+        try:
+            variables = query["get"][0].split(",")
+            geography, _, zctas = query["for"][0].rpartition(":")
+        except (KeyError, IndexError):
+            return 400, b"error: missing get/for"
+        if geography != ZCTA_FIELD:
+            return 400, f"error: unsupported geography {geography}".encode()
+        try:
+            table = self.recording.table(variables, zctas.split(","))
+        except KeyError as e:
+            return 400, f"error: unknown variable {e.args[0]}".encode()
+        if len(table) == 1:
+            return 204, b""
+        return 200, json.dumps(table).encode("utf-8")
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._thread is not None:
+            # shutdown() blocks until serve_forever() returns, so only after start()
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
@@ -0,0 +1,64 @@
+"""
+ZIP code lists and lookups shared by the demographics scripts
+"""
+
+# housing_analysis.py zip codes (provided by user)
+ZIP_CODES = [
+    "75019", "75063", "75067", "76051", "75039", "75006", "75010", "75234", "75007", "75057",
+    "75261", "75028", "75038", "75056", "75229", "75022", "76092", "75025", "75093", "75248",
+    "75065", "76022", "75024", "76180", "75050", "75023", "75077", "75034", "75252", "75051",
+    "76148", "75240", "75219", "75061", "76040", "75220", "76021", "76005", "75062", "75244",
+    "75205", "75060", "76248", "75235", "76053", "75036", "76039", "75001", "76054", "76210",
+    "75212", "75204", "76034", "75225", "75287", "76182", "75209", "75251", "75390", "75231",
+    "75270", "75230", "75238", "75254", "75081", "75206", "75247", "75202", "76155", "75075",
+    "75080", "76006", "75243", "76118", "75211", "75201", "76244", "76011", "75042", "76262",
+    "75207", "75208", "75246", "75214", "75013", "76137", "76205", "75035", "76226", "75041",
+    "75074", "75033", "75082", "76117", "76120", "76010", "75044", "75218", "76012", "75070",
+    "76208", "75236", "75068", "76177", "75052", "75226"
+]
+
+# Zip code to city mapping for DFW area
+ZIP_TO_CITY = {
+    "75001": "Addison", "75002": "Allen", "75006": "Carrollton", "75007": "Carrollton",
+    "75010": "Carrollton", "75013": "Allen", "75019": "Coppell", "75022": "Flower Mound",
+    "75023": "Plano", "75024": "Plano", "75025": "Plano", "75028": "Flower Mound",
+    "75032": "Rockwall", "75033": "Frisco", "75034": "Frisco", "75035": "Frisco",
+    "75036": "Frisco", "75038": "Irving", "75039": "Irving", "75040": "Garland",
+    "75041": "Garland", "75042": "Garland", "75043": "Garland", "75044": "Garland",
+    "75048": "Sachse", "75050": "Grand Prairie", "75051": "Grand Prairie",
+    "75052": "Grand Prairie", "75054": "Grand Prairie", "75056": "The Colony",
+    "75057": "Lewisville", "75060": "Irving", "75061": "Irving", "75062": "Irving",
+    "75063": "Irving", "75065": "Lake Dallas", "75067": "Lewisville",
+    "75068": "Little Elm", "75069": "McKinney", "75070": "McKinney", "75071": "McKinney",
+    "75072": "McKinney", "75074": "Plano", "75075": "Plano", "75077": "Flower Mound",
+    "75078": "Prosper", "75080": "Richardson", "75081": "Richardson", "75082": "Richardson",
+    "75083": "Richardson", "75087": "Rockwall", "75088": "Rowlett", "75089": "Rowlett",
+    "75093": "Plano", "75098": "Wylie", "75104": "Cedar Hill", "75115": "DeSoto",
+    "75116": "Duncanville", "75149": "Mesquite", "75150": "Mesquite",
+    "75181": "Mesquite", "75182": "Sunnyvale", "75201": "Dallas (Downtown)",
+    "75202": "Dallas (Downtown)", "75204": "Dallas (Uptown)", "75205": "Dallas (Highland Park)",
+    "75206": "Dallas (Lower Greenville)", "75207": "Dallas (Design District)",
+    "75208": "Dallas (Oak Cliff)", "75209": "Dallas (Love Field)", "75211": "Dallas (West)",
+    "75212": "Dallas (Northwest)", "75214": "Dallas (Lakewood)", "75218": "Dallas (Casa Linda)",
+    "75219": "Dallas (Oak Lawn)", "75220": "Dallas (Northwest)", "75225": "Dallas (University Park)",
+    "75226": "Dallas (Deep Ellum)", "75228": "Dallas (East)", "75229": "Dallas (Northwest)",
+    "75230": "Dallas (North)", "75231": "Dallas (Northeast)", "75234": "Farmers Branch",
+    "75235": "Dallas (Love Field)", "75236": "Dallas (Southwest)", "75238": "Dallas (Lake Highlands)",
+    "75240": "Dallas (North)", "75243": "Dallas (Lake Highlands)", "75244": "Dallas (North)",
+    "75246": "Dallas (East)", "75247": "Dallas (Stemmons)", "75248": "Dallas (Far North)",
+    "75251": "Dallas (North)", "75252": "Dallas (Far North)", "75254": "Dallas (North)",
+    "75261": "DFW Airport", "75270": "Dallas (PO Boxes)", "75287": "Dallas (Far North)",
+    "75390": "Dallas (UT Southwestern)",
+    "76001": "Arlington", "76002": "Arlington", "76005": "Arlington", "76006": "Arlington",
+    "76010": "Arlington", "76011": "Arlington", "76012": "Arlington", "76013": "Arlington",
+    "76014": "Arlington", "76015": "Arlington", "76016": "Arlington", "76017": "Arlington",
+    "76018": "Arlington", "76021": "Bedford", "76022": "Bedford", "76034": "Colleyville",
+    "76039": "Euless", "76040": "Euless", "76051": "Grapevine", "76052": "Haslet",
+    "76053": "Hurst", "76054": "Hurst", "76063": "Mansfield", "76092": "Southlake",
+    "76117": "Haltom City", "76118": "Fort Worth (Northeast)", "76120": "Fort Worth (East)",
+    "76137": "Fort Worth (North)", "76148": "North Richland Hills", "76155": "Fort Worth (DFW Airport)",
+    "76177": "Fort Worth (Alliance)", "76180": "North Richland Hills", "76182": "North Richland Hills",
+    "76201": "Denton", "76205": "Denton", "76207": "Denton", "76208": "Denton",
+    "76209": "Denton", "76210": "Denton", "76226": "Argyle", "76227": "Aubrey",
+    "76244": "Keller", "76247": "Justin", "76248": "Keller", "76262": "Roanoke",
+}
@@ -0,0 +1,146 @@
+"""
+Persistent on-disk caches
+ResponseCache holds raw Census ACS responses: gzip-compressed bodies keyed
+on (dataset URL, variable list, ZCTA batch). Reads refresh an entry's
+mtime; once the directory grows past its size cap the least recently used
+entries are evicted. StageStore holds pickled pipeline stage outputs keyed
+on a hash of each stage's inputs.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+import threading
+import zlib
+from pathlib import Path
+
+from demographics.config import CACHE_DIR, CACHE_MAX_BYTES, PIPELINE_DIR
+
+SUFFIX = ".json.gz"
+
+
+class CacheMiss(LookupError):
+    """Raised in offline mode when a batch has no cached response; `missing` lists its ZCTAs (or areas)"""
+
+    def __init__(self, message, missing=()):
+        super().__init__(message)
+        self.missing = list(missing)
+
+
+def cache_key(base_url, variables, zctas):
+    """Stable key for one request; ZCTA order within the batch does not matter"""
+    raw = json.dumps([base_url, variables, sorted(zctas)], separators=(",", ":"))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """Size-bounded LRU cache of compressed ACS response bodies"""
+
+    def __init__(self, directory=CACHE_DIR, max_bytes=CACHE_MAX_BYTES, offline=False):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.offline = offline
+        self._lock = threading.Lock()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._size = sum(p.stat().st_size for p in self._entries())
+
+    def _entries(self):
+        return self.directory.glob(f"*{SUFFIX}")
+
+    def _path(self, key):
+        return self.directory / f"{key}{SUFFIX}"
+
+    def get(self, key):
+        """Return the decoded JSON payload for `key`, or None on a miss
+
+        An entry that can't be read back (truncated or corrupt, say after
+        a full disk) counts as a miss and is removed.
+        """
+        path = self._path(key)
+        try:
+            with gzip.open(path, "rb") as f:
+                payload = json.loads(f.read())
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        except (OSError, EOFError, ValueError, zlib.error):
+            self._discard(path)
+            return None
+        return payload
+
+    def _discard(self, path):
+        with self._lock:
+            try:
+                size = path.stat().st_size
+                path.unlink()
+            except FileNotFoundError:
+                return
+            self._size -= size
+
+    def put(self, key, body):
+        """Store a raw response body (bytes) and evict down to the size cap"""
+        path = self._path(key)
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb", mtime=0) as f:
+            f.write(body)
+        with self._lock:
+            if path.exists():
+                self._size -= path.stat().st_size
+            os.replace(tmp, path)
+            self._size += path.stat().st_size
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        entries = []
+        for p in self._entries():
+            try:
+                st = p.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((st.st_mtime, st.st_size, p))
+        entries.sort()
+        self._size = sum(size for _, size, _ in entries)
+        for _, size, p in entries:
+            if self._size <= self.max_bytes:
+                break
+            p.unlink(missing_ok=True)
+            self._size -= size
+
+    def size(self):
+        return self._size
+
+
+class StageStore:
+    """Pickled stage outputs, one file per (stage, key); keeps the newest few per stage"""
+
+    def __init__(self, directory=PIPELINE_DIR, keep=8):
+        self.directory = Path(directory)
+        self.keep = keep
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, stage, key):
+        return self.directory / f"{stage}-{key}.pkl"
+
+    def get(self, stage, key):
+        """(True, value) for a stored output, (False, None) otherwise"""
+        path = self._path(stage, key)
+        try:
+            with open(path, "rb") as f:
+                value = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return False, None
+        os.utime(path)
+        return True, value
+
+    def put(self, stage, key, value):
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, self._path(stage, key))
+        entries = sorted(self.directory.glob(f"{stage}-*.pkl"), key=lambda p: p.stat().st_mtime)
+        for old in entries[:-self.keep]:
+            old.unlink(missing_ok=True)
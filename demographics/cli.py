@@ -0,0 +1,111 @@
+"""
+Command-line options shared by the demographics scripts
+"""
+
+import argparse
+from contextlib import contextmanager
+
+from demographics.cache import CacheMiss, ResponseCache, StageStore
+from demographics.client import CensusClient
+from demographics.config import (
+    CACHE_DIR,
+    PIPELINE_DIR,
+    PROFILE_DIR,
+    QUARANTINE_DIR,
+    RUN_REPORT_JSONL,
+    VARIABLE_SETS,
+)
+from demographics.quality import POLICIES, QualityError, QualityGuard, parse_threshold
+from demographics.telemetry import Telemetry, parse_profile
+
+
+def add_fetch_arguments(parser):
+    group = parser.add_argument_group("Census fetch")
+    group.add_argument("--offline", action="store_true",
+                       help="Replay cached ACS responses only; fail on any cache miss")
+    group.add_argument("--no-cache", action="store_true",
+                       help="Bypass the on-disk response cache and stored pipeline stages")
+    group.add_argument("--cache-dir", default=CACHE_DIR,
+                       help=f"Response cache directory (default: {CACHE_DIR})")
+    group.add_argument("--pipeline-dir", default=PIPELINE_DIR,
+                       help=f"Stored pipeline stage outputs (default: {PIPELINE_DIR})")
+    group.add_argument("--variables", choices=sorted(VARIABLE_SETS), default="housing",
+                       help="ACS variable set to fetch; wide sets are sharded across calls (default: housing)")
+    group = parser.add_argument_group("Data quality")
+    group.add_argument("--quality", choices=[*POLICIES, "off"], default="fail",
+                       help="On a batch breaking the data-quality thresholds: abort the run, set the batch "
+                            "aside and continue, or skip the checks (default: fail)")
+    group.add_argument("--quality-threshold", action="append", type=_threshold, default=[],
+                       metavar="METRIC=SHARE",
+                       help="Override a threshold, e.g. missing=0.8 (repeatable)")
+    group.add_argument("--quarantine-dir", default=QUARANTINE_DIR,
+                       help=f"Where --quality quarantine writes bad batches (default: {QUARANTINE_DIR})")
+    group = parser.add_argument_group("Run report")
+    group.add_argument("--run-report", default=RUN_REPORT_JSONL, metavar="PATH",
+                       help=f"Append stage timings and fetch counters as JSON lines (default: {RUN_REPORT_JSONL}; "
+                            "'' to skip)")
+    group.add_argument("--profile", type=_profile, default="", metavar="STAGES",
+                       help="Comma-separated single-threaded stages to run under cProfile, e.g. decode,merge. "
+                            "fetch and stream run on worker threads, which cProfile can't see, so they are "
+                            "refused")
+    group.add_argument("--profile-dir", default=PROFILE_DIR,
+                       help=f"Where --profile dumps .prof files (default: {PROFILE_DIR})")
+    return parser
+
+
+def _threshold(spec):
+    try:
+        return parse_threshold(spec)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+
+def _profile(spec):
+    try:
+        return parse_profile(spec)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+
+def guard_from_args(args, telemetry=None):
+    """QualityGuard for --quality, or None under --quality off"""
+    if args.quality == "off":
+        return None
+    return QualityGuard(args.quality, dict(args.quality_threshold), quarantine_dir=args.quarantine_dir,
+                        telemetry=telemetry)
+
+
+def telemetry_from_args(args, command):
+    """Telemetry for the run, or None with no --run-report and no --profile"""
+    if not args.run_report and not args.profile:
+        return None
+    return Telemetry(command, profile=args.profile, profile_dir=args.profile_dir)
+
+
+def client_from_args(args, **kwargs):
+    """Build a CensusClient honoring --offline / --no-cache / --cache-dir / --variables / --quality"""
+    if args.offline and args.no_cache:
+        raise SystemExit("--offline needs the response cache; drop --no-cache")
+    cache = None if args.no_cache else ResponseCache(args.cache_dir, offline=args.offline)
+    kwargs.setdefault("variables", VARIABLE_SETS[args.variables])
+    kwargs.setdefault("guard", guard_from_args(args, kwargs.get("telemetry")))
+    return CensusClient(cache=cache, **kwargs)
+
+
+@contextmanager
+def fetch_errors(guard=None, shown=20):
+    """Turn an --offline cache miss or a failed data-quality check into a short error, instead of a traceback"""
+    try:
+        yield
+    except CacheMiss as e:
+        names = ", ".join(e.missing[:shown]) + (f", ... ({len(e.missing)} in all)" if len(e.missing) > shown else "")
+        raise SystemExit(f"{e}: {names}\nRun once without --offline to fetch them into the cache.") from None
+    except QualityError as e:
+        summary = f"\n{guard.summary()}" if guard is not None else ""
+        raise SystemExit(f"{e}{summary}\nUse --quality quarantine to set bad batches aside, or loosen a limit "
+                         f"with --quality-threshold.") from None
+
+
+def stage_store_from_args(args):
+    """StageStore for --pipeline-dir, or None under --no-cache"""
+    return None if args.no_cache else StageStore(args.pipeline_dir)
@@ -0,0 +1,501 @@
+"""
+Shared Census ACS client
+Batches run concurrently on a thread pool over one pooled keep-alive
+session. A token bucket shared by all workers keeps the request rate under
+budget, and results come back in the original batch order. Transient
+failures are retried with exponential backoff and jitter; a batch that
+still fails is split in half until the bad ZCTAs are isolated, and those
+end up in the FetchReport instead of silently disappearing. With a
+ResponseCache attached, cached batches skip the network (and the rate
+limiter) entirely. Variable lists wider than the API's per-call cap are
+split into column shards; every (batch, shard) request runs on the same
+pool and the shards are joined back on ZCTA into one wide table per batch.
+iter_fetch() is the streaming variant: it yields
+tables as batches complete and keeps only a bounded window in flight, so
+statewide or national runs never hold every response at once.
+fetch_areas() queries finer geographies (tracts, block groups) one
+state+county partition per request, partitions in parallel. With a
+Telemetry attached, request and batch latencies, bytes downloaded and the
+finished FetchReport totals go into the run report. With a QualityGuard
+(demographics.quality) attached, every ZCTA batch is checked as it is
+finished, so a broken refresh stops at its first bad batch.
+"""
+
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+from dataclasses import dataclass, field
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from demographics.cache import CacheMiss, cache_key
+from demographics.config import (
+    ACS_VARIABLES,
+    BACKOFF_BASE,
+    BACKOFF_CAP,
+    BATCH_SIZE,
+    CENSUS_API_BASE,
+    MAX_RETRIES,
+    MAX_VARIABLES_PER_CALL,
+    MAX_WORKERS,
+    REQUEST_TIMEOUT,
+    REQUESTS_PER_SECOND,
+)
+
+ZCTA_FIELD = "zip code tabulation area"
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+class RateLimiter:
+    """Thread-safe token bucket; rate is requests per second (None = unlimited)"""
+
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        if not self.rate:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class FetchError(Exception):
+    """A request that failed after all retries"""
+
+    def __init__(self, reason, retryable=False):
+        super().__init__(reason)
+        self.reason = reason
+        self.retryable = retryable
+
+
+@dataclass
+class FetchReport:
+    """What a fetch asked for, what came back, and what could not be recovered"""
+
+    requested: int = 0
+    returned: int = 0
+    requests: int = 0
+    retries: int = 0
+    splits: int = 0
+    cache_hits: int = 0
+    failed: dict = field(default_factory=dict)
+    missing: list = field(default_factory=list)
+    quarantined: list = field(default_factory=list)
+
+    @property
+    def unrecoverable(self):
+        """ZCTAs with no data: failed requests, ZCTAs the API did not return, quarantined batches"""
+        return sorted(set(self.failed) | set(self.missing) | set(self.quarantined))
+
+    def summary(self):
+        lines = [
+            f"Requested {self.requested} zip codes, received {self.returned} "
+            f"({self.requests} requests, {self.retries} retries, {self.splits} splits, "
+            f"{self.cache_hits} cached batches)"
+        ]
+        for zcta, reason in sorted(self.failed.items()):
+            lines.append(f"  {zcta}: {reason}")
+        if self.missing:
+            lines.append(f"  Not returned by API: {', '.join(sorted(self.missing))}")
+        if self.quarantined:
+            lines.append(f"  Quarantined (failed data-quality checks): {', '.join(sorted(self.quarantined))}")
+        return "\n".join(lines)
+
+
+@dataclass
+class FetchResult:
+    tables: list
+    report: FetchReport
+
+
+def batched(items, size):
+    """Split a list into consecutive chunks of at most `size` items"""
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def build_url(base_url, variables, zctas, geo_in=None, geography=ZCTA_FIELD):
+    zcta_list = ",".join(zctas)
+    url = f"{base_url}?get={variables}&for={geography.replace(' ', '%20')}:{zcta_list}"
+    if geo_in:
+        url += f"&in={geo_in.replace(' ', '%20')}"
+    return url
+
+
+def shard_variables(variables, limit=MAX_VARIABLES_PER_CALL):
+    """Split a variable list (or comma-joined string) into comma-joined shards of at most `limit`"""
+    if isinstance(variables, str):
+        variables = variables.split(",")
+    variables = list(dict.fromkeys(v.strip() for v in variables if v.strip()))
+    if not variables:
+        raise ValueError("No ACS variables requested")
+    return [",".join(variables[i:i + limit]) for i in range(0, len(variables), limit)]
+
+
+def make_session(pool_size=MAX_WORKERS):
+    """Keep-alive session whose connection pool fits every worker thread"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def merge_tables(tables):
+    """Concatenate [headers, *rows] tables that share the same headers"""
+    tables = [t for t in tables if t]
+    if not tables:
+        return None
+    merged = [tables[0][0]]
+    for table in tables:
+        merged.extend(table[1:])
+    return merged
+
+
+def join_shards(tables):
+    """Outer-join one batch's column-shard tables on geography into a single wide table
+
+    The join key is the columns every shard shares (the geography columns:
+    ZCTA, or state/county/tract/...). Columns keep shard order; a row missing
+    from a shard gets None for that shard's variables.
+    """
+    tables = [t for t in tables if t]
+    if len(tables) <= 1:
+        return tables[0] if tables else None
+    headers = list(dict.fromkeys(col for table in tables for col in table[0]))
+    keys = [col for col in headers if all(col in table[0] for table in tables)]
+    rows = {}
+    for table in tables:
+        key_cols = [table[0].index(col) for col in keys]
+        for row in table[1:]:
+            rows.setdefault(tuple(row[i] for i in key_cols), {}).update(zip(table[0], row))
+    return [headers] + [[values.get(col) for col in headers] for values in rows.values()]
+
+
+class CensusClient:
+    """Concurrent, rate-limited, retrying fetcher for ACS ZCTA tables"""
+
+    def __init__(self, base_url=CENSUS_API_BASE, variables=ACS_VARIABLES,
+                 batch_size=BATCH_SIZE, rate=REQUESTS_PER_SECOND,
+                 max_workers=MAX_WORKERS, timeout=REQUEST_TIMEOUT, cache=None,
+                 session=None, max_retries=MAX_RETRIES, backoff_base=BACKOFF_BASE,
+                 backoff_cap=BACKOFF_CAP, geo_in=None, limiter=None, telemetry=None, guard=None):
+        self.base_url = base_url
+        self.geo_in = geo_in
+        self.shards = shard_variables(variables)
+        self.variables = ",".join(self.shards)
+        self.batch_size = batch_size
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.limiter = limiter or RateLimiter(rate)
+        self.cache = cache
+        self.session = session or make_session(max_workers)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.telemetry = telemetry
+        self.guard = guard
+        self._lock = threading.Lock()
+
+    @property
+    def dataset(self):
+        """Dataset endpoint plus any geography nesting; identifies cached responses"""
+        return f"{self.base_url}?in={self.geo_in}" if self.geo_in else self.base_url
+
+    def for_dataset(self, base_url, geo_in=None, variables=None, max_workers=None):
+        """Client for another ACS dataset sharing this one's session, rate budget and cache"""
+        return CensusClient(
+            base_url=base_url, variables=variables or self.variables, batch_size=self.batch_size,
+            max_workers=max_workers or self.max_workers, timeout=self.timeout, cache=self.cache,
+            session=self.session, max_retries=self.max_retries, backoff_base=self.backoff_base,
+            backoff_cap=self.backoff_cap, geo_in=geo_in, limiter=self.limiter,
+            telemetry=self.telemetry, guard=self.guard,
+        )
+
+    def _count(self, report, name, n=1):
+        with self._lock:
+            setattr(report, name, getattr(report, name) + n)
+
+    def _observe(self, name, value):
+        if self.telemetry is not None:
+            self.telemetry.observe(name, value)
+
+    def _record(self, report, unit="zctas"):
+        if self.telemetry is not None:
+            self.telemetry.record_fetch(report, unit)
+
+    def _backoff(self, attempt):
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * 2 ** attempt))
+
+    def _request(self, batch, report, variables, geography=ZCTA_FIELD, geo_in=None):
+        """GET one batch with retries; returns (table, raw body) or raises FetchError"""
+        url = build_url(self.base_url, variables, batch, geo_in or self.geo_in, geography)
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                self._count(report, "retries")
+                time.sleep(self._backoff(attempt - 1))
+            self.limiter.acquire()
+            self._count(report, "requests")
+            start = time.perf_counter()
+            try:
+                response = self.session.get(url, timeout=self.timeout)
+            except requests.RequestException as e:
+                error = FetchError(f"{type(e).__name__}: {e}", retryable=True)
+                continue
+            finally:
+                self._observe("request_latency_s", time.perf_counter() - start)
+            if response.status_code == 200:
+                if self.telemetry is not None:
+                    self.telemetry.count("bytes_downloaded", len(response.content))
+                try:
+                    return response.json(), response.content
+                except ValueError:
+                    error = FetchError("invalid JSON response", retryable=True)
+                    continue
+            if response.status_code == 204:
+                # No rows for any ZCTA in the batch
+                return [], b""
+            error = FetchError(f"HTTP {response.status_code}",
+                               retryable=response.status_code in RETRYABLE_STATUS)
+            if not error.retryable:
+                break
+        raise error
+
+    def _fetch(self, batch, report, variables=None):
+        """Fetch one shard of a batch, splitting it in half on failure until bad ZCTAs are isolated"""
+        variables = variables or self.shards[0]
+        key = None
+        if self.cache is not None:
+            key = cache_key(self.dataset, variables, batch)
+            data = self._cached(key, report, f"{len(batch)} zip codes", batch)
+            if data is not None:
+                return data
+
+        try:
+            data, body = self._request(batch, report, variables)
+        except FetchError as e:
+            if len(batch) == 1:
+                with self._lock:
+                    report.failed[batch[0]] = e.reason
+                return None
+            self._count(report, "splits")
+            mid = len(batch) // 2
+            return merge_tables([self._fetch(batch[:mid], report, variables),
+                                 self._fetch(batch[mid:], report, variables)])
+
+        if key is not None and data:
+            self.cache.put(key, body)
+        return data
+
+    def _timed_fetch(self, batch, report, variables=None):
+        """_fetch() with its wall time (retries and splits included) in the batch latency histogram"""
+        start = time.perf_counter()
+        try:
+            return self._fetch(batch, report, variables)
+        finally:
+            self._observe("batch_latency_s", time.perf_counter() - start)
+
+    def _cached(self, key, report, what, missing):
+        data = self.cache.get(key)
+        if data is not None:
+            self._count(report, "cache_hits")
+            return data
+        if self.cache.offline:
+            raise CacheMiss(f"No cached response for {what} (offline mode)", missing)
+        return None
+
+    def _fetch_area(self, geography, geo_in, variables, report):
+        """One shard of every `geography` unit inside `geo_in`; None if it failed"""
+        key = None
+        if self.cache is not None:
+            key = cache_key(f"{self.base_url}?in={geo_in}", variables, [geography])
+            data = self._cached(key, report, f"{geography} in {geo_in}", [geo_in])
+            if data is not None:
+                return data
+        try:
+            data, body = self._request(["*"], report, variables, geography, geo_in)
+        except FetchError as e:
+            with self._lock:
+                report.failed[geo_in] = e.reason
+            return None
+        if key is not None and data:
+            self.cache.put(key, body)
+        return data
+
+    def fetch_areas(self, geography, partitions, report=None):
+        """Yield (partition, table) for every `geography` unit in each partition, as partitions complete
+
+        A partition is an `in=` clause such as "state:48 county:113"; every
+        (partition, shard) request runs concurrently and each partition's
+        shards are joined before it is yielded. Failed partitions are keyed
+        by their `in=` clause in report.failed and yield None. With a quality
+        guard every partition's table is checked like a ZCTA batch; a
+        quarantined one is listed in report.quarantined and yields None.
+        """
+        report = report if report is not None else FetchReport()
+        partitions = list(partitions)
+        numbers = {partition: number for number, partition in enumerate(partitions, 1)}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = {partition: [pool.submit(self._fetch_area, geography, partition, v, report)
+                                   for v in self.shards]
+                       for partition in partitions}
+            owner = {f: partition for partition, shard_futures in futures.items() for f in shard_futures}
+            outstanding = {partition: len(self.shards) for partition in partitions}
+            try:
+                for future in as_completed(owner):
+                    partition = owner[future]
+                    outstanding[partition] -= 1
+                    if outstanding[partition]:
+                        continue
+                    table = join_shards([f.result() for f in futures.pop(partition)])
+                    table = self._check_area(numbers[partition], partition, table, report)
+                    report.requested += 1
+                    report.returned += len(table) - 1 if table else 0
+                    yield partition, table
+                self._record(report, unit="partitions")
+            finally:
+                for shard_futures in futures.values():
+                    for future in shard_futures:
+                        future.cancel()
+
+    def _check_area(self, number, partition, table, report):
+        """Run the quality guard on one partition's joined table; None if it was quarantined"""
+        if self.guard is None or not table:
+            return table
+        if self.guard.check(number, None, table, dataset=f"{self.base_url}?in={partition}").bad:
+            with self._lock:
+                report.quarantined.append(partition)
+            return None
+        return table
+
+    def fetch_batch(self, number, batch, report):
+        """Fetch one numbered batch (its shards in turn); returns the raw [headers, *rows] table or None"""
+        return self._finish_batch(number, batch, [self._timed_fetch(batch, report, v) for v in self.shards],
+                                  report)
+
+    def _finish_batch(self, number, batch, shard_tables, report):
+        """Join a batch's shard tables, run the quality guard, and record what came back"""
+        data = join_shards(shard_tables)
+        if self.guard is not None:
+            with self._lock:
+                failed = [z for z in batch if z in report.failed]
+            if self.guard.check(number, batch, data, failed, self.dataset).bad:
+                with self._lock:
+                    report.quarantined.extend(z for z in batch if z not in report.failed)
+                return None
+        rows = data[1:] if data else []
+        if data:
+            zcta_col = data[0].index(ZCTA_FIELD)
+            returned = {row[zcta_col] for row in rows}
+        else:
+            returned = set()
+        with self._lock:
+            report.returned += len(rows)
+            report.missing.extend(z for z in batch if z not in returned and z not in report.failed)
+        print(f"  Batch {number}: Retrieved {len(rows)} of {len(batch)} zip codes")
+        return data
+
+    def fetch(self, zip_codes):
+        """Fetch every (batch, shard) concurrently; one joined table per batch, in input order"""
+        zip_codes = list(zip_codes)
+        report = FetchReport(requested=len(zip_codes))
+        batches = batched(zip_codes, self.batch_size)
+        if not batches:
+            return FetchResult([], report)
+        workers = max(1, min(self.max_workers, len(batches) * len(self.shards)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [[pool.submit(self._timed_fetch, batch, report, v) for v in self.shards]
+                       for batch in batches]
+            try:
+                tables = [self._finish_batch(number, batch, [f.result() for f in shard_futures], report)
+                          for number, (batch, shard_futures) in enumerate(zip(batches, futures), 1)]
+            except BaseException:
+                # A failed quality check (or offline cache miss) stops the run now,
+                # not after every queued batch has been fetched
+                pool.shutdown(cancel_futures=True)
+                raise
+        self._record(report)
+        return FetchResult(tables, report)
+
+    def iter_fetch(self, zip_codes, report=None, window=None):
+        """Yield (batch number, table) as batches complete, in completion order
+
+        At most `window` batches (default 2x the worker count) are submitted
+        or waiting to be consumed at any time, so memory stays flat however
+        many ZCTAs are requested. Pass a FetchReport to read the totals after
+        the generator is exhausted.
+        """
+        report = report if report is not None else FetchReport()
+        window = window or 2 * self.max_workers
+        pending = {}  # future -> (batch number, shard index)
+        batches = {}  # batch number -> (ZCTAs, shard tables, shards outstanding)
+
+        def completed():
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                number, shard = pending.pop(future)
+                batch, tables, outstanding = batches[number]
+                tables[shard] = future.result()
+                if outstanding > 1:
+                    batches[number] = (batch, tables, outstanding - 1)
+                else:
+                    del batches[number]
+                    yield number, self._finish_batch(number, batch, tables, report)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            try:
+                for number, start in enumerate(range(0, len(zip_codes), self.batch_size), 1):
+                    batch = list(zip_codes[start:start + self.batch_size])
+                    report.requested += len(batch)
+                    batches[number] = (batch, [None] * len(self.shards), len(self.shards))
+                    for shard, variables in enumerate(self.shards):
+                        pending[pool.submit(self._timed_fetch, batch, report, variables)] = (number, shard)
+                    while len(batches) >= window:
+                        yield from completed()
+                while pending:
+                    yield from completed()
+                self._record(report)
+            finally:
+                # Consumer stopped early: drop batches that have not started
+                for future in pending:
+                    future.cancel()
+
+    def list_zctas(self, prefixes=None):
+        """Every ZCTA the dataset publishes, optionally only those starting with `prefixes`"""
+        report = FetchReport()
+        data = self.for_dataset(self.base_url, self.geo_in, variables="NAME")._fetch(["*"], report)
+        if not data:
+            reason = report.failed.get("*", "empty response")
+            raise FetchError(f"Could not list ZCTAs for {self.dataset}: {reason}")
+        zcta_col = data[0].index(ZCTA_FIELD)
+        zctas = sorted(row[zcta_col].zfill(5) for row in data[1:])
+        if prefixes:
+            zctas = [z for z in zctas if z.startswith(tuple(prefixes))]
+        return zctas
+
+
+def get_census_data(zip_codes, client=None):
+    """Fetch housing and income data from Census Bureau
+
+    Returns the FetchResult: raw [headers, *rows] tables in batch order
+    (decode them with demographics.decode) plus the failure report.
+    """
+    print(f"Fetching Census data for {len(zip_codes)} zip codes...")
+    client = client or CensusClient()
+    result = client.fetch(zip_codes)
+    if result.report.unrecoverable:
+        print(result.report.summary())
+    return result
@@ -0,0 +1,102 @@
+"""
+Typed columnar output for the demographics CSVs
+Writes an uncompressed Arrow IPC (Feather v2) file next to each CSV with
+compact dtypes: ZIPs stay strings, City/Primary Zone are dictionary-encoded,
+unit counts are int32 and income is a nullable Int32. The loader memory-maps
+the file, so reads are zero-copy and need no text parsing or zfill.
+
+pyarrow is optional; without it the scripts skip the .arrow output.
+"""
+
+from pathlib import Path
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+except ImportError:  # pragma: no cover - exercised only without pyarrow
+    pa = None
+
+COLUMN_DTYPES = {
+    'Zip Code': 'string',
+    'Year': 'int16',
+    'City': 'category',
+    'Primary Zone': 'category',
+    'Zone 1 (%)': 'float32',
+    'Zone 2 (%)': 'float32',
+    'Zone 3 (%)': 'float32',
+    'Zone 4 (%)': 'float32',
+    'Total Housing Units': 'int32',
+    'Single-Family Detached': 'int32',
+    '% Single-Family Detached': 'float32',
+    'Other Dwellings': 'int32',
+    '% Other': 'float32',
+    'Median Household Income': 'Int32',
+}
+
+
+def have_arrow():
+    return pa is not None
+
+
+def _require_arrow():
+    if pa is None:
+        raise RuntimeError("pyarrow is required for columnar output (pip install pyarrow)")
+
+
+def arrow_path(csv_path):
+    """Columnar sibling of a CSV output: foo.csv -> foo.arrow"""
+    return Path(csv_path).with_suffix('.arrow')
+
+
+def to_columnar(df, categorical=True):
+    """Cast known demographics columns to their compact dtypes
+
+    categorical=False leaves dictionary-encoded columns as they are; an IPC
+    file written batch by batch cannot replace a dictionary between batches.
+    """
+    out = df.copy()
+    for col, dtype in COLUMN_DTYPES.items():
+        if col not in out.columns or (dtype == 'category' and not categorical):
+            continue
+        if dtype in ('int32', 'Int32'):
+            values = pd.to_numeric(out[col]).round()
+            out[col] = values.astype('Int32') if dtype == 'Int32' or values.isna().any() else values.astype(dtype)
+        else:
+            out[col] = out[col].astype(dtype)
+    return out
+
+
+def write_columnar(df, path):
+    """Write `df` as an uncompressed Arrow IPC file; returns the path"""
+    _require_arrow()
+    path = Path(path)
+    table = pa.Table.from_pandas(to_columnar(df), preserve_index=False)
+    tmp = path.with_suffix(path.suffix + '.tmp')
+    with pa.OSFile(str(tmp), 'wb') as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    tmp.replace(path)
+    return path
+
+
+def read_table(path, columns=None):
+    """Memory-map an Arrow IPC file; the returned table references the mapped pages"""
+    _require_arrow()
+    table = pa.ipc.open_file(pa.memory_map(str(path), 'r')).read_all()
+    return table.select(columns) if columns else table
+
+
+def load_columnar(path, columns=None):
+    """Load a columnar output as a DataFrame with its stored dtypes"""
+    return read_table(path, columns).to_pandas()
+
+
+def save_outputs(df, csv_path):
+    """Write the CSV plus its columnar sibling (when pyarrow is installed)"""
+    df.to_csv(csv_path, index=False)
+    print(f"\nSaved to {csv_path}")
+    if have_arrow():
+        print(f"Saved to {write_columnar(df, arrow_path(csv_path))}")
+    else:
+        print("pyarrow not installed; skipped columnar (.arrow) output")
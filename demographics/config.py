@@ -0,0 +1,151 @@
+"""
+Shared settings for the Census ACS demographics scripts
+"""
+
+import os
+
+# Census API endpoint for ACS 5-year estimates
+ACS5_URL = "https://api.census.gov/data/{year}/acs/acs5"
+ACS_YEAR = 2022
+CENSUS_API_BASE = ACS5_URL.format(year=ACS_YEAR)
+
+# Before the 2020 vintage, ZCTA queries must be nested in a state
+STATE_FIPS = "48"  # Texas
+
+# ZCTAs are not nested in states from 2020 on; Texas ZIPs start with these
+TEXAS_ZCTA_PREFIXES = ("75", "76", "77", "78", "79", "885")
+
+# B25024_001E = Total housing units
+# B25024_002E = 1-unit detached (single-family detached)
+# B19013_001E = Median household income
+HOUSING_VARIABLES = ["NAME", "B25024_001E", "B25024_002E", "B19013_001E"]
+
+# Wider market-sizing set, fetched with --variables market
+MARKET_VARIABLES = (
+    # Units in structure: 1-unit attached .. boat/RV/van
+    [f"B25024_{i:03d}E" for i in range(3, 12)]
+    # Tenure: total, owner occupied, renter occupied
+    + [f"B25003_{i:03d}E" for i in range(1, 4)]
+    # Year structure built: total, 2020 or later .. 1939 or earlier
+    + [f"B25034_{i:03d}E" for i in range(1, 12)]
+    # Median year structure built
+    + ["B25035_001E"]
+    # House heating fuel: total, utility gas, bottled gas, electricity .. no fuel
+    + [f"B25040_{i:03d}E" for i in range(1, 11)]
+    # Median value (owner-occupied units)
+    + ["B25077_001E"]
+    # Household income bands: total, less than $10,000 .. $200,000 or more
+    + [f"B19001_{i:03d}E" for i in range(1, 18)]
+)
+
+VARIABLE_SETS = {
+    "housing": HOUSING_VARIABLES,
+    "market": HOUSING_VARIABLES + MARKET_VARIABLES,
+}
+ACS_VARIABLES = HOUSING_VARIABLES
+
+# The API accepts at most 50 variables per call (NAME included); wider
+# lists are split into column shards fetched side by side and joined on ZCTA
+MAX_VARIABLES_PER_CALL = 50
+
+# ZCTAs per request
+BATCH_SIZE = 50
+
+# Request budget shared by every worker thread. Conservative default for
+# keyless access; raise it for large refreshes run with an API key.
+REQUESTS_PER_SECOND = 4.0
+MAX_WORKERS = 8
+REQUEST_TIMEOUT = 60
+
+# Streaming mode decodes and writes responses in chunks of about this many
+# rows (per-batch pandas overhead dominates below that), and keeps only
+# STREAM_TOP_N rows for each "top ZIPs" table
+STREAM_CHUNK_ROWS = 2000
+STREAM_TOP_N = 20
+
+# On-disk cache of raw ACS responses (gzip JSON, LRU-evicted past the size cap)
+CACHE_DIR = os.environ.get("CENSUS_CACHE_DIR", "/app/.cache/census")
+CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+# Pipeline stage outputs (pickles keyed by a hash of each stage's inputs)
+PIPELINE_DIR = os.environ.get("DEMOGRAPHICS_PIPELINE_DIR", "/app/.cache/pipeline")
+
+# Run reports (JSON lines: stage timings, request latency, retries, bytes,
+# dropped ZCTAs) are appended here; --profile dumps cProfile stats alongside
+RUN_REPORT_JSONL = os.environ.get("DEMOGRAPHICS_RUN_REPORT", "/app/.cache/demographics_runs.jsonl")
+PROFILE_DIR = os.environ.get("DEMOGRAPHICS_PROFILE_DIR", "/app/.cache/profiles")
+
+# Data-quality guardrails, checked on every ZCTA batch as it arrives. A
+# batch is bad when more than these shares of its rows have suppressed
+# (or negative) median income or zero housing units, when more than this
+# share of its requested ZCTAs did not come back, or when any percentage
+# falls outside 0-100. Share checks skip batches under QUALITY_MIN_BATCH
+# ZCTAs (a one-ZIP incremental fetch is not a sample). Bad batches abort
+# the run (--quality fail) or are set aside under QUARANTINE_DIR (--quality
+# quarantine) until more than QUALITY_MAX_QUARANTINED of them pile up.
+QUALITY_THRESHOLDS = {
+    "suppressed_income": 0.5,
+    "zero_units": 0.5,
+    "missing": 0.5,
+    "out_of_range": 0.0,
+}
+QUALITY_MIN_BATCH = 10
+QUALITY_MAX_QUARANTINED = 5
+QUARANTINE_DIR = os.environ.get("DEMOGRAPHICS_QUARANTINE_DIR", "/app/.cache/quarantine")
+
+# Retries per request (429, 5xx, timeouts) with exponential backoff + full
+# jitter; a batch that still fails is split in half to isolate bad ZCTAs
+MAX_RETRIES = 3
+BACKOFF_BASE = 0.5
+BACKOFF_CAP = 8.0
+
+# Outputs (and the service-area zones input) live with the frontend's data files
+DATA_DIR = "/app/frontend/public"
+SERVICE_AREA_CSV = f"{DATA_DIR}/DFW_HVAC_Service_Area_Zones.csv"
+MASTER_CSV = f"{DATA_DIR}/DFW_HVAC_Master_Service_Area.csv"
+
+# Server-side artifacts (read by the Next.js API routes, never served as
+# static files) live with the internal reference data instead
+INTERNAL_DIR = "/app/frontend/internal"
+
+# ZCTA centroids for demographics.spatial: the Census Gazetteer ZCTA file
+# (2020_Gaz_zcta_national.txt, tab-separated GEOID / INTPTLAT / INTPTLONG).
+# Not shipped in the repo; download it from census.gov and drop it here.
+ZCTA_CENTROIDS = f"{DATA_DIR}/2020_Gaz_zcta_national.txt"
+
+# Tract / block-group mode queries ACS one county at a time (state + county
+# partitions, run concurrently). County FIPS codes for the DFW counties the
+# drive-time zones reach.
+DFW_COUNTIES = {
+    "085": "Collin",
+    "113": "Dallas",
+    "121": "Denton",
+    "139": "Ellis",
+    "251": "Johnson",
+    "257": "Kaufman",
+    "367": "Parker",
+    "397": "Rockwall",
+    "439": "Tarrant",
+    "497": "Wise",
+}
+
+# Tract centroids (Gazetteer tract file for Texas, same columns as the ZCTA
+# file) place tracts and their block groups in drive-time zones. Not shipped.
+TRACT_CENTROIDS = f"{DATA_DIR}/2020_Gaz_tracts_48.txt"
+
+# HQ coordinates (Coppell 75019), same as the LocalBusiness schema markup
+HQ_DEPOT = ("Coppell HQ", 32.9545, -96.9903)
+
+# Drive-time estimate from straight-line distance: road miles run ~1.3x the
+# crow-flies distance and metro driving averages ~30 mph door to door.
+# Zone N covers drive times up to ZONE_DRIVE_MINUTES[N-1]; beyond the last
+# bound a ZCTA is outside the service area.
+CIRCUITY_FACTOR = 1.3
+AVERAGE_SPEED_MPH = 30.0
+ZONE_DRIVE_MINUTES = (15, 30, 45, 60)
+
+# Replacement-estimator pricing sheets (the site's source of truth for
+# installed-cost ranges) and the typical residential system life used to
+# turn full-stock replacement revenue into an annual figure
+ESTIMATOR_MATRIX_JS = "/app/frontend/lib/estimator-matrix.js"
+REPLACEMENT_CYCLE_YEARS = 15
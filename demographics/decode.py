@@ -0,0 +1,171 @@
+"""
+Columnar decoding of Census ACS responses
+Turns the API's [headers, *rows] arrays straight into a typed DataFrame and
+derives the housing/income columns as whole-column operations.
+"""
+
+import re
+
+import numpy as np
+import pandas as pd
+
+from demographics.client import ZCTA_FIELD
+
+# ACS estimate / margin-of-error variable names, e.g. B25024_001E
+ACS_VARIABLE = re.compile(r"^[A-Z]\d{5}[A-Z]{0,3}_\d{3}[A-Z]{1,2}$")
+
+HOUSING_COLUMNS = [
+    'Zip Code', 'Total Housing Units', 'Single-Family Detached', '% Single-Family Detached',
+    'Other Dwellings', '% Other', 'Median Household Income',
+]
+COUNT_COLUMNS = ['Total Housing Units', 'Single-Family Detached', 'Other Dwellings']
+
+# Derived from the "market" variable set (config.MARKET_VARIABLES); present
+# only when the fetched tables carry those variables
+MARKET_COLUMNS = [
+    'Owner Occupied', 'Renter Occupied', '% Owner Occupied',
+    'Built Before 2000', '% Built Before 2000', 'Median Year Built',
+    'Gas Heat', 'Electric Heat', 'Median Home Value',
+    'Households', 'Households $100k+', '% Households $100k+',
+]
+MARKET_MARKER = 'B25003_001E'
+MARKET_COUNT_COLUMNS = ['Owner Occupied', 'Renter Occupied', 'Built Before 2000', 'Gas Heat', 'Electric Heat',
+                        'Households', 'Households $100k+']
+
+
+def decoded_columns(variables):
+    """Columns process_census_data() produces for tables fetched with `variables`"""
+    if isinstance(variables, str):
+        variables = variables.split(",")
+    return HOUSING_COLUMNS + (MARKET_COLUMNS if MARKET_MARKER in variables else [])
+
+
+def decode_tables(tables):
+    """Stack [headers, *rows] tables into one DataFrame with numeric ACS columns"""
+    tables = [t for t in tables if t]
+    if not tables:
+        return pd.DataFrame(columns=[ZCTA_FIELD])
+
+    headers = tables[0][0]
+    for table in tables[1:]:
+        if table[0] != headers:
+            raise ValueError(f"Mismatched ACS headers: {table[0]} != {headers}")
+    rows = [row for table in tables for row in table[1:]]
+
+    df = pd.DataFrame(rows, columns=headers)
+    for col in headers:
+        if ACS_VARIABLE.match(col):
+            df[col] = pd.to_numeric(df[col], errors='coerce')
+    if ZCTA_FIELD in df.columns:
+        df[ZCTA_FIELD] = df[ZCTA_FIELD].astype(str).str.zfill(5)
+    return df
+
+
+def round1(values):
+    """Round to one decimal exactly like Python's round(x, 1)
+
+    np.round scales by 10 before rounding, which flips a handful of values
+    sitting right on a .x5 boundary; those few are re-rounded in Python.
+    """
+    values = np.asarray(values, dtype='float64')
+    out = np.round(values, 1)
+    scaled = values * 10
+    near_tie = np.flatnonzero(np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6)
+    if near_tie.size:
+        out[near_tie] = [round(v, 1) for v in values[near_tie].tolist()]
+    return out
+
+
+def _column(raw, name):
+    if name in raw.columns:
+        return raw[name].to_numpy(dtype='float64', na_value=np.nan)
+    return np.full(len(raw), np.nan)
+
+
+def _counts(raw, prefix, lines):
+    """Sum of estimate lines `prefix`_NNNE (missing values count as 0)"""
+    return sum(np.nan_to_num(_column(raw, f"{prefix}_{i:03d}E")) for i in lines).astype('int64')
+
+
+def _percent(part, total):
+    out = np.zeros(len(part))
+    has = total > 0
+    out[has] = round1(part[has] / total[has] * 100)
+    return out
+
+
+def housing_metrics(raw):
+    """Housing type and income columns from a decoded ACS frame
+
+    B25024_001E = Total housing units
+    B25024_002E = 1-unit detached (single-family detached)
+    B19013_001E = Median household income (negative values are suppression sentinels)
+    """
+    n = len(raw)
+    total = np.nan_to_num(_column(raw, 'B25024_001E')).astype('int64')
+    sf_detached = np.nan_to_num(_column(raw, 'B25024_002E')).astype('int64')
+    income = _column(raw, 'B19013_001E')
+
+    has_units = total > 0
+    sf_pct = np.zeros(n)
+    sf_pct[has_units] = round1(sf_detached[has_units] / total[has_units] * 100)
+    other_pct = np.zeros(n)
+    other_pct[has_units] = round1(100 - sf_pct[has_units])
+
+    zips = raw[ZCTA_FIELD] if ZCTA_FIELD in raw.columns else pd.Series([''] * n)
+    return pd.DataFrame({
+        'Zip Code': zips.to_numpy(),
+        'Total Housing Units': total,
+        'Single-Family Detached': sf_detached,
+        '% Single-Family Detached': sf_pct,
+        'Other Dwellings': total - sf_detached,
+        '% Other': other_pct,
+        'Median Household Income': np.where(income > 0, np.floor(income), np.nan),
+    }, columns=HOUSING_COLUMNS)
+
+
+def market_metrics(raw):
+    """Tenure, structure age, heating fuel, home value and income-band columns
+
+    B25003 = Tenure (001 total, 002 owner, 003 renter)
+    B25034 = Year structure built (005..011 = 1999 or earlier)
+    B25035_001E = Median year structure built
+    B25040 = House heating fuel (002 utility gas, 003 bottled/tank/LP, 004 electricity)
+    B25077_001E = Median value of owner-occupied units
+    B19001 = Household income bands (014..017 = $100,000 or more)
+    Negative medians are suppression sentinels and become NaN.
+    """
+    occupied = _counts(raw, 'B25003', [1])
+    owner = _counts(raw, 'B25003', [2])
+    structures = _counts(raw, 'B25034', [1])
+    older = _counts(raw, 'B25034', range(5, 12))
+    households = _counts(raw, 'B19001', [1])
+    affluent = _counts(raw, 'B19001', range(14, 18))
+    year_built = _column(raw, 'B25035_001E')
+    value = _column(raw, 'B25077_001E')
+    return pd.DataFrame({
+        'Owner Occupied': owner,
+        'Renter Occupied': _counts(raw, 'B25003', [3]),
+        '% Owner Occupied': _percent(owner, occupied),
+        'Built Before 2000': older,
+        '% Built Before 2000': _percent(older, structures),
+        'Median Year Built': np.where(year_built > 0, year_built, np.nan),
+        'Gas Heat': _counts(raw, 'B25040', [2, 3]),
+        'Electric Heat': _counts(raw, 'B25040', [4]),
+        'Median Home Value': np.where(value > 0, np.floor(value), np.nan),
+        'Households': households,
+        'Households $100k+': affluent,
+        '% Households $100k+': _percent(affluent, households),
+    }, columns=MARKET_COLUMNS)
+
+
+def process_census_data(tables):
+    """Process raw Census tables into the housing/income DataFrame
+
+    Tables fetched with the market variable set also get MARKET_COLUMNS.
+    """
+    raw = decode_tables(tables)
+    df = housing_metrics(raw)
+    if MARKET_MARKER in raw.columns:
+        df = pd.concat([df, market_metrics(raw)], axis=1)
+    return df
@@ -0,0 +1,133 @@
+"""
+Content manifest for incremental service-area refreshes
+Records the hash of the zones CSV, the ACS dataset it was built from, and
+per-ZIP zone percentages plus every decoded demographic column. Diffing a new
+zones CSV against it tells us which ZIPs were added, removed, or re-zoned,
+so only newly added ZIPs need a Census request.
+"""
+
+import hashlib
+import json
+import math
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import pandas as pd
+
+from demographics.decode import COUNT_COLUMNS, HOUSING_COLUMNS, MARKET_COUNT_COLUMNS
+from demographics.zones import ZONE_COLUMNS
+
+MANIFEST_VERSION = 2
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _clean(value):
+    """JSON-safe scalar: NaN -> None, numpy scalars -> Python"""
+    if value is None:
+        return None
+    if hasattr(value, "item"):
+        value = value.item()
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
+
+
+def zone_percentages(service_df):
+    """{zip: [zone 1..4 %]} for every row of the zones CSV"""
+    pct = service_df[ZONE_COLUMNS].astype("float64")
+    return {
+        zip_code: [_clean(v) for v in row]
+        for zip_code, row in zip(service_df["Zip Code"], pct.itertuples(index=False, name=None))
+    }
+
+
+@dataclass
+class ZoneDiff:
+    added: list = field(default_factory=list)
+    removed: list = field(default_factory=list)
+    rezoned: list = field(default_factory=list)
+    unchanged: list = field(default_factory=list)
+
+    @property
+    def is_empty(self):
+        return not (self.added or self.removed or self.rezoned)
+
+    def summary(self):
+        return (f"{len(self.added)} added, {len(self.removed)} removed, "
+                f"{len(self.rezoned)} re-zoned, {len(self.unchanged)} unchanged")
+
+
+@dataclass
+class Manifest:
+    zones_sha256: str
+    dataset: str
+    zones: dict = field(default_factory=dict)
+    records: dict = field(default_factory=dict)
+    columns: list = field(default_factory=lambda: list(HOUSING_COLUMNS))
+    version: int = MANIFEST_VERSION
+
+    @classmethod
+    def load(cls, path):
+        """Read a manifest; None if it is missing or from another format version"""
+        path = Path(path)
+        if not path.exists():
+            return None
+        data = json.loads(path.read_text())
+        if data.get("version") != MANIFEST_VERSION:
+            return None
+        return cls(**data)
+
+    def save(self, path):
+        path = Path(path)
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        tmp.write_text(json.dumps(self.__dict__, indent=1, sort_keys=True))
+        tmp.replace(path)
+
+    def diff(self, zones):
+        """Compare {zip: zone %} from a new zones CSV against the manifest"""
+        result = ZoneDiff()
+        for zip_code, pct in zones.items():
+            if zip_code not in self.records:
+                result.added.append(zip_code)
+            elif self.zones.get(zip_code) != pct:
+                result.rezoned.append(zip_code)
+            else:
+                result.unchanged.append(zip_code)
+        result.removed = sorted(set(self.records) - set(zones))
+        return result
+
+    def covers(self, columns):
+        """True if the stored records hold every one of `columns`"""
+        return set(columns) <= set(self.columns)
+
+    def demographics(self, zip_codes):
+        """Stored demographic records for `zip_codes`, with every stored column"""
+        rows = [self.records[z] for z in zip_codes if z in self.records]
+        df = pd.DataFrame.from_records(rows, columns=self.columns)
+        counts = COUNT_COLUMNS + MARKET_COUNT_COLUMNS
+        for col in self.columns[1:]:
+            df[col] = pd.to_numeric(df[col]).astype("int64" if col in counts else "float64")
+        return df
+
+
+def dataset_id(base_url, variables):
+    return f"{base_url}?get={variables}"
+
+
+def build_manifest(zones_sha256, dataset, zones, demo_df):
+    """Manifest for a completed refresh; ZIPs without demographics are left out
+    so the next incremental run fetches them again"""
+    columns = list(demo_df.columns)
+    records = {}
+    for record in demo_df.to_dict("records"):
+        records[record["Zip Code"]] = {k: _clean(v) for k, v in record.items()}
+    fetched = {z: pct for z, pct in zones.items() if z in records}
+    return Manifest(zones_sha256=zones_sha256, dataset=dataset, zones=fetched, records=records,
+                    columns=columns)
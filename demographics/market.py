@@ -0,0 +1,110 @@
+"""
+Zone-weighted market sizing
+A ZIP split across zones counts toward each zone in proportion to its zone
+percentages (75063 at 73.6% / 26.4% puts 73.6% of its homes in Zone 1).
+The master frame is expanded once to (ZIP x zone) rows weighted by zone
+% / 100, every metric is multiplied through, and one groupby builds the
+per-zone-and-city table; the per-zone table is rolled up from that.
+
+Addressable homes are zone-weighted single-family detached units, also
+split by the ZIP's median-income band. With the market variable set
+(--variables market) the tenure, age, heating and income-band counts are
+weighted too.
+"""
+
+import numpy as np
+import pandas as pd
+
+from demographics.columnar import save_outputs
+from demographics.config import DATA_DIR
+from demographics.decode import round1
+from demographics.zones import ZONE_COLUMNS, ZONES
+
+MARKET_BY_ZONE_CSV = f"{DATA_DIR}/DFW_HVAC_Market_Size_By_Zone.csv"
+MARKET_BY_CITY_CSV = f"{DATA_DIR}/DFW_HVAC_Market_Size_By_City.csv"
+
+WEIGHTED_COLUMNS = {
+    'Total Housing Units': 'Housing Units',
+    'Single-Family Detached': 'Addressable Homes',
+    'Other Dwellings': 'Other Dwellings',
+}
+# Market-set columns, weighted when present
+OPTIONAL_COLUMNS = ['Owner Occupied', 'Built Before 2000', 'Gas Heat', 'Electric Heat',
+                    'Households', 'Households $100k+']
+
+# Median household income band edges; ZIPs without an income go to the last label
+INCOME_BANDS = [75_000, 100_000, 150_000]
+INCOME_BAND_LABELS = ['Under $75k', '$75k-$100k', '$100k-$150k', '$150k+', 'Income N/A']
+
+
+def income_band(income):
+    """Index into INCOME_BAND_LABELS for each median income"""
+    income = np.asarray(income, dtype='float64')
+    return np.where(np.isnan(income), len(INCOME_BANDS) + 1, np.searchsorted(INCOME_BANDS, income, side='right'))
+
+
+def zone_rows(master_df):
+    """(ZIP x zone) rows with zone-weighted metrics, one per zone a ZIP touches"""
+    weights = master_df[ZONE_COLUMNS].to_numpy('float64') / 100
+    n = len(master_df)
+    zip_idx = np.repeat(np.arange(n), len(ZONES))
+    weight = weights.ravel()
+    keep = weight > 0
+    zip_idx, weight = zip_idx[keep], weight[keep]
+
+    rows = {
+        'Zone': np.tile(ZONES, n)[keep],
+        'City': master_df['City'].to_numpy()[zip_idx] if 'City' in master_df.columns else 'Unknown',
+        'ZIP Codes': 1,
+    }
+    for col, name in WEIGHTED_COLUMNS.items():
+        rows[name] = np.nan_to_num(master_df[col].to_numpy('float64'))[zip_idx] * weight
+    for col in OPTIONAL_COLUMNS:
+        if col in master_df.columns:
+            rows[col] = np.nan_to_num(master_df[col].to_numpy('float64'))[zip_idx] * weight
+
+    income = master_df['Median Household Income'].to_numpy('float64')[zip_idx]
+    has_income = ~np.isnan(income)
+    rows['_income_units'] = np.where(has_income, rows['Housing Units'], 0.0)
+    rows['_income_x_units'] = np.where(has_income, np.nan_to_num(income) * rows['Housing Units'], 0.0)
+
+    # One-hot income bands: addressable homes land in their ZIP's band column
+    band = income_band(income)
+    for i, label in enumerate(INCOME_BAND_LABELS):
+        rows[f'Addressable {label}'] = np.where(band == i, rows['Addressable Homes'], 0.0)
+    return pd.DataFrame(rows)
+
+
+def _finish(sums):
+    """Round weighted counts and derive % single-family and unit-weighted income"""
+    out = sums.drop(columns=['_income_units', '_income_x_units'])
+    counts = [c for c in out.columns if c != 'ZIP Codes']
+    out[counts] = out[counts].round().astype('int64')
+    units = sums['Housing Units'].to_numpy('float64')
+    sf_pct = np.zeros(len(out))
+    sf_pct[units > 0] = round1(sums['Addressable Homes'].to_numpy()[units > 0] / units[units > 0] * 100)
+    weight = sums['_income_units'].to_numpy('float64')
+    income = np.full(len(out), np.nan)
+    income[weight > 0] = np.floor(sums['_income_x_units'].to_numpy()[weight > 0] / weight[weight > 0])
+    out.insert(out.columns.get_loc('Other Dwellings') + 1, '% Single-Family Detached', sf_pct)
+    out.insert(out.columns.get_loc('% Single-Family Detached') + 1, 'Avg Median Income', income)
+    return out.reset_index()
+
+
+def market_size(master_df):
+    """(by_zone, by_city) addressable-homes tables for a master service-area frame
+
+    by_city has one row per (Zone, City) a ZIP touches, largest market
+    first within each zone; by_zone is its roll-up, one row per zone.
+    """
+    by_city = zone_rows(master_df).groupby(['Zone', 'City'], sort=True).sum()
+    by_zone = by_city.groupby(level='Zone').sum().reindex(ZONES, fill_value=0)
+    by_zone.index.name = 'Zone'
+    by_city = _finish(by_city).sort_values(['Zone', 'Addressable Homes', 'City'],
+                                            ascending=[True, False, True], kind='stable')
+    return _finish(by_zone), by_city.reset_index(drop=True)
+
+
+def save_market(by_zone, by_city, zone_csv=MARKET_BY_ZONE_CSV, city_csv=MARKET_BY_CITY_CSV):
+    save_outputs(by_zone, zone_csv)
+    save_outputs(by_city, city_csv)
@@ -0,0 +1,154 @@
+"""
+Multi-vintage ACS panel
+Fetches a range of ACS 5-year vintages in parallel (one client per year,
+all sharing the same session, rate budget and response cache, with the
+worker budget split between them), stacks them
+into a long table keyed by ZIP and year, and computes per-ZIP growth in
+housing units, single-family share and median income.
+
+Usage:
+    python -m demographics.panel --years 2017-2022
+
+Income growth is in nominal dollars (each vintage reports its own
+inflation-adjusted year).
+"""
+
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from demographics.cli import add_fetch_arguments, client_from_args, fetch_errors, telemetry_from_args
+from demographics.columnar import save_outputs
+from demographics.config import ACS5_URL, DATA_DIR, SERVICE_AREA_CSV, STATE_FIPS
+from demographics.decode import process_census_data
+from demographics.telemetry import run_report, timed
+
+PANEL_CSV = f"{DATA_DIR}/DFW_HVAC_ACS_Panel.csv"
+GROWTH_CSV = f"{DATA_DIR}/DFW_HVAC_Zip_Growth.csv"
+
+# First ACS 5-year vintage with ZCTAs outside the state hierarchy
+ZCTA_UNNESTED_FROM = 2020
+
+
+def acs5_dataset(year):
+    """(endpoint, geography nesting) for one ACS 5-year vintage"""
+    geo_in = f"state:{STATE_FIPS}" if year < ZCTA_UNNESTED_FROM else None
+    return ACS5_URL.format(year=year), geo_in
+
+
+def parse_years(spec):
+    """'2017-2022' or '2017,2019,2022' -> sorted list of years"""
+    years = set()
+    for part in spec.split(","):
+        if "-" in part:
+            start, end = (int(x) for x in part.split("-"))
+            years.update(range(start, end + 1))
+        else:
+            years.add(int(part))
+    return sorted(years)
+
+
+def fetch_panel(zip_codes, years, client):
+    """Long table of housing metrics keyed by (Zip Code, Year)
+
+    Years run concurrently but share `client.max_workers` between them, so
+    requests in flight never outnumber the shared session's connection pool.
+    """
+    parallel = max(1, min(len(years), client.max_workers))
+    workers = max(1, client.max_workers // parallel)
+
+    def fetch_year(year):
+        base_url, geo_in = acs5_dataset(year)
+        result = client.for_dataset(base_url, geo_in, max_workers=workers).fetch(zip_codes)
+        if result.report.unrecoverable:
+            print(f"  {year}: {result.report.summary()}")
+        df = process_census_data(result.tables)
+        df.insert(1, 'Year', year)
+        print(f"  {year}: {len(df)} zip codes")
+        return df
+
+    with ThreadPoolExecutor(max_workers=parallel) as pool:
+        frames = list(pool.map(fetch_year, years))
+
+    panel = pd.concat(frames, ignore_index=True)
+    return panel.sort_values(['Zip Code', 'Year'], kind='stable').reset_index(drop=True)
+
+
+# (panel column, output label, change column, change is a % growth rather than a point difference)
+GROWTH_METRICS = [
+    ('Total Housing Units', 'Housing Units', 'Housing Unit Growth (%)', True),
+    ('% Single-Family Detached', '% Single-Family', 'Single-Family Share Change (pts)', False),
+    ('Median Household Income', 'Median Income', 'Median Income Growth (%)', True),
+]
+
+
+def panel_growth(panel):
+    """Per-ZIP change in each metric between its first and last non-missing vintage
+
+    A metric suppressed in some vintages (median income, say) is measured
+    over the vintages that have it, and its own First/Last Year columns say
+    which ones those are.
+    """
+    ordered = panel.sort_values(['Zip Code', 'Year'], kind='stable')
+    zips = pd.Index(ordered['Zip Code'].unique(), name='Zip Code')
+    growth = pd.DataFrame(index=zips)
+    for column, label, change, relative in GROWTH_METRICS:
+        ends = (ordered.dropna(subset=[column]).groupby('Zip Code', sort=True)[['Year', column]]
+                .agg(['first', 'last']).reindex(zips))
+        first, last = ends[(column, 'first')].to_numpy('float64'), ends[(column, 'last')].to_numpy('float64')
+        growth[f'{label} First Year'] = ends[('Year', 'first')].astype('Int64')
+        growth[f'{label} Last Year'] = ends[('Year', 'last')].astype('Int64')
+        growth[f'{label} (First)'] = ends[(column, 'first')]
+        growth[f'{label} (Last)'] = ends[(column, 'last')]
+        if relative:
+            with np.errstate(divide='ignore', invalid='ignore'):
+                growth[change] = np.where(first > 0, (last - first) / first * 100, np.nan)
+        else:
+            growth[change] = last - first
+        growth[change] = growth[change].round(1)
+    growth = growth.reset_index()
+    return growth.sort_values('Housing Unit Growth (%)', ascending=False, kind='stable').reset_index(drop=True)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="ACS 5-year panel and per-ZIP growth for the service area")
+    parser.add_argument("--years", default="2017-2022", help="Vintages, e.g. 2017-2022 or 2018,2022")
+    parser.add_argument("--zones", default=SERVICE_AREA_CSV, help="Service-area zones CSV")
+    add_fetch_arguments(parser)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    years = parse_years(args.years)
+    print("=" * 80)
+    print(f"ACS 5-YEAR PANEL {years[0]}-{years[-1]}")
+    print("=" * 80)
+
+    zones = pd.read_csv(args.zones)
+    zip_codes = zones['Zip Code'].astype(str).str.zfill(5).tolist()
+    print(f"\nFetching {len(years)} vintages for {len(zip_codes)} zip codes...")
+
+    run = telemetry_from_args(args, "panel")
+    client = client_from_args(args, telemetry=run)
+    with fetch_errors(client.guard), run_report(run, args.run_report):
+        with timed(run, "fetch", len(zip_codes) * len(years)) as record:
+            panel = fetch_panel(zip_codes, years, client)
+            record["rows_out"] = len(panel)
+        with timed(run, "growth", len(panel)) as record:
+            growth = panel_growth(panel)
+            record["rows_out"] = len(growth)
+        with timed(run, "save", len(panel) + len(growth)):
+            save_outputs(panel, PANEL_CSV)
+            save_outputs(growth, GROWTH_CSV)
+
+    print("\n" + "-" * 80)
+    print("FASTEST-GROWING ZIP CODES (housing units)")
+    print("-" * 80)
+    print(growth.head(20).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,269 @@
+"""
+Demographics pipeline
+Runs the scripts as named stages:
+
+    fetch -> decode -> zones -> cities -> rank -> market -> report
+
+Every stage but the report stores its output under a key hashed from its
+inputs: the upstream stages' keys, the settings it depends on (dataset, ZIP
+list, zones-CSV hash, city table) and the source code of the stage and the
+modules it calls. A rerun recomputes only stages whose key changed. The
+report stage is never stored, so editing demographics/reports.py re-runs
+the report and nothing else. With a Telemetry attached, every stage's wall
+time and rows in/out (or its cache load) lands in the run report.
+
+Both commands fetch and decode the same ACS universe (the housing-analysis
+ZIP list plus every service-area ZIP), so whichever runs second reuses the
+first one's data.
+
+Usage:
+    python -m demographics.pipeline housing-analysis
+    python -m demographics.pipeline merge-service-area [--force]
+"""
+
+import argparse
+import hashlib
+import inspect
+import json
+from dataclasses import dataclass
+from pathlib import Path
+
+import pandas as pd
+
+from demographics import decode, market, reports, zones
+from demographics.areas import ZIP_CODES, ZIP_TO_CITY
+from demographics.cli import (
+    add_fetch_arguments,
+    client_from_args,
+    fetch_errors,
+    stage_store_from_args,
+    telemetry_from_args,
+)
+from demographics.columnar import save_outputs
+from demographics.config import DATA_DIR, MASTER_CSV, SERVICE_AREA_CSV
+from demographics.manifest import build_manifest, dataset_id, file_sha256, zone_percentages
+from demographics.telemetry import count_rows, run_report, timed
+from demographics.workbook import MASTER_XLSX, save_workbook
+from demographics.zipindex import ZIP_INDEX_JSON, write_index
+
+HOUSING_CSV = f"{DATA_DIR}/DFW_HVAC_Housing_Types.csv"
+MANIFEST_PATH = f"{DATA_DIR}/DFW_HVAC_Master_Service_Area.manifest.json"
+
+COLUMN_ORDER = [
+    'Zip Code', 'City', 'Primary Zone',
+    'Zone 1 (%)', 'Zone 2 (%)', 'Zone 3 (%)', 'Zone 4 (%)',
+    'Total Housing Units', 'Single-Family Detached', '% Single-Family Detached',
+    'Other Dwellings', '% Other', 'Median Household Income'
+]
+
+
+def code_digest(*objects):
+    """Hash of the source of functions/modules a stage depends on"""
+    digest = hashlib.sha256()
+    for obj in objects:
+        digest.update(inspect.getsource(obj).encode("utf-8"))
+    return digest.hexdigest()
+
+
+@dataclass
+class Stage:
+    """One pipeline step: run(*upstream outputs) -> output"""
+
+    name: str
+    run: object
+    after: tuple = ()
+    params: object = None
+    code: tuple = ()
+    cache: bool = True
+    # Predicate on the output; False keeps it out of the store (e.g. a
+    # fetch with transient failures) along with everything downstream
+    keep: object = None
+
+
+class Pipeline:
+    """Runs stages in dependency order, reusing stored outputs whose key is unchanged"""
+
+    def __init__(self, stages, store=None, force=False, telemetry=None):
+        self.stages = {stage.name: stage for stage in stages}
+        self.store = store
+        self.force = force
+        self.telemetry = telemetry
+        self.keys = {}
+        self.values = {}
+        self.stored = {}
+        self.status = {}
+
+    def key(self, name):
+        if name not in self.keys:
+            stage = self.stages[name]
+            raw = json.dumps({
+                "stage": name,
+                "code": code_digest(stage.run, *stage.code),
+                "params": stage.params,
+                "after": [self.key(dep) for dep in stage.after],
+            }, sort_keys=True, default=str)
+            self.keys[name] = hashlib.sha256(raw.encode("utf-8")).hexdigest()[:16]
+        return self.keys[name]
+
+    def run(self, name):
+        if name in self.values:
+            return self.values[name]
+        stage = self.stages[name]
+        key = self.key(name)
+        storable = stage.cache and self.store is not None
+
+        if storable and not self.force:
+            with timed(self.telemetry, name, status="cached", key=key) as record:
+                found, value = self.store.get(name, key)
+                record["rows_out"] = count_rows(value)
+                if not found:
+                    record["status"] = "miss"
+            if found:
+                self.values[name], self.stored[name] = value, True
+                self.status[name] = "cached"
+                print(f"  [{name}] cached ({key})")
+                return value
+
+        inputs = [self.run(dep) for dep in stage.after]
+        with timed(self.telemetry, name, count_rows(inputs), key=key) as record:
+            value = stage.run(*inputs)
+            record["rows_out"] = count_rows(value)
+        keep = all(self.stored.get(dep, True) for dep in stage.after) \
+            and (stage.keep is None or stage.keep(value))
+        if storable and keep:
+            self.store.put(name, key, value)
+        self.values[name], self.stored[name] = value, keep
+        self.status[name] = record["status"] = "ran" if keep or not storable else "ran (not stored)"
+        print(f"  [{name}] {self.status[name]} ({key})")
+        return value
+
+
+# ---- stages ---------------------------------------------------------------
+
+def acs_universe(service_df=None):
+    """Every ZIP either command needs, so both share one fetch/decode"""
+    service_zips = set() if service_df is None else set(service_df['Zip Code'])
+    return sorted(set(ZIP_CODES) | service_zips)
+
+
+def load_service_area(path=SERVICE_AREA_CSV):
+    service_df = pd.read_csv(path)
+    service_df['Zip Code'] = service_df['Zip Code'].astype(str).str.zfill(5)
+    return service_df
+
+
+def merge_zones(service_df, demo_df):
+    """Service-area rows with their demographics (left join on Zip Code)"""
+    return service_df.merge(demo_df, on='Zip Code', how='left')
+
+
+def map_cities(merged_df):
+    merged_df = merged_df.copy()
+    merged_df['City'] = merged_df['Zip Code'].map(ZIP_TO_CITY).fillna('Unknown')
+    return merged_df
+
+
+def rank_by_zone(merged_df):
+    """Sort by Primary Zone, then by zone percentage within each zone"""
+    merged_df = merged_df.copy()
+    merged_df['Primary Zone'] = zones.primary_zone(merged_df)
+    merged_df = zones.sort_by_zone(merged_df)
+    columns = COLUMN_ORDER + decode.MARKET_COLUMNS
+    return merged_df[[c for c in columns if c in merged_df.columns]]
+
+
+def rank_housing(demo_df, zip_codes=ZIP_CODES):
+    """The housing-analysis ZIPs, highest % single-family detached first"""
+    df = demo_df[demo_df['Zip Code'].isin(zip_codes)]
+    return df.sort_values('% Single-Family Detached', ascending=False)
+
+
+def acs_stages(client, zip_codes):
+    def fetch():
+        print(f"  Fetching {len(zip_codes)} zip codes from Census API...")
+        result = client.fetch(zip_codes)
+        print(f"  {result.report.summary()}")
+        if client.guard is not None:
+            print(f"  {client.guard.summary()}")
+        return result
+
+    return [
+        Stage("fetch", fetch, params={"dataset": dataset_id(client.dataset, client.variables),
+                                      "zip_codes": list(zip_codes)},
+              keep=lambda result: not result.report.failed and not result.report.quarantined),
+        Stage("decode", lambda result: decode.process_census_data(result.tables),
+              after=("fetch",), code=(decode,)),
+    ]
+
+
+def housing_pipeline(client, service_df, output_path=HOUSING_CSV, store=None, force=False, telemetry=None):
+    def report(df):
+        if df.empty:
+            print("Error: No data returned from Census API")
+            return
+        print(f"\nReceived data for {len(df)} zip codes")
+        save_outputs(df, output_path)
+        reports.print_housing_report(df)
+        found = set(df['Zip Code'])
+        reports.print_missing({z for z in ZIP_CODES if z not in found})
+
+    return Pipeline(acs_stages(client, acs_universe(service_df)) + [
+        Stage("rank", rank_housing, after=("decode",), params={"zip_codes": ZIP_CODES}),
+        Stage("report", report, after=("rank",), cache=False),
+    ], store=store, force=force, telemetry=telemetry)
+
+
+def service_area_pipeline(client, service_df, zones_csv=SERVICE_AREA_CSV, master_csv=MASTER_CSV,
+                          manifest_path=MANIFEST_PATH, zip_index_path=ZIP_INDEX_JSON,
+                          market_csvs=(market.MARKET_BY_ZONE_CSV, market.MARKET_BY_CITY_CSV),
+                          workbook_path=MASTER_XLSX, store=None, force=False, telemetry=None):
+    dataset = dataset_id(client.base_url, client.variables)
+
+    def report(master, demo_df, market_tables):
+        save_outputs(master, master_csv)
+        service_demo = demo_df[demo_df['Zip Code'].isin(service_df['Zip Code'])]
+        build_manifest(file_sha256(zones_csv), dataset, zone_percentages(service_df),
+                       service_demo).save(manifest_path)
+        print(f"Saved to {write_index(master, zip_index_path)}")
+        market.save_market(*market_tables, *market_csvs)
+        save_workbook(master, *market_tables, path=workbook_path)
+        reports.print_service_area_report(master, market_tables[0])
+
+    return Pipeline(acs_stages(client, acs_universe(service_df)) + [
+        Stage("zones", lambda demo_df: merge_zones(service_df, demo_df), after=("decode",),
+              params={"zones_sha256": file_sha256(zones_csv)}, code=(merge_zones,)),
+        Stage("cities", map_cities, after=("zones",), params={"zip_to_city": ZIP_TO_CITY}),
+        Stage("rank", rank_by_zone, after=("cities",),
+              params={"columns": COLUMN_ORDER + decode.MARKET_COLUMNS}, code=(zones,)),
+        Stage("market", market.market_size, after=("rank",), code=(market, decode.round1)),
+        Stage("report", report, after=("rank", "decode", "market"), cache=False),
+    ], store=store, force=force, telemetry=telemetry)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Demographics pipeline: fetch -> decode -> zones -> cities -> rank -> market -> report")
+    parser.add_argument("command", choices=["housing-analysis", "merge-service-area"])
+    parser.add_argument("--zones", default=SERVICE_AREA_CSV, help="Service-area zones CSV")
+    parser.add_argument("--force", action="store_true", help="Recompute every stage")
+    add_fetch_arguments(parser)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    run = telemetry_from_args(args, args.command)
+    client = client_from_args(args, telemetry=run)
+    store = stage_store_from_args(args)
+    if args.command == "housing-analysis":
+        service_df = load_service_area(args.zones) if Path(args.zones).exists() else None
+        pipeline = housing_pipeline(client, service_df, store=store, force=args.force, telemetry=run)
+    else:
+        service_df = load_service_area(args.zones)
+        pipeline = service_area_pipeline(client, service_df, zones_csv=args.zones,
+                                         store=store, force=args.force, telemetry=run)
+    with fetch_errors(client.guard), run_report(run, args.run_report):
+        pipeline.run("report")
+
+
+if __name__ == "__main__":
+    main()
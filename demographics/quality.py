@@ -0,0 +1,198 @@
+"""
+Data-quality guardrails for ACS batches
+process_census_data turns suppressed or negative medians into NaN and zero
+housing units into 0% shares without complaint, so a broken refresh (wrong
+vintage, a renamed variable, an API outage answering 204s) used to produce
+a plausible-looking master CSV. CensusClient runs a QualityGuard on every
+ZCTA batch (and, in tract mode, every county partition) as it arrives,
+counting per batch:
+
+    suppressed_income  rows whose median household income is suppressed
+    zero_units         rows with no housing units
+    missing            requested ZCTAs the API did not return
+    out_of_range       rows with a percentage outside 0-100
+
+A batch over any threshold in config.QUALITY_THRESHOLDS either aborts the
+run on the spot (policy "fail") or is set aside as JSON under
+QUARANTINE_DIR and left out of the results (policy "quarantine"); too many
+quarantined batches abort the run anyway.
+"""
+
+import datetime
+import json
+import re
+import threading
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from urllib.parse import unquote, urlsplit
+
+from demographics.client import ZCTA_FIELD
+from demographics.config import QUALITY_MAX_QUARANTINED, QUALITY_MIN_BATCH, QUALITY_THRESHOLDS, QUARANTINE_DIR
+from demographics.decode import MARKET_MARKER, decode_tables, housing_metrics, market_metrics
+
+POLICIES = ("fail", "quarantine")
+METRICS = ("suppressed_income", "zero_units", "missing", "out_of_range")
+
+
+def parse_threshold(spec):
+    """'missing=0.8' -> ("missing", 0.8), for --quality-threshold"""
+    metric, _, share = spec.partition("=")
+    if metric not in METRICS:
+        raise ValueError(f"Unknown quality metric {metric!r}; expected one of {', '.join(METRICS)}")
+    share = float(share)
+    if not 0 <= share <= 1:
+        raise ValueError(f"Quality threshold for {metric} must be a share between 0 and 1")
+    return metric, share
+
+
+def dataset_label(dataset):
+    """Filename-safe dataset tag: '.../data/2019/acs/acs5?in=state:48' -> '2019-acs-acs5-state-48'"""
+    parts = urlsplit(dataset)
+    text = parts.path.removeprefix("/data/") + "-" + unquote(parts.query).removeprefix("in=")
+    return re.sub(r"[^0-9A-Za-z]+", "-", text).strip("-")
+
+
+class QualityError(ValueError):
+    """Raised when a batch (or the pile of quarantined batches) breaks the thresholds"""
+
+    def __init__(self, message, quality=None):
+        super().__init__(message)
+        self.quality = quality
+
+
+@dataclass
+class BatchQuality:
+    """Quality counts for one batch; `problems` names each threshold it broke"""
+
+    number: int
+    requested: int
+    dataset: str = ""
+    rows: int = 0
+    suppressed_income: int = 0
+    zero_units: int = 0
+    missing: int = 0
+    out_of_range: int = 0
+    problems: list = field(default_factory=list)
+
+    @property
+    def bad(self):
+        return bool(self.problems)
+
+    def summary(self):
+        return "; ".join(self.problems) if self.problems else "ok"
+
+
+def measure(number, batch, table, failed=(), dataset=""):
+    """BatchQuality counts for a joined [headers, *rows] batch table (thresholds not applied)
+
+    `batch` is the requested ZCTAs; None for an area query (tracts or block
+    groups in one county), where every returned row counts as requested.
+    """
+    raw = decode_tables([table] if table else [])
+    if batch is None:
+        quality = BatchQuality(number, requested=len(raw), dataset=dataset, rows=len(raw))
+    else:
+        quality = BatchQuality(number, requested=len(batch), dataset=dataset, rows=len(raw))
+        failed = set(failed)
+        returned = set(raw[ZCTA_FIELD]) if ZCTA_FIELD in raw.columns else set()
+        quality.missing = sum(1 for z in batch if z not in returned and z not in failed)
+    if not len(raw):
+        return quality
+
+    df = housing_metrics(raw)
+    if MARKET_MARKER in raw.columns:
+        df = df.join(market_metrics(raw))
+    quality.suppressed_income = int(df['Median Household Income'].isna().sum())
+    quality.zero_units = int((df['Total Housing Units'] == 0).sum())
+    percents = df[[c for c in df.columns if c.startswith('% ')]].to_numpy(dtype='float64')
+    quality.out_of_range = int(((percents < 0) | (percents > 100)).any(axis=1).sum())
+    return quality
+
+
+class QualityGuard:
+    """Applies thresholds to each batch as the client finishes it
+
+    check() returns the batch's BatchQuality; bad batches raise QualityError
+    under the "fail" policy, and are written to `quarantine_dir` under
+    "quarantine" (the caller then drops them). Thread-safe.
+    """
+
+    def __init__(self, policy="fail", thresholds=None, min_batch=QUALITY_MIN_BATCH,
+                 max_quarantined=QUALITY_MAX_QUARANTINED, quarantine_dir=QUARANTINE_DIR, telemetry=None):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown quality policy {policy!r}; expected one of {', '.join(POLICIES)}")
+        self.policy = policy
+        self.thresholds = {**QUALITY_THRESHOLDS, **(thresholds or {})}
+        self.min_batch = min_batch
+        self.max_quarantined = max_quarantined
+        self.quarantine_dir = Path(quarantine_dir)
+        self.telemetry = telemetry
+        self.totals = dict.fromkeys(METRICS, 0)
+        self.batches = 0
+        self.quarantined = []
+        self._run = telemetry.run_id if telemetry is not None else \
+            datetime.datetime.now().strftime("%Y%m%dT%H%M%S")
+        self._lock = threading.Lock()
+
+    def judge(self, quality):
+        """Fill in quality.problems from the thresholds"""
+        if quality.out_of_range > self.thresholds["out_of_range"] * max(quality.rows, 1):
+            quality.problems.append(f"{quality.out_of_range} rows with a percentage outside 0-100")
+        if quality.requested < self.min_batch:
+            return quality
+        shares = {
+            "suppressed_income": (quality.suppressed_income, quality.rows, "suppressed median income"),
+            "zero_units": (quality.zero_units, quality.rows, "zero housing units"),
+            "missing": (quality.missing, quality.requested, "ZCTAs not returned"),
+        }
+        for metric, (count, total, label) in shares.items():
+            if total and count / total > self.thresholds[metric]:
+                quality.problems.append(f"{count}/{total} {label} (limit {self.thresholds[metric]:.0%})")
+        return quality
+
+    def check(self, number, batch, table, failed=(), dataset=""):
+        """Measure and judge one batch of `dataset` (see measure() for `batch`)"""
+        quality = self.judge(measure(number, batch, table, failed, dataset))
+        with self._lock:
+            self.batches += 1
+            for metric in METRICS:
+                self.totals[metric] += getattr(quality, metric)
+            if quality.bad and self.policy == "quarantine":
+                self.quarantined.append(quality)
+            too_many = len(self.quarantined) > self.max_quarantined
+        if self.telemetry is not None:
+            for metric in METRICS:
+                self.telemetry.count(f"quality_{metric}", getattr(quality, metric))
+            self.telemetry.count("quality_bad_batches", int(quality.bad))
+
+        if not quality.bad:
+            return quality
+        if self.policy == "fail":
+            raise QualityError(f"Batch {number} failed data-quality checks: {quality.summary()}", quality)
+        path = self._quarantine(quality, batch, table)
+        print(f"  Batch {number}: quarantined to {path} ({quality.summary()})")
+        if too_many:
+            raise QualityError(f"{len(self.quarantined)} batches quarantined (limit {self.max_quarantined}); "
+                               f"aborting the refresh", quality)
+        return quality
+
+    def _quarantine(self, quality, batch, table):
+        self.quarantine_dir.mkdir(parents=True, exist_ok=True)
+        # Panel vintages share one guard and number their batches from 1 each
+        name = "-".join(filter(None, [self._run, dataset_label(quality.dataset), f"batch{quality.number:05d}"]))
+        path = self.quarantine_dir / f"{name}.json"
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"quality": asdict(quality), "zctas": list(batch or []), "table": table}, f)
+        return path
+
+    def summary(self):
+        line = f"Data quality: {self.batches} batches checked"
+        counts = ", ".join(f"{n} {metric.replace('_', ' ')}" for metric, n in self.totals.items() if n)
+        if counts:
+            line += f" ({counts})"
+        if self.quarantined:
+            several = len({q.dataset for q in self.quarantined}) > 1
+            line += f", {len(self.quarantined)} quarantined: " + \
+                ", ".join(f"{dataset_label(q.dataset)} {q.number}" if several else str(q.number)
+                          for q in self.quarantined)
+        return line
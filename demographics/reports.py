@@ -0,0 +1,97 @@
+"""
+Console reports for the demographics scripts
+Formatting only: every function takes finished tables and prints them.
+The pipeline never caches this stage, so edits here re-run only the report.
+"""
+
+import pandas as pd
+
+
+def format_income(series):
+    return series.apply(lambda x: f"${x:,.0f}" if pd.notna(x) else "N/A")
+
+
+def print_housing_summary(total_units, total_sf, total_other, avg_income, top_sf, top_income):
+    print("\n" + "=" * 70)
+    print("SUMMARY")
+    print("=" * 70)
+
+    print(f"\nTotal Housing Units Across All Zip Codes: {total_units:,}")
+    print(f"Single-Family Detached:                   {total_sf:,} ({total_sf/total_units*100:.1f}%)")
+    print(f"Other Dwelling Types:                     {total_other:,} ({total_other/total_units*100:.1f}%)")
+    print(f"Average Median Household Income:          ${avg_income:,.0f}")
+
+    print("\n" + "-" * 70)
+    print("TOP 20 ZIP CODES BY % SINGLE-FAMILY DETACHED")
+    print("-" * 70)
+    top20 = top_sf[['Zip Code', '% Single-Family Detached', 'Total Housing Units', 'Median Household Income']].head(20).copy()
+    top20['Median Household Income'] = format_income(top20['Median Household Income'])
+    print(top20.to_string(index=False))
+
+    print("\n" + "-" * 70)
+    print("TOP 20 ZIP CODES BY MEDIAN HOUSEHOLD INCOME")
+    print("-" * 70)
+    top_income = top_income[['Zip Code', 'Median Household Income', '% Single-Family Detached', 'Total Housing Units']].head(20).copy()
+    top_income['Median Household Income'] = format_income(top_income['Median Household Income'])
+    print(top_income.to_string(index=False))
+
+
+def print_housing_report(df):
+    """Summary of a housing table already sorted by % single-family detached"""
+    by_income = df.dropna(subset=['Median Household Income']).sort_values('Median Household Income', ascending=False)
+    print_housing_summary(df['Total Housing Units'].sum(), df['Single-Family Detached'].sum(),
+                          df['Other Dwellings'].sum(), df['Median Household Income'].dropna().mean(),
+                          df, by_income)
+
+
+def print_missing(missing):
+    if missing:
+        print(f"\n⚠️  Zip codes not found in Census data: {', '.join(sorted(missing))}")
+
+
+def print_market_size(by_zone):
+    """Zone-weighted addressable homes (demographics.market.market_size)"""
+    print("\n" + "-" * 80)
+    print("MARKET SIZE BY ZONE (split ZIPs weighted by zone %)")
+    print("-" * 80)
+    table = by_zone[['Zone', 'ZIP Codes', 'Housing Units', 'Addressable Homes',
+                     '% Single-Family Detached', 'Avg Median Income']].copy()
+    table['Avg Median Income'] = format_income(table['Avg Median Income'])
+    print(table.to_string(index=False))
+
+
+def print_service_area_report(merged_df, market_by_zone=None):
+    print("\n" + "=" * 80)
+    print("SUMMARY")
+    print("=" * 80)
+
+    print(f"\nTotal Zip Codes: {len(merged_df)}")
+    print(f"\nBy Primary Zone:")
+    counts = merged_df['Primary Zone'].value_counts()
+    for zone in [1, 2, 3, 4]:
+        print(f"  Zone {zone}: {counts.get(zone, 0)} zip codes")
+
+    total_units = merged_df['Total Housing Units'].sum()
+    total_sf = merged_df['Single-Family Detached'].sum()
+    avg_income = merged_df['Median Household Income'].dropna().mean()
+
+    print(f"\nTotal Housing Units: {total_units:,}")
+    print(f"Single-Family Detached: {total_sf:,} ({total_sf/total_units*100:.1f}%)")
+    print(f"Average Median Income: ${avg_income:,.0f}")
+
+    if market_by_zone is not None:
+        print_market_size(market_by_zone)
+
+    print("\n" + "-" * 80)
+    print("ZONE 1 ZIP CODES (<15 min from HQ)")
+    print("-" * 80)
+    zone1 = merged_df[merged_df['Primary Zone'] == 1][['Zip Code', 'City', 'Zone 1 (%)', '% Single-Family Detached', 'Median Household Income']]
+    zone1['Median Household Income'] = format_income(zone1['Median Household Income'])
+    print(zone1.to_string(index=False))
+
+    print("\n" + "-" * 80)
+    print("ZONE 2 SAMPLE (15-30 min) - First 15")
+    print("-" * 80)
+    zone2 = merged_df[merged_df['Primary Zone'] == 2][['Zip Code', 'City', 'Zone 2 (%)', '% Single-Family Detached', 'Median Household Income']].head(15)
+    zone2['Median Household Income'] = format_income(zone2['Median Household Income'])
+    print(zone2.to_string(index=False))
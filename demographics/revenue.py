@@ -0,0 +1,191 @@
+"""
+Replacement-revenue projection by ZIP and zone
+Reads the replacement-estimator pricing sheets straight from
+frontend/lib/estimator-matrix.js (so the projection always uses the prices
+the site quotes) and prices every estimator input combination once, with the
+same math as calculateReplacementRange(). Each ZIP's single-family homes are
+then cross-joined with that grid as matrix products:
+
+    expected price per home = sum over combos of P(combo | ZIP) x price(combo)
+
+P(combo | ZIP) is the home-size / system / tier / efficiency mix below times
+a duct-condition mix taken from the ZIP's year-built split (with the market
+variable set) or the sheet's "unknown" ducts otherwise. Zones are weighted
+by each ZIP's zone percentages, like demographics.market.
+
+Usage:
+    python -m demographics.revenue
+    python -m demographics.revenue --master DFW_HVAC_Master_Service_Area.csv --matrix frontend/lib/estimator-matrix.js
+"""
+
+import argparse
+import itertools
+import json
+import re
+import time
+
+import numpy as np
+import pandas as pd
+
+from demographics.columnar import save_outputs
+from demographics.config import DATA_DIR, ESTIMATOR_MATRIX_JS, MASTER_CSV, REPLACEMENT_CYCLE_YEARS
+from demographics.zones import ZONE_COLUMNS, ZONES
+
+REVENUE_BY_ZIP_CSV = f"{DATA_DIR}/DFW_HVAC_Revenue_By_Zip.csv"
+REVENUE_BY_ZONE_CSV = f"{DATA_DIR}/DFW_HVAC_Revenue_By_Zone.csv"
+
+SHEETS = ["SQFT_TONNAGE", "SYSTEM_TYPE_BASE", "STAGE_MULTIPLIER", "SEER_ADD", "DUCT_ADD", "GLOBAL_VARIANCE"]
+# Estimator inputs in calculateReplacementRange() argument order, with their sheets
+INPUTS = [("sqft", "SQFT_TONNAGE"), ("system_type", "SYSTEM_TYPE_BASE"), ("stage", "STAGE_MULTIPLIER"),
+          ("seer", "SEER_ADD"), ("ducts", "DUCT_ADD")]
+
+# Share of single-family homes by estimator input. Placeholder DFW
+# assumptions, like the pricing sheets themselves; options left out
+# (not_sure) get no weight. Each dimension sums to 1.
+HOME_MIX = {
+    "sqft": {"under_1500": 0.20, "1500_2500": 0.45, "2500_3500": 0.22, "3500_5000": 0.10, "over_5000": 0.03},
+    "system_type": {"matched": 0.55, "ac_only": 0.25, "heat_pump": 0.15, "furnace_only": 0.03, "mini_split": 0.02},
+    "stage": {"value": 0.50, "standard": 0.35, "premium": 0.15},
+    "seer": {"baseline": 0.50, "mid": 0.35, "high": 0.15},
+}
+# Duct condition by structure age: built 2000 or later vs. before 2000
+DUCTS_NEWER = {"newer_fine": 0.6, "older_ok": 0.4}
+DUCTS_OLDER = {"older_ok": 0.3, "needs_work": 0.5, "full_replacement": 0.2}
+DUCTS_UNKNOWN = {"unknown": 1.0}
+
+_CONST = re.compile(r"export const (\w+) = (\{.*?\n\})", re.S)
+
+
+def _js_object(text):
+    """JSON from a JS object literal of numbers / nested objects (comments, bare keys, trailing commas)"""
+    text = re.sub(r"//[^\n]*", "", text)
+    text = re.sub(r"([{,]\s*)([A-Za-z_]\w*)\s*:", r'\1"\2":', text)
+    text = text.replace("'", '"')
+    text = re.sub(r",(\s*[}\]])", r"\1", text)
+    return json.loads(text)
+
+
+def load_matrix(path=ESTIMATOR_MATRIX_JS):
+    """{sheet name: values} for every pricing sheet in estimator-matrix.js"""
+    with open(path, encoding="utf-8") as f:
+        source = f.read()
+    found = {name: body for name, body in _CONST.findall(source)}
+    missing = [name for name in SHEETS if name not in found]
+    if missing:
+        raise ValueError(f"{path}: missing pricing sheets {missing}")
+    return {name: _js_object(found[name]) for name in SHEETS}
+
+
+def round_to_hundred(values):
+    """Math.round(n / 100) * 100 (halves round up, unlike Python's round)"""
+    return np.floor(np.asarray(values, dtype="float64") / 100 + 0.5) * 100
+
+
+def price_grid(matrix):
+    """Low/high installed price for every estimator input combination, one row each"""
+    options = [list(matrix[sheet]) for _, sheet in INPUTS]
+    grid = pd.DataFrame(list(itertools.product(*options)), columns=[name for name, _ in INPUTS])
+
+    tonnage = grid["sqft"].map(matrix["SQFT_TONNAGE"]).to_numpy("float64")
+    stage = grid["stage"].map(matrix["STAGE_MULTIPLIER"]).to_numpy("float64")
+    seer = grid["seer"].map(matrix["SEER_ADD"]).to_numpy("float64")
+    variance = matrix["GLOBAL_VARIANCE"]
+    for bound, pct in (("low", "lowPct"), ("high", "highPct")):
+        base = grid["system_type"].map({k: v[bound] for k, v in matrix["SYSTEM_TYPE_BASE"].items()})
+        duct = grid["ducts"].map({k: v[bound] for k, v in matrix["DUCT_ADD"].items()})
+        price = (base.to_numpy("float64") * tonnage * stage + seer + duct.to_numpy("float64")) * variance[pct]
+        grid[bound] = round_to_hundred(price).astype("int64")
+    grid["tonnage"] = tonnage
+    return grid
+
+
+def duct_prices(grid, mix=HOME_MIX):
+    """Expected (low, high) price per home for each duct condition, averaged over the home mix"""
+    weight = np.ones(len(grid))
+    for name, shares in mix.items():
+        weight *= grid[name].map(shares).fillna(0).to_numpy("float64")
+    weighted = grid[["low", "high"]].mul(weight, axis=0).assign(ducts=grid["ducts"], weight=weight)
+    sums = weighted.groupby("ducts", sort=False).sum()
+    return sums[["low", "high"]].div(sums["weight"], axis=0)
+
+
+def duct_mix(df, ducts):
+    """(ZIPs x duct conditions) probabilities from each ZIP's share of homes built before 2000"""
+    def row(shares):
+        return np.array([shares.get(d, 0.0) for d in ducts])
+
+    if "% Built Before 2000" not in df.columns:
+        return np.tile(row(DUCTS_UNKNOWN), (len(df), 1))
+    older = df["% Built Before 2000"].to_numpy("float64")[:, None] / 100
+    mix = older * row(DUCTS_OLDER) + (1 - older) * row(DUCTS_NEWER)
+    # No year-built data for this ZIP: the sheet's own "unknown" ducts
+    return np.where(np.isnan(older), row(DUCTS_UNKNOWN), mix)
+
+
+def project_revenue(master_df, grid, mix=HOME_MIX, cycle_years=REPLACEMENT_CYCLE_YEARS):
+    """(by_zip, by_zone) low/high replacement revenue if every single-family system were replaced
+
+    Annual columns spread that over one replacement cycle.
+    """
+    prices = duct_prices(grid, mix)
+    per_home = duct_mix(master_df, list(prices.index)) @ prices[["low", "high"]].to_numpy()
+    homes = np.nan_to_num(master_df["Single-Family Detached"].to_numpy("float64"))
+    revenue = homes[:, None] * per_home
+
+    by_zip = pd.DataFrame({
+        col: master_df[col].to_numpy() for col in ("Zip Code", "City", "Primary Zone") if col in master_df.columns
+    })
+    by_zip["Single-Family Detached"] = homes.astype("int64")
+    by_zip["Price per Home (Low)"] = round_to_hundred(per_home[:, 0]).astype("int64")
+    by_zip["Price per Home (High)"] = round_to_hundred(per_home[:, 1]).astype("int64")
+    by_zip["Revenue Potential (Low)"] = revenue[:, 0].round().astype("int64")
+    by_zip["Revenue Potential (High)"] = revenue[:, 1].round().astype("int64")
+    by_zip["Annual Revenue (Low)"] = (revenue[:, 0] / cycle_years).round().astype("int64")
+    by_zip["Annual Revenue (High)"] = (revenue[:, 1] / cycle_years).round().astype("int64")
+
+    weights = master_df[ZONE_COLUMNS].to_numpy("float64") / 100
+    zone_homes = weights.T @ homes
+    zone_revenue = weights.T @ revenue
+    by_zone = pd.DataFrame({
+        "Zone": ZONES,
+        "Single-Family Detached": zone_homes.round().astype("int64"),
+        "Revenue Potential (Low)": zone_revenue[:, 0].round().astype("int64"),
+        "Revenue Potential (High)": zone_revenue[:, 1].round().astype("int64"),
+        "Annual Revenue (Low)": (zone_revenue[:, 0] / cycle_years).round().astype("int64"),
+        "Annual Revenue (High)": (zone_revenue[:, 1] / cycle_years).round().astype("int64"),
+    })
+    return by_zip, by_zone
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Replacement-revenue potential by ZIP and zone from the estimator matrix")
+    parser.add_argument("--master", default=MASTER_CSV, help="Master service-area CSV")
+    parser.add_argument("--matrix", default=ESTIMATOR_MATRIX_JS, help="estimator-matrix.js")
+    parser.add_argument("--out-zip", default=REVENUE_BY_ZIP_CSV)
+    parser.add_argument("--out-zone", default=REVENUE_BY_ZONE_CSV)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    master = pd.read_csv(args.master, dtype={"Zip Code": str})
+    start = time.perf_counter()
+    grid = price_grid(load_matrix(args.matrix))
+    by_zip, by_zone = project_revenue(master, grid)
+    elapsed = time.perf_counter() - start
+    print(f"Priced {len(grid):,} estimator combinations x {len(master)} zip codes in {elapsed:.2f}s")
+
+    save_outputs(by_zip, args.out_zip)
+    save_outputs(by_zone, args.out_zone)
+
+    table = by_zone.copy()
+    for col in table.columns[2:]:
+        table[col] = table[col].apply(lambda x: f"${x:,.0f}")
+    print("\n" + "-" * 80)
+    print(f"REPLACEMENT REVENUE BY ZONE (annual = full potential / {REPLACEMENT_CYCLE_YEARS} years)")
+    print("-" * 80)
+    print(table.to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+"""
+Nearest-depot zoning from ZCTA centroids
+Loads ZCTA centroids (Census Gazetteer format), indexes them on a uniform
+lat/lon grid, and assigns every ZCTA within reach of a depot to a drive-time
+zone in one vectorized pass over a (ZCTA x depot) distance matrix. Adding a
+technician depot re-zones the whole area in well under a second instead of
+re-commissioning DFW_HVAC_Service_Area_Zones.csv by hand.
+
+Drive times are estimates (straight-line miles x circuity / average speed),
+not routed times.
+
+Usage:
+    python -m demographics.spatial --out zones.csv
+    python -m demographics.spatial --depot "Coppell HQ:32.9545,-96.9903" --depot "Frisco:33.1507,-96.8236"
+
+The centroid file is not shipped with the repo: download the ZCTA Gazetteer
+file (2020_Gaz_zcta_national.txt) from census.gov into ZCTA_CENTROIDS.
+"""
+
+import argparse
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from demographics.config import (
+    AVERAGE_SPEED_MPH,
+    CIRCUITY_FACTOR,
+    DATA_DIR,
+    HQ_DEPOT,
+    ZCTA_CENTROIDS,
+    ZONE_DRIVE_MINUTES,
+)
+from demographics.zones import ZONE_COLUMNS, ZONES
+
+EARTH_RADIUS_MI = 3958.8
+MILES_PER_DEGREE_LAT = 69.09
+ZONES_OUT_CSV = f"{DATA_DIR}/DFW_HVAC_Service_Area_Zones_Computed.csv"
+
+
+@dataclass(frozen=True)
+class Depot:
+    name: str
+    lat: float
+    lon: float
+
+
+HQ = Depot(*HQ_DEPOT)
+
+
+def parse_depot(spec):
+    """'Name:lat,lon' -> Depot"""
+    name, _, coords = spec.rpartition(":")
+    lat, lon = (float(x) for x in coords.split(","))
+    return Depot(name or f"{lat},{lon}", lat, lon)
+
+
+def load_centroids(path=ZCTA_CENTROIDS):
+    """Zip Code / Latitude / Longitude from a Gazetteer file (tab-separated) or CSV
+
+    Needs the Gazetteer columns GEOID, INTPTLAT and INTPTLONG.
+    """
+    with open(path) as f:
+        sep = "\t" if "\t" in f.readline() else ","
+    df = pd.read_csv(path, sep=sep, dtype={"GEOID": str})
+    df.columns = df.columns.str.strip()
+    missing = {"GEOID", "INTPTLAT", "INTPTLONG"} - set(df.columns)
+    if missing:
+        raise ValueError(f"{path}: missing centroid columns {sorted(missing)}")
+    return pd.DataFrame({
+        "Zip Code": df["GEOID"].str.strip().str.zfill(5),
+        "Latitude": df["INTPTLAT"].astype("float64"),
+        "Longitude": df["INTPTLONG"].astype("float64"),
+    })
+
+
+def haversine_miles(lat1, lon1, lat2, lon2):
+    """Great-circle distance in miles; broadcasts like any NumPy ufunc"""
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(a, dtype="float64")) for a in (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_MI * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+def drive_minutes(miles, circuity=CIRCUITY_FACTOR, speed_mph=AVERAGE_SPEED_MPH):
+    return np.asarray(miles) * circuity / speed_mph * 60
+
+
+class GridIndex:
+    """Uniform lat/lon grid over points; radius and nearest-neighbour queries
+
+    Points are sorted by cell once, so each cell is a contiguous slice of
+    the sort order and a query only measures points in the cells its
+    bounding box touches.
+    """
+
+    def __init__(self, lat, lon, cell_deg=0.1):
+        self.lat = np.asarray(lat, dtype="float64")
+        self.lon = np.asarray(lon, dtype="float64")
+        self.cell_deg = cell_deg
+        rows, cols = self._cell(self.lat, self.lon)
+        keys = rows * 1_000_000 + cols
+        self._order = np.argsort(keys, kind="stable")
+        cell_keys, starts = np.unique(keys[self._order], return_index=True)
+        ends = np.append(starts[1:], len(keys))
+        self._cells = dict(zip(cell_keys.tolist(), zip(starts.tolist(), ends.tolist())))
+
+    def __len__(self):
+        return len(self.lat)
+
+    def _cell(self, lat, lon):
+        # Offset keeps every row/col index non-negative
+        return (np.floor((np.asarray(lat) + 90) / self.cell_deg).astype("int64"),
+                np.floor((np.asarray(lon) + 180) / self.cell_deg).astype("int64"))
+
+    def _candidates(self, lat, lon, miles):
+        dlat = miles / MILES_PER_DEGREE_LAT
+        dlon = miles / (MILES_PER_DEGREE_LAT * max(np.cos(np.radians(lat)), 1e-6))
+        (r0, r1), (c0, c1) = self._cell(np.array([lat - dlat, lat + dlat]), np.array([lon - dlon, lon + dlon]))
+        slices = [self._cells[r * 1_000_000 + c]
+                  for r in range(r0, r1 + 1) for c in range(c0, c1 + 1)
+                  if r * 1_000_000 + c in self._cells]
+        if not slices:
+            return np.empty(0, dtype="int64")
+        return np.concatenate([self._order[start:end] for start, end in slices])
+
+    def within(self, lat, lon, miles):
+        """(indices, distances) of points within `miles`, nearest first"""
+        idx = self._candidates(lat, lon, miles)
+        dist = haversine_miles(lat, lon, self.lat[idx], self.lon[idx])
+        keep = dist <= miles
+        idx, dist = idx[keep], dist[keep]
+        order = np.argsort(dist, kind="stable")
+        return idx[order], dist[order]
+
+    def nearest(self, lat, lon, k=1):
+        """(indices, distances) of the k nearest points"""
+        k = min(k, len(self))
+        miles = self.cell_deg * MILES_PER_DEGREE_LAT
+        while True:
+            idx, dist = self.within(lat, lon, miles)
+            if len(idx) >= k:
+                return idx[:k], dist[:k]
+            miles *= 2
+
+
+def assign_zones(centroids, depots, bounds=ZONE_DRIVE_MINUTES, index=None,
+                 circuity=CIRCUITY_FACTOR, speed_mph=AVERAGE_SPEED_MPH):
+    """Nearest depot, distance, drive time and zone for every ZCTA within reach
+
+    The grid index narrows the candidates to ZCTAs inside the last zone's
+    radius of any depot; one (candidate x depot) distance matrix then picks
+    each ZCTA's nearest depot. ZCTAs beyond the last bound are left out.
+    """
+    depots = list(depots)
+    if not depots:
+        raise ValueError("assign_zones needs at least one depot")
+    index = index or GridIndex(centroids["Latitude"], centroids["Longitude"])
+    reach = bounds[-1] / 60 * speed_mph / circuity
+    candidates = np.unique(np.concatenate([index.within(d.lat, d.lon, reach)[0] for d in depots]))
+
+    lat = centroids["Latitude"].to_numpy()[candidates]
+    lon = centroids["Longitude"].to_numpy()[candidates]
+    depot_lat = np.array([d.lat for d in depots])
+    depot_lon = np.array([d.lon for d in depots])
+    dist = haversine_miles(lat[:, None], lon[:, None], depot_lat[None, :], depot_lon[None, :])
+    nearest = dist.argmin(axis=1)
+    miles = dist[np.arange(len(candidates)), nearest]
+    minutes = drive_minutes(miles, circuity, speed_mph)
+    zone = np.searchsorted(np.asarray(bounds, dtype="float64"), minutes, side="left") + 1
+
+    result = pd.DataFrame({
+        "Zip Code": centroids["Zip Code"].to_numpy()[candidates],
+        "Nearest Depot": np.array([d.name for d in depots], dtype=object)[nearest],
+        "Distance (mi)": miles.round(1),
+        "Drive Time (min)": minutes.round(1),
+        "Primary Zone": zone,
+    })
+    result = result[result["Primary Zone"] <= len(bounds)]
+    return result.sort_values(["Primary Zone", "Drive Time (min)", "Zip Code"], kind="stable").reset_index(drop=True)
+
+
+def zones_frame(assignments):
+    """Zones-CSV layout (Zip Code + Zone 1..4 (%)) for merge_service_area.py
+
+    Each ZCTA sits wholly in its centroid's zone (100%); drive time and depot
+    ride along as extra columns.
+    """
+    out = pd.DataFrame({"Zip Code": assignments["Zip Code"].to_numpy()})
+    zone = assignments["Primary Zone"].to_numpy()
+    for z, col in zip(ZONES, ZONE_COLUMNS):
+        out[col] = np.where(zone == z, 100.0, 0.0)
+    out["Drive Time (min)"] = assignments["Drive Time (min)"].to_numpy()
+    out["Nearest Depot"] = assignments["Nearest Depot"].to_numpy()
+    return out
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Drive-time zones from ZCTA centroids and depots")
+    parser.add_argument("--centroids", default=ZCTA_CENTROIDS, help="Gazetteer ZCTA file (GEOID, INTPTLAT, INTPTLONG)")
+    parser.add_argument("--depot", action="append", type=parse_depot,
+                        help="Depot as 'Name:lat,lon' (repeatable; default: Coppell HQ)")
+    parser.add_argument("--out", default=ZONES_OUT_CSV, help="Zones CSV to write")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    depots = args.depot or [HQ]
+    centroids = load_centroids(args.centroids)
+    print(f"Loaded {len(centroids):,} ZCTA centroids; zoning from {len(depots)} depot(s)")
+
+    assignments = assign_zones(centroids, depots)
+    zones_frame(assignments).to_csv(args.out, index=False)
+    print(f"\nSaved to {args.out}")
+
+    print(f"\nZCTAs within {ZONE_DRIVE_MINUTES[-1]} min: {len(assignments)}")
+    for zone, upper in zip(ZONES, ZONE_DRIVE_MINUTES):
+        print(f"  Zone {zone} (<= {upper} min): {(assignments['Primary Zone'] == zone).sum()} zip codes")
+    if len(depots) > 1:
+        print("\nBy nearest depot:")
+        print(assignments.groupby("Nearest Depot").size().to_string())
+
+
+if __name__ == "__main__":
+    main()
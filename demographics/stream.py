@@ -0,0 +1,162 @@
+"""
+Bounded-memory streaming for statewide / national ZCTA runs
+Responses are decoded as they arrive, a chunk of a few thousand rows at a
+time, appended to the CSV (and the Arrow file, when pyarrow is installed)
+and folded into running totals, then dropped. Nothing grows with the number of ZCTAs except the list of ZIPs the
+API did not return, so a 33,000-ZCTA national run needs about as much memory
+as a 100-ZIP one.
+
+Rows are written in batch completion order; the "top ZIPs" tables are kept
+as bounded running top-N frames instead of sorting the full result.
+"""
+
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import pandas as pd
+
+from demographics.columnar import arrow_path, have_arrow, to_columnar
+from demographics.config import STREAM_CHUNK_ROWS, STREAM_TOP_N
+from demographics.decode import HOUSING_COLUMNS, process_census_data
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+except ImportError:  # pragma: no cover - exercised only without pyarrow
+    pa = None
+
+SF_PCT = '% Single-Family Detached'
+INCOME = 'Median Household Income'
+
+
+def _top(current, df, column, n):
+    """Merge a batch into a running top-n frame (ties keep arrival order)"""
+    candidates = df.dropna(subset=[column]).nlargest(n, column, keep='first')
+    if current is not None:
+        candidates = pd.concat([current, candidates], ignore_index=True)
+    return candidates.nlargest(n, column, keep='first').reset_index(drop=True)
+
+
+@dataclass
+class StreamStats:
+    """Running totals and top-N tables over every batch seen so far"""
+
+    top_n: int = STREAM_TOP_N
+    zip_codes: int = 0
+    total_units: int = 0
+    single_family: int = 0
+    other: int = 0
+    income_sum: float = 0.0
+    income_count: int = 0
+    top_single_family: pd.DataFrame = field(default=None, repr=False)
+    top_income: pd.DataFrame = field(default=None, repr=False)
+
+    def update(self, df):
+        self.zip_codes += len(df)
+        self.total_units += int(df['Total Housing Units'].sum())
+        self.single_family += int(df['Single-Family Detached'].sum())
+        self.other += int(df['Other Dwellings'].sum())
+        income = df[INCOME].dropna()
+        self.income_sum += float(income.sum())
+        self.income_count += len(income)
+        self.top_single_family = _top(self.top_single_family, df, SF_PCT, self.top_n)
+        self.top_income = _top(self.top_income, df, INCOME, self.top_n)
+
+    @property
+    def average_income(self):
+        return self.income_sum / self.income_count if self.income_count else float('nan')
+
+
+class StreamWriter:
+    """Appends housing frames to a CSV and its Arrow sibling, one batch at a time
+
+    Both files are written under a .tmp name and moved into place by close(),
+    so an interrupted run never leaves a half-written output behind.
+    """
+
+    def __init__(self, csv_path, columnar=True):
+        self.csv_path = Path(csv_path)
+        self.rows = 0
+        self._csv_tmp = self.csv_path.with_suffix(self.csv_path.suffix + '.tmp')
+        self._csv = open(self._csv_tmp, 'w', newline='')
+        self._header = True
+        self._arrow = None
+        self._arrow_sink = None
+        self._schema = None
+        self.arrow_path = arrow_path(csv_path) if columnar and have_arrow() else None
+        if self.arrow_path is not None:
+            self._arrow_tmp = self.arrow_path.with_suffix(self.arrow_path.suffix + '.tmp')
+
+    def write(self, df):
+        if df.empty:
+            return
+        df.to_csv(self._csv, index=False, header=self._header)
+        self._header = False
+        self.rows += len(df)
+        if self.arrow_path is None:
+            return
+        table = pa.Table.from_pandas(to_columnar(df, categorical=False), schema=self._schema, preserve_index=False)
+        if self._arrow is None:
+            self._schema = table.schema
+            self._arrow_sink = pa.OSFile(str(self._arrow_tmp), 'wb')
+            self._arrow = pa.ipc.new_file(self._arrow_sink, self._schema)
+        self._arrow.write_table(table)
+
+    def close(self):
+        """Finish both files and move them into place; returns the paths written"""
+        if self._header:
+            # No rows at all: still leave a header-only CSV
+            pd.DataFrame(columns=HOUSING_COLUMNS).to_csv(self._csv, index=False)
+        self._csv.close()
+        self._csv_tmp.replace(self.csv_path)
+        paths = [self.csv_path]
+        if self._arrow is not None:
+            self._arrow.close()
+            self._arrow_sink.close()
+            self._arrow_tmp.replace(self.arrow_path)
+            paths.append(self.arrow_path)
+        return paths
+
+    def abort(self):
+        """Discard the partial outputs"""
+        self._csv.close()
+        self._csv_tmp.unlink(missing_ok=True)
+        if self._arrow is not None:
+            self._arrow.close()
+            self._arrow_sink.close()
+            self._arrow_tmp.unlink(missing_ok=True)
+
+
+def stream_housing(client, zip_codes, csv_path, report, top_n=STREAM_TOP_N,
+                   chunk_rows=STREAM_CHUNK_ROWS):
+    """Fetch, decode and write `zip_codes` chunk by chunk; returns StreamStats
+
+    `report` (a FetchReport) collects the request totals and missing ZIPs.
+    """
+    stats = StreamStats(top_n=top_n)
+    writer = StreamWriter(csv_path)
+    pending, pending_rows = [], 0
+
+    def flush():
+        df = process_census_data(pending)
+        pending.clear()
+        if not df.empty:
+            writer.write(df)
+            stats.update(df)
+
+    try:
+        for _, table in client.iter_fetch(zip_codes, report):
+            if not table:
+                continue
+            pending.append(table)
+            pending_rows += len(table) - 1
+            if pending_rows >= chunk_rows:
+                flush()
+                pending_rows = 0
+        flush()
+    except BaseException:
+        writer.abort()
+        raise
+    for path in writer.close():
+        print(f"Saved to {path}")
+    return stats
@@ -0,0 +1,230 @@
+"""
+Run telemetry for the demographics scripts
+Records per-stage wall time and rows in/out, a latency histogram of every
+Census request, counters (requests, retries, splits, cache hits, bytes
+downloaded, dropped ZCTAs) and, optionally, a cProfile of chosen
+single-threaded stages.
+write() appends the run to a JSON-lines report, one event per line, all
+sharing the run's id:
+
+    {"run": "...", "event": "run", "command": "merge-service-area", "status": "ok", "seconds": 12.4, ...}
+    {"run": "...", "event": "stage", "stage": "fetch", "seconds": 11.9, "rows_in": null, "rows_out": 198, ...}
+    {"run": "...", "event": "histogram", "name": "request_latency_s", "buckets": [...], "counts": [...], ...}
+    {"run": "...", "event": "counters", "requests": 5, "retries": 0, "bytes_downloaded": 20311, ...}
+
+A slow refresh then shows whether the time went to the network (fetch
+seconds, request latency, retries), decoding or the merge.
+"""
+
+import bisect
+import cProfile
+import datetime
+import io
+import json
+import pstats
+import threading
+import time
+import uuid
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+
+import pandas as pd
+
+# Upper bounds (seconds) of the request-latency histogram buckets; the last is open-ended
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, float("inf"))
+PROFILE_TOP_N = 15
+# Stages whose work runs on the client's worker threads. cProfile only sees the
+# thread that enables it, so a profile of these would show the main thread
+# waiting on futures; --profile refuses them.
+THREADED_STAGES = ("fetch", "stream")
+
+
+def parse_profile(spec):
+    """'decode,merge' -> ["decode", "merge"], for --profile; threaded stages raise ValueError"""
+    stages = [s.strip() for s in spec.split(",") if s.strip()]
+    _check_profile(stages)
+    return stages
+
+
+def _check_profile(stages):
+    threaded = [s for s in THREADED_STAGES if s in stages]
+    if threaded:
+        raise ValueError(f"Can't profile {', '.join(threaded)}: cProfile only sees the calling thread, "
+                         f"and these stages run on worker threads")
+
+
+def count_rows(value):
+    """Rows in a stage input/output: DataFrames, fetch results, ACS tables, or tuples of those"""
+    if value is None:
+        return None
+    if isinstance(value, pd.DataFrame):
+        return len(value)
+    tables = getattr(value, "tables", None)
+    if tables is not None:
+        return sum(len(t) - 1 for t in tables if t)
+    if isinstance(value, (tuple, list)):
+        counts = [count_rows(v) for v in value]
+        counts = [c for c in counts if c is not None]
+        return sum(counts) if counts else None
+    return None
+
+
+class Histogram:
+    """Fixed-bucket histogram: a count per bucket plus count, sum, min and max
+
+    Memory stays constant however many values are observed. Percentiles are
+    read off the buckets: the upper bound of the bucket holding that rank,
+    capped at the largest value seen.
+    """
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * len(self.buckets)
+        self.count = 0
+        self.sum = 0.0
+        self.min = None
+        self.max = None
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def percentile(self, p):
+        if not self.count:
+            return None
+        rank = min(self.count - 1, int(p * self.count))
+        seen = 0
+        for bound, n in zip(self.buckets, self.counts):
+            seen += n
+            if seen > rank:
+                return min(bound, self.max)
+
+    def summary(self):
+        return {
+            "buckets": [b if b != float("inf") else "inf" for b in self.buckets],
+            "counts": self.counts,
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "min": self.min,
+            "p50": self.percentile(0.50),
+            "p95": self.percentile(0.95),
+            "max": self.max,
+        }
+
+
+class Telemetry:
+    """Thread-safe collector for one run; pass it to CensusClient and Pipeline"""
+
+    def __init__(self, command=None, profile=(), profile_dir=None):
+        self.run_id = uuid.uuid4().hex[:12]
+        self.command = command
+        self.started = datetime.datetime.now(datetime.timezone.utc)
+        _check_profile(profile)
+        self.profile = set(profile)
+        self.profile_dir = Path(profile_dir) if profile_dir else None
+        self.counters = {}
+        self.histograms = {}
+        self.stages = []
+        self.dropped = []
+        self._start = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def count(self, name, n=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def observe(self, name, value):
+        with self._lock:
+            self.histograms.setdefault(name, Histogram()).observe(value)
+
+    def record_fetch(self, report, unit="zctas"):
+        """Fold a finished FetchReport into the counters; `unit` names what was dropped"""
+        for name in ("requested", "returned", "requests", "retries", "splits", "cache_hits"):
+            self.count(name, getattr(report, name))
+        dropped = report.unrecoverable
+        self.count(f"dropped_{unit}", len(dropped))
+        with self._lock:
+            self.dropped.extend(dropped)
+
+    @contextmanager
+    def stage(self, name, rows_in=None, **fields):
+        """Time a stage; set `record["rows_out"]` (or any field) on the yielded dict"""
+        record = {"stage": name, "rows_in": rows_in, "rows_out": None, **fields}
+        profiler = cProfile.Profile() if name in self.profile else None
+        start = time.perf_counter()
+        if profiler:
+            profiler.enable()
+        try:
+            yield record
+        except BaseException:
+            record["status"] = "failed"
+            raise
+        finally:
+            if profiler:
+                profiler.disable()
+                record["profile"] = self._profile_summary(name, profiler)
+            record["seconds"] = round(time.perf_counter() - start, 6)
+            with self._lock:
+                self.stages.append(record)
+
+    def _profile_summary(self, name, profiler):
+        """Top functions by cumulative time; the full profile is dumped when profile_dir is set"""
+        stats = pstats.Stats(profiler, stream=io.StringIO()).sort_stats("cumulative")
+        top = []
+        for (filename, line, function), (calls, _, tottime, cumtime, _) in \
+                sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)[:PROFILE_TOP_N]:
+            top.append({"function": f"{Path(filename).name}:{line}({function})", "calls": calls,
+                        "tottime": round(tottime, 6), "cumtime": round(cumtime, 6)})
+        summary = {"top": top}
+        if self.profile_dir is not None:
+            self.profile_dir.mkdir(parents=True, exist_ok=True)
+            path = self.profile_dir / f"{self.run_id}-{name}.prof"
+            stats.dump_stats(path)
+            summary["path"] = str(path)
+        return summary
+
+    def events(self, status="ok"):
+        base = {"run": self.run_id}
+        yield {**base, "event": "run", "command": self.command, "status": status,
+               "started": self.started.isoformat(timespec="seconds"),
+               "seconds": round(time.perf_counter() - self._start, 6)}
+        for record in self.stages:
+            yield {**base, "event": "stage", **record}
+        for name, histogram in sorted(self.histograms.items()):
+            yield {**base, "event": "histogram", "name": name, **histogram.summary()}
+        yield {**base, "event": "counters", **dict(sorted(self.counters.items()))}
+        if self.dropped:
+            yield {**base, "event": "dropped", "keys": sorted(set(self.dropped))}
+
+    def write(self, path, status="ok"):
+        """Append this run's events to a JSON-lines file; returns the path"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "a", encoding="utf-8") as f:
+            for event in self.events(status):
+                f.write(json.dumps(event, default=str) + "\n")
+        return path
+
+
+def timed(telemetry, name, rows_in=None, **fields):
+    """telemetry.stage(), or a no-op (still yielding a record dict) without telemetry"""
+    if telemetry is None:
+        return nullcontext({"stage": name, "rows_in": rows_in, "rows_out": None, **fields})
+    return telemetry.stage(name, rows_in, **fields)
+
+
+@contextmanager
+def run_report(telemetry, path):
+    """Write the run report when the block exits, marking failed runs"""
+    status = "ok"
+    try:
+        yield telemetry
+    except BaseException:
+        status = "failed"
+        raise
+    finally:
+        if telemetry is not None and path:
+            print(f"Run report appended to {telemetry.write(path, status)}")
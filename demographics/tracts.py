@@ -0,0 +1,232 @@
+"""
+Tract / block-group demographics for the DFW counties
+ZCTAs are too coarse inside large ZIPs like 75034 or 75070, so this mode
+queries ACS by census tract or block group. Each state+county partition is
+one request (per column shard), and the partitions run concurrently.
+Responses are decoded a chunk at a time as partitions complete. Each chunk
+is placed in a drive-time zone by its tract centroid, appended to the CSV
+and Arrow outputs, and folded into per-zone totals, then dropped.
+
+Usage:
+    python -m demographics.tracts --level tract
+    python -m demographics.tracts --level block-group --variables market --counties 085,121
+
+Zoning needs the Gazetteer tract file in TRACT_CENTROIDS (not shipped, like
+the ZCTA file). Without it the CLI stops before fetching anything, unless
+--no-zones asks for rows with empty zone columns.
+"""
+
+import argparse
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from demographics.cli import add_fetch_arguments, client_from_args, fetch_errors, telemetry_from_args
+from demographics.client import FetchReport
+from demographics.config import DATA_DIR, DFW_COUNTIES, STATE_FIPS, STREAM_CHUNK_ROWS, TRACT_CENTROIDS
+from demographics.decode import MARKET_MARKER, decode_tables, housing_metrics, market_metrics, round1
+from demographics.spatial import HQ, assign_zones, load_centroids, parse_depot
+from demographics.stream import StreamWriter
+from demographics.telemetry import run_report, timed
+
+# --level -> (ACS geography, in= clause per county)
+LEVELS = {
+    "tract": ("tract", "state:{state} county:{county}"),
+    "block-group": ("block group", "state:{state} county:{county} tract:*"),
+}
+OUTPUT_CSV = {
+    "tract": f"{DATA_DIR}/DFW_HVAC_Tract_Demographics.csv",
+    "block-group": f"{DATA_DIR}/DFW_HVAC_Block_Group_Demographics.csv",
+}
+GEOID_FIELDS = ["state", "county", "tract", "block group"]
+ZONE_FIELDS = ['Primary Zone', 'Drive Time (min)', 'Nearest Depot']
+SUM_COLUMNS = ['Total Housing Units', 'Single-Family Detached', 'Other Dwellings']
+
+
+def partitions(level, counties=DFW_COUNTIES, state=STATE_FIPS):
+    """in= clause -> county name, one partition per county"""
+    _, template = LEVELS[level]
+    return {template.format(state=state, county=fips): name for fips, name in counties.items()}
+
+
+def area_metrics(tables):
+    """GEOID, County and the housing (plus market, when fetched) columns for tract/block-group tables"""
+    raw = decode_tables(tables)
+    geoid = pd.Series([''] * len(raw), index=raw.index)
+    for field in GEOID_FIELDS:
+        if field in raw.columns:
+            geoid = geoid + raw[field].astype(str)
+    df = housing_metrics(raw).drop(columns=['Zip Code'])
+    if MARKET_MARKER in raw.columns:
+        df = pd.concat([df, market_metrics(raw)], axis=1)
+    county = raw['county'] if 'county' in raw.columns else pd.Series([''] * len(raw))
+    df.insert(0, 'GEOID', geoid.to_numpy())
+    df.insert(1, 'County', county.map(DFW_COUNTIES).fillna(county).to_numpy())
+    return df
+
+
+def tract_zones(centroids, depots=(HQ,)):
+    """Tract GEOID -> Primary Zone / Drive Time / Nearest Depot from tract centroids"""
+    assignments = assign_zones(centroids, depots)
+    return assignments.set_index('Zip Code')[ZONE_FIELDS]
+
+
+def add_zones(df, zones=None):
+    """Zone columns after County; block groups take their tract's zone, unzoned rows get NA"""
+    if zones is None:
+        zoned = pd.DataFrame(index=range(len(df)), columns=ZONE_FIELDS)
+    else:
+        zoned = zones.reindex(df['GEOID'].str[:11]).reset_index(drop=True)
+    df = df.copy()
+    df.insert(2, 'Primary Zone', pd.array(zoned['Primary Zone'], dtype='Int64'))
+    df.insert(3, 'Drive Time (min)', zoned['Drive Time (min)'].astype('float64').to_numpy())
+    df.insert(4, 'Nearest Depot', pd.array(zoned['Nearest Depot'], dtype='string'))
+    return df
+
+
+class ZoneTotals:
+    """Running per-zone sums over every chunk seen so far (zone 0 = outside the zones)"""
+
+    def __init__(self):
+        self.areas = 0
+        self._sums = None
+
+    def update(self, df):
+        self.areas += len(df)
+        units = df['Total Housing Units']
+        has_income = df['Median Household Income'].notna()
+        part = pd.DataFrame({
+            'Primary Zone': df['Primary Zone'].fillna(0).astype('int64'),
+            'Areas': 1,
+            **{col: df[col] for col in SUM_COLUMNS},
+            'Income x Units': (df['Median Household Income'] * units).where(has_income, 0),
+            'Income Units': units.where(has_income, 0),
+        })
+        sums = part.groupby('Primary Zone').sum()
+        self._sums = sums if self._sums is None else self._sums.add(sums, fill_value=0)
+
+    def table(self):
+        """One row per zone: areas, unit counts, % SF and unit-weighted median income"""
+        if self._sums is None:
+            return pd.DataFrame(columns=['Primary Zone', 'Areas', *SUM_COLUMNS])
+        sums = self._sums.sort_index()
+        total = sums['Total Housing Units'].to_numpy('float64')
+        sf_pct = np.zeros(len(sums))
+        sf_pct[total > 0] = round1(sums['Single-Family Detached'].to_numpy()[total > 0] / total[total > 0] * 100)
+        weight = sums['Income Units'].to_numpy('float64')
+        income = np.full(len(sums), np.nan)
+        income[weight > 0] = np.floor(sums['Income x Units'].to_numpy()[weight > 0] / weight[weight > 0])
+        out = sums[['Areas', *SUM_COLUMNS]].astype('int64').reset_index()
+        out['% Single-Family Detached'] = sf_pct
+        out['Unit-Weighted Median Income'] = income
+        return out
+
+
+def stream_areas(client, level, csv_path, zones=None, counties=DFW_COUNTIES, report=None,
+                 chunk_rows=STREAM_CHUNK_ROWS):
+    """Fetch, decode, zone and write every tract/block group in `counties`; returns ZoneTotals"""
+    geography, _ = LEVELS[level]
+    names = partitions(level, counties)
+    totals = ZoneTotals()
+    writer = StreamWriter(csv_path)
+    pending, pending_rows = [], 0
+
+    def flush():
+        df = area_metrics(pending)
+        pending.clear()
+        if not df.empty:
+            df = add_zones(df, zones)
+            writer.write(df)
+            totals.update(df)
+
+    try:
+        for partition, table in client.fetch_areas(geography, names, report):
+            rows = len(table) - 1 if table else 0
+            print(f"  {names[partition]}: {rows:,} {geography}s")
+            if not rows:
+                continue
+            pending.append(table)
+            pending_rows += rows
+            if pending_rows >= chunk_rows:
+                flush()
+                pending_rows = 0
+        flush()
+    except BaseException:
+        writer.abort()
+        raise
+    for path in writer.close():
+        print(f"Saved to {path}")
+    return totals
+
+
+def print_zone_totals(totals):
+    table = totals.table()
+    table['Primary Zone'] = table['Primary Zone'].map(lambda z: f"Zone {z}" if z else "Outside")
+    table['Unit-Weighted Median Income'] = table['Unit-Weighted Median Income'].apply(
+        lambda x: f"${x:,.0f}" if pd.notna(x) else "N/A")
+    print("\n" + "-" * 80)
+    print("BY PRIMARY ZONE")
+    print("-" * 80)
+    print(table.to_string(index=False))
+
+
+def parse_counties(spec):
+    fips = [c.strip().zfill(3) for c in spec.split(",") if c.strip()]
+    unknown = [c for c in fips if c not in DFW_COUNTIES]
+    if unknown:
+        raise argparse.ArgumentTypeError(f"not a DFW county FIPS code: {', '.join(unknown)}")
+    return {c: DFW_COUNTIES[c] for c in fips}
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="ACS demographics by census tract or block group for the DFW counties")
+    parser.add_argument("--level", choices=sorted(LEVELS), default="tract")
+    parser.add_argument("--counties", type=parse_counties, default=DFW_COUNTIES,
+                        help="Comma-separated county FIPS codes (default: every DFW county)")
+    parser.add_argument("--centroids", default=TRACT_CENTROIDS, help="Gazetteer tract file for zoning")
+    parser.add_argument("--no-zones", action="store_true",
+                        help="Write rows with empty zone columns instead of stopping when --centroids is missing")
+    parser.add_argument("--depot", action="append", type=parse_depot,
+                        help="Depot as 'Name:lat,lon' (repeatable; default: Coppell HQ)")
+    parser.add_argument("--out", help="Output CSV (default depends on --level)")
+    add_fetch_arguments(parser)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    zones = None
+    if Path(args.centroids).exists():
+        zones = tract_zones(load_centroids(args.centroids), args.depot or [HQ])
+        print(f"Zoned {len(zones):,} tracts from {args.centroids}")
+    elif args.no_zones:
+        print(f"⚠️  No tract centroids at {args.centroids}; writing rows without zones (--no-zones)")
+    else:
+        raise SystemExit(f"No tract centroids at {args.centroids}. Download the Census Gazetteer tract file "
+                         f"for Texas there (or pass --centroids), or rerun with --no-zones to write unzoned rows.")
+    run = telemetry_from_args(args, f"tracts --level {args.level}")
+    client = client_from_args(args, telemetry=run)
+
+    geography, _ = LEVELS[args.level]
+    print(f"Fetching {geography}s for {len(args.counties)} counties from Census API...")
+    report = FetchReport()
+    with fetch_errors(client.guard), run_report(run, args.run_report):
+        with timed(run, "stream", len(args.counties)) as record:
+            totals = stream_areas(client, args.level, args.out or OUTPUT_CSV[args.level], zones,
+                                  args.counties, report)
+            record["rows_out"] = totals.areas
+    print(f"\nReceived {totals.areas:,} {geography}s ({report.requests} requests, "
+          f"{report.retries} retries, {report.cache_hits} cached)")
+    for partition, reason in sorted(report.failed.items()):
+        print(f"  ⚠️  {partition}: {reason}")
+    for partition in report.quarantined:
+        print(f"  ⚠️  {partition}: quarantined (data quality)")
+    if client.guard is not None:
+        print(f"  {client.guard.summary()}")
+    if totals.areas:
+        print_zone_totals(totals)
+
+
+if __name__ == "__main__":
+    main()
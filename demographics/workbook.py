@@ -0,0 +1,210 @@
+"""
+Excel export of the master service area
+One workbook for sales: a Summary sheet, one sheet per primary zone and the
+zone-weighted market-size tables. openpyxl runs in write-only mode, so rows
+are serialized to the sheet's temp file as they are appended instead of
+building a cell graph, and every cell shares one of a handful of named
+styles (one style record each in the file). Rows can be appended chunk by
+chunk; memory stays flat however many ZCTAs are exported.
+
+openpyxl is optional; without it the scripts skip the .xlsx output.
+"""
+
+import math
+from pathlib import Path
+
+import pandas as pd
+
+from demographics.config import DATA_DIR
+from demographics.zones import ZONES
+
+try:
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Alignment, Font, NamedStyle, PatternFill
+    from openpyxl.utils import get_column_letter
+except ImportError:  # pragma: no cover - exercised only without openpyxl
+    Workbook = None
+
+MASTER_XLSX = f"{DATA_DIR}/DFW_HVAC_Master_Service_Area.xlsx"
+
+SUMMARY_SHEET = "Summary"
+MARKET_ZONE_SHEET = "Market by Zone"
+MARKET_CITY_SHEET = "Market by City"
+SUMMARY_COLUMNS = ['Zone', 'ZIP Codes', 'Total Housing Units', 'Single-Family Detached',
+                   '% Single-Family Detached', 'Avg Median Income']
+TOTAL_KEYS = ['ZIP Codes', 'Total Housing Units', 'Single-Family Detached', 'income_sum', 'income_count']
+
+# (name, number format, bold, fill)
+STYLES = [
+    ("dfw_header", "General", True, "1F4E78"),
+    ("dfw_text", "@", False, None),
+    ("dfw_count", "#,##0", False, None),
+    ("dfw_percent", "0.0", False, None),
+    ("dfw_currency", "$#,##0", False, None),
+    ("dfw_year", "0", False, None),
+    ("dfw_total", "@", True, "DDEBF7"),
+]
+
+
+def have_openpyxl():
+    return Workbook is not None
+
+
+# Columns that are neither counts nor percentages, by exact header
+COLUMN_STYLES = {
+    'Zip Code': "dfw_text",
+    'City': "dfw_text",
+    'Zone': "dfw_text",
+    'Median Household Income': "dfw_currency",
+    'Avg Median Income': "dfw_currency",
+    'Median Home Value': "dfw_currency",
+    'Revenue Potential (Low)': "dfw_currency",
+    'Revenue Potential (High)': "dfw_currency",
+    'Annual Revenue (Low)': "dfw_currency",
+    'Annual Revenue (High)': "dfw_currency",
+    'Median Year Built': "dfw_year",
+}
+
+
+def column_style(name):
+    """Named style for a column: COLUMN_STYLES, then percentages by header, then counts"""
+    if name in COLUMN_STYLES:
+        return COLUMN_STYLES[name]
+    if name.startswith('% ') or name.endswith('(%)'):
+        return "dfw_percent"
+    return "dfw_count"
+
+
+def _named_styles():
+    styles = []
+    for name, number_format, bold, fill in STYLES:
+        style = NamedStyle(name=name, number_format=number_format)
+        if bold:
+            style.font = Font(bold=True, color="FFFFFF" if name == "dfw_header" else "000000")
+        if fill:
+            style.fill = PatternFill("solid", start_color=fill)
+        if name == "dfw_header":
+            style.alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
+        styles.append(style)
+    return styles
+
+
+def _value(value):
+    """Cell value: NaN/NA become empty cells, numpy scalars plain Python numbers"""
+    if value is None or value is pd.NA:
+        return None
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value.item() if hasattr(value, "item") else value
+
+
+class SheetWriter:
+    """Header plus styled rows for one write-only sheet, columns styled by column_style()"""
+
+    def __init__(self, sheet, columns, width=14):
+        self.sheet = sheet
+        self.columns = list(columns)
+        self.styles = [column_style(c) for c in self.columns]
+        self.rows = 0
+        for i, column in enumerate(self.columns, 1):
+            sheet.column_dimensions[get_column_letter(i)].width = max(width, len(column) + 2)
+        sheet.freeze_panes = "A2"
+        sheet.append([self._cell(c, "dfw_header") for c in self.columns])
+
+    def _cell(self, value, style):
+        cell = WriteOnlyCell(self.sheet, _value(value))
+        cell.style = style
+        return cell
+
+    def append(self, df, label_style=None):
+        """Append a frame's rows; `label_style` restyles the first cell of each (e.g. a total row)"""
+        styles = [label_style or self.styles[0], *self.styles[1:]]
+        for row in df[self.columns].itertuples(index=False, name=None):
+            self.sheet.append([self._cell(v, s) for v, s in zip(row, styles)])
+        self.rows += len(df)
+
+    def finish(self):
+        if self.rows:
+            self.sheet.auto_filter.ref = f"A1:{get_column_letter(len(self.columns))}{self.rows + 1}"
+
+
+class ServiceAreaWorkbook:
+    """Streams the master table into per-zone sheets; close() adds summary and market sheets
+
+        book = ServiceAreaWorkbook(path, master.columns)
+        book.append(chunk)            # any number of times, rows in any zone order
+        book.close(by_zone, by_city)  # writes and moves the file into place
+    """
+
+    def __init__(self, path, columns):
+        if Workbook is None:
+            raise RuntimeError("openpyxl is required for the workbook export (pip install openpyxl)")
+        self.path = Path(path)
+        self._tmp = self.path.with_suffix(self.path.suffix + '.tmp')
+        self.columns = list(columns)
+        self.book = Workbook(write_only=True)
+        for style in _named_styles():
+            self.book.add_named_style(style)
+        # Write-only sheets keep creation order, so the summary goes first and is filled in last
+        self._summary = self.book.create_sheet(SUMMARY_SHEET)
+        self.zones = {zone: SheetWriter(self.book.create_sheet(f"Zone {zone}"), self.columns) for zone in ZONES}
+        self.totals = {zone: dict.fromkeys(TOTAL_KEYS, 0) for zone in ZONES}
+
+    def append(self, df):
+        for zone, rows in df.groupby('Primary Zone', sort=True):
+            zone = int(zone)
+            self.zones[zone].append(rows)
+            totals = self.totals[zone]
+            totals['ZIP Codes'] += len(rows)
+            totals['Total Housing Units'] += int(rows['Total Housing Units'].sum())
+            totals['Single-Family Detached'] += int(rows['Single-Family Detached'].sum())
+            income = rows['Median Household Income'].dropna()
+            totals['income_sum'] += float(income.sum())
+            totals['income_count'] += len(income)
+
+    def summary(self):
+        """One row per zone plus a total row, from the running totals"""
+        grand = {k: sum(t[k] for t in self.totals.values()) for k in TOTAL_KEYS}
+        rows = []
+        for label, t in [*((f"Zone {zone}", t) for zone, t in self.totals.items()), ("Total", grand)]:
+            units = t['Total Housing Units']
+            rows.append({
+                'Zone': label,
+                'ZIP Codes': t['ZIP Codes'],
+                'Total Housing Units': units,
+                'Single-Family Detached': t['Single-Family Detached'],
+                '% Single-Family Detached': round(t['Single-Family Detached'] / units * 100, 1) if units else 0.0,
+                'Avg Median Income': math.floor(t['income_sum'] / t['income_count']) if t['income_count'] else None,
+            })
+        return pd.DataFrame(rows, columns=SUMMARY_COLUMNS)
+
+    def close(self, by_zone=None, by_city=None):
+        """Write the summary and market sheets and move the file into place; returns the path"""
+        summary = self.summary()
+        writer = SheetWriter(self._summary, SUMMARY_COLUMNS)
+        writer.append(summary.iloc[:-1])
+        writer.append(summary.iloc[-1:], label_style="dfw_total")
+        for sheet in self.zones.values():
+            sheet.finish()
+        for title, table in ((MARKET_ZONE_SHEET, by_zone), (MARKET_CITY_SHEET, by_city)):
+            if table is not None:
+                writer = SheetWriter(self.book.create_sheet(title), table.columns)
+                writer.append(table)
+                writer.finish()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.book.save(self._tmp)
+        self._tmp.replace(self.path)
+        return self.path
+
+
+def save_workbook(master, by_zone=None, by_city=None, path=MASTER_XLSX):
+    """Write the master service-area workbook; returns the path, or None without openpyxl"""
+    if not have_openpyxl():
+        print("openpyxl not installed; skipped workbook (.xlsx) output")
+        return None
+    book = ServiceAreaWorkbook(path, master.columns)
+    book.append(master)
+    path = book.close(by_zone, by_city)
+    print(f"Saved to {path}")
+    return path
@@ -0,0 +1,151 @@
+"""
+ZIP enrichment index for lead routing
+A compact, versioned JSON map from ZIP code to the service-area fields a
+lead handler needs (primary zone, zone percentages, city, income,
+single-family share, housing units). The merge writes it to
+frontend/internal, where the lead API route can import it; it is not a
+public file. Load it once and every lookup is a single dict access.
+
+    index = load_index()
+    index.get("75019")  # ZipRecord(zip_code='75019', primary_zone=1, city='Coppell', ...)
+
+Build it from an existing master CSV or look ZIPs up from the shell:
+    python -m demographics.zipindex --build
+    python -m demographics.zipindex 75019 76051
+"""
+
+import argparse
+import json
+import math
+import os
+import tempfile
+from functools import lru_cache
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+import pandas as pd
+
+from demographics.config import INTERNAL_DIR, MASTER_CSV
+from demographics.zones import ZONE_COLUMNS
+
+INDEX_VERSION = 1
+ZIP_INDEX_JSON = f"{INTERNAL_DIR}/DFW_HVAC_Zip_Index.json"
+
+FIELDS = ["primary_zone", "city", "zone_pct", "median_income", "sf_pct", "total_units"]
+
+
+class ZipRecord(NamedTuple):
+    zip_code: str
+    primary_zone: int
+    city: str
+    zone_pct: tuple
+    median_income: Optional[int]
+    sf_pct: Optional[float]
+    total_units: Optional[int]
+
+
+def normalize_zip(zip_code):
+    """'75019', 75019, ' 75019-1234 ' -> '75019'"""
+    return str(zip_code).strip().split("-", 1)[0].zfill(5)
+
+
+def _number(value, cast):
+    """JSON-safe scalar; NaN/None -> None"""
+    if value is None or math.isnan(float(value)):
+        return None
+    return cast(value)
+
+
+def build_index(master_df):
+    """Index payload (a JSON-ready dict) for a master service-area frame"""
+    zone_pct = master_df[ZONE_COLUMNS].to_numpy('float64').round(1).tolist()
+    columns = zip(
+        master_df['Zip Code'], master_df['Primary Zone'], master_df['City'], zone_pct,
+        master_df['Median Household Income'], master_df['% Single-Family Detached'],
+        master_df['Total Housing Units'],
+    )
+    zips = {
+        normalize_zip(zip_code): [int(zone), city, pct, _number(income, int),
+                                  _number(sf_pct, float), _number(units, int)]
+        for zip_code, zone, city, pct, income, sf_pct, units in columns
+    }
+    return {"version": INDEX_VERSION, "fields": FIELDS, "zips": dict(sorted(zips.items()))}
+
+
+def write_index(master_df, path=ZIP_INDEX_JSON):
+    """Write the index atomically (minified JSON); returns the path"""
+    path = Path(path)
+    payload = json.dumps(build_index(master_df), separators=(",", ":"), ensure_ascii=False)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(payload)
+    os.chmod(tmp, 0o644)
+    os.replace(tmp, path)
+    return path
+
+
+class ZipIndex:
+    """Constant-time ZIP -> ZipRecord lookups over a loaded index"""
+
+    def __init__(self, payload):
+        if payload.get("version") != INDEX_VERSION or payload.get("fields") != FIELDS:
+            raise ValueError(f"Unsupported ZIP index version {payload.get('version')!r} "
+                             f"(expected {INDEX_VERSION})")
+        self._zips = payload["zips"]
+
+    @classmethod
+    def load(cls, path=ZIP_INDEX_JSON):
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def get(self, zip_code, default=None):
+        """ZipRecord for `zip_code`, or `default` when it is outside the service area"""
+        zip_code = normalize_zip(zip_code)
+        row = self._zips.get(zip_code)
+        if row is None:
+            return default
+        zone, city, pct, income, sf_pct, units = row
+        return ZipRecord(zip_code, zone, city, tuple(pct), income, sf_pct, units)
+
+    def __getitem__(self, zip_code):
+        record = self.get(zip_code)
+        if record is None:
+            raise KeyError(zip_code)
+        return record
+
+    def __contains__(self, zip_code):
+        return normalize_zip(zip_code) in self._zips
+
+    def __len__(self):
+        return len(self._zips)
+
+
+@lru_cache(maxsize=None)
+def load_index(path=ZIP_INDEX_JSON):
+    """Process-wide cached index; call load_index.cache_clear() after a rebuild"""
+    return ZipIndex.load(path)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Build or query the ZIP enrichment index")
+    parser.add_argument("zips", nargs="*", help="ZIP codes to look up")
+    parser.add_argument("--build", action="store_true", help="Rebuild the index from the master CSV")
+    parser.add_argument("--master", default=MASTER_CSV, help="Master service-area CSV")
+    parser.add_argument("--index", default=ZIP_INDEX_JSON, help="Index JSON path")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.build:
+        master = pd.read_csv(args.master, dtype={'Zip Code': str})
+        print(f"Saved to {write_index(master, args.index)} ({len(master)} zip codes)")
+    if args.zips:
+        index = ZipIndex.load(args.index)
+        for zip_code in args.zips:
+            record = index.get(zip_code)
+            print(f"{normalize_zip(zip_code)}: {record if record else 'not in service area'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+"""
+Service-area zone classification
+Primary zone assignment and zone ordering as whole-column operations.
+"""
+
+import numpy as np
+
+ZONES = [1, 2, 3, 4]
+ZONE_COLUMNS = [f"Zone {zone} (%)" for zone in ZONES]
+
+
+def primary_zone(df):
+    """Closest zone with any coverage: 1, 2 or 3, otherwise 4"""
+    pct = df[ZONE_COLUMNS[:3]].to_numpy(dtype='float64')
+    return np.select([pct[:, 0] > 0, pct[:, 1] > 0, pct[:, 2] > 0], [1, 2, 3], default=4)
+
+
+def primary_zone_pct(df):
+    """Each row's percentage in its own Primary Zone"""
+    pct = df[ZONE_COLUMNS].to_numpy(dtype='float64')
+    zones = df['Primary Zone'].to_numpy(dtype='int64')
+    return pct[np.arange(len(df)), zones - 1]
+
+
+def sort_by_zone(df):
+    """Sort by Primary Zone, then by zone percentage within each zone (highest first)
+
+    The sort is stable, so rows with equal keys keep their input order.
+    """
+    order = np.lexsort((-primary_zone_pct(df), df['Primary Zone'].to_numpy()))
+    return df.iloc[order]
@@ -0,0 +1,252 @@
+"""
+Sitemap crawler for the site audit
+Reads /sitemap.xml (following sitemap indexes) and fetches every listed page
+concurrently over one pooled requests.Session, at most `workers` requests in
+flight. Each response is fed in chunks to an html.parser-based scanner that
+picks out the <title>, <meta name="description">, <link rel="canonical"> and
+og: tags; it stops reading at </head> once the description has been seen,
+and otherwise keeps going, since Next.js streams metadata into the <body>
+for non-bot user agents.
+
+crawl() returns rows in generate_audit.py's shape:
+
+    ("SECTION", title, "", "", "")
+    (path, meta, status, live_url, title, canonical, og_title, og_description)
+
+where `meta` carries the audit markers: "FALLBACK|..." when the description
+is one of the code-built fallbacks (no custom description in Sanity), and
+"WARNING (...)" when the page needs a fix (missing or placeholder
+description, wrong canonical, HTTP error).
+"""
+
+import re
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from html.parser import HTMLParser
+from urllib.parse import urljoin, urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+BASE_URL = "https://dfwhvac.com"
+MAX_WORKERS = 8
+TIMEOUT = 20
+CHUNK_SIZE = 16 * 1024
+USER_AGENT = "DFW-HVAC-Site-Audit/1.0 (+https://dfwhvac.com)"
+
+SITEMAP_NS = "{http://www.sitemaps.org/schemas/sitemap/0.9}"
+
+# Fixed per-service descriptions the service page uses when Sanity has no
+# metaDescription (SERVICE_META_COPY in app/services/[category]/[slug]/page.jsx)
+SERVICE_META_COPY = {
+    "residential/air-conditioning":
+        "AC repair, installation & maintenance across Dallas-Fort Worth. Same-day service. "
+        "Call (972) 777-2665. Licensed, family-owned.",
+    "residential/heating":
+        "Furnace & heat pump repair, installation & service in Dallas-Fort Worth. Same-day help. "
+        "Call (972) 777-2665. Licensed, family-owned.",
+    "residential/indoor-air-quality":
+        "DFW indoor air quality: filtration, purifiers, humidifiers & duct solutions. Breathe cleaner. "
+        "Call (972) 777-2665. Licensed, family-owned.",
+    "residential/preventative-maintenance":
+        "DFW HVAC tune-ups & preventative maintenance plans. Stop breakdowns before they start. "
+        "Call (972) 777-2665. Licensed, family-owned.",
+    "commercial/commercial-air-conditioning":
+        "Commercial AC repair, installation & service for DFW businesses. Minimize downtime. "
+        "Call (972) 777-2665. Licensed, family-owned.",
+    "commercial/commercial-heating":
+        "Commercial heating repair, installation & service for DFW businesses. Same-day response. "
+        "Call (972) 777-2665. Licensed, family-owned.",
+    "commercial/commercial-maintenance":
+        "Commercial HVAC preventative maintenance for DFW businesses. Scheduled visits, flat pricing. "
+        "Call (972) 777-2665. Licensed, family-owned.",
+}
+
+# Templated descriptions the app builds in code when Sanity has no
+# metaDescription (cities-served/[slug], unknown services, [slug] pages, layout)
+FALLBACK_PATTERNS = re.compile("|".join([
+    r"^.+, TX AC & heating repair, install & maintenance\. Same-day service\. "
+    r"Call \(972\) 777-2665\. Licensed, family-owned\.( Zips?: .+\.)?$",
+    r"^.+ in Dallas-Fort Worth\. Same-day service available\. "
+    r"Call \(972\) 777-2665\. Licensed, family-owned\.$",
+    r"^.+ - DFW HVAC serving Dallas-Fort Worth\.$",
+    r"^Expert HVAC service with integrity and care\. Three generations of trusted "
+    r"heating & cooling service in Dallas-Fort Worth\. Call \(972\) 777-COOL\.$",
+]))
+# Template leaks only: unrendered values, not words that real copy can contain
+PLACEHOLDER = re.compile(r"lorem ipsum|\bundefined\b|\[object|\{\s*\}", re.IGNORECASE)
+
+
+def is_fallback(description):
+    """True for a description the app built in code rather than one set in Sanity"""
+    return description in SERVICE_META_COPY.values() or bool(FALLBACK_PATTERNS.match(description))
+
+
+SECTIONS = ["Static Pages", "Service Pages", "City Pages"]
+
+
+def make_session(pool_size=MAX_WORKERS):
+    """requests.Session whose connection pool holds one connection per worker"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers["User-Agent"] = USER_AGENT
+    return session
+
+
+class MetaParser(HTMLParser):
+    """Collects title, description, canonical and og: tags; `done` once nothing more is needed"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.title = None
+        self.description = None
+        self.canonical = None
+        self.og = {}
+        self.done = False
+        self._in_title = False
+        self._title = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "title" and self.title is None:
+            self._in_title = True
+        elif tag == "meta":
+            attrs = dict(attrs)
+            name = (attrs.get("name") or "").lower()
+            prop = (attrs.get("property") or "").lower()
+            if name == "description" and self.description is None:
+                self.description = (attrs.get("content") or "").strip()
+            elif prop.startswith("og:"):
+                self.og.setdefault(prop[3:], (attrs.get("content") or "").strip())
+        elif tag == "link" and self.canonical is None:
+            attrs = dict(attrs)
+            if "canonical" in (attrs.get("rel") or "").lower().split():
+                self.canonical = attrs.get("href")
+
+    def handle_endtag(self, tag):
+        if tag == "title" and self._in_title:
+            self._in_title = False
+            self.title = " ".join("".join(self._title).split())
+        elif tag == "head" and self.description is not None:
+            self.done = True
+
+    def handle_data(self, data):
+        if self._in_title:
+            self._title.append(data)
+
+
+@dataclass
+class PageMeta:
+    """What the crawler found for one sitemap URL"""
+
+    url: str
+    http_status: int = None
+    location: str = None
+    title: str = None
+    description: str = None
+    canonical: str = None
+    og: dict = field(default_factory=dict)
+    error: str = None
+
+    @property
+    def path(self):
+        return urlsplit(self.url).path or "/"
+
+    @property
+    def section(self):
+        if self.path.startswith("/cities-served/"):
+            return "City Pages"
+        if self.path.startswith("/services/") and self.path.count("/") >= 3:
+            return "Service Pages"
+        return "Static Pages"
+
+    def warnings(self):
+        problems = []
+        if self.error:
+            problems.append(f"fetch failed: {self.error}")
+        elif self.http_status >= 400:
+            problems.append(f"HTTP {self.http_status}")
+        elif self.location is None:
+            if not self.description:
+                problems.append("no meta description")
+            elif PLACEHOLDER.search(self.description):
+                problems.append("placeholder text")
+            if self.canonical and urlsplit(urljoin(self.url, self.canonical)).path.rstrip("/") \
+                    != self.path.rstrip("/"):
+                problems.append(f"canonical points to {self.canonical}")
+        return problems
+
+    def row(self):
+        """(path, meta, status, live_url, title, canonical, og_title, og_description)"""
+        warnings = self.warnings()
+        if self.error or self.http_status >= 400:
+            meta, status = f"WARNING ({'; '.join(warnings)})", "Error"
+        elif self.location is not None:
+            target = urlsplit(urljoin(self.url, self.location)).path
+            meta, status = f"N/A ({self.http_status} redirects to {target})", "Unpublished"
+        else:
+            meta, status = self.description or "", "Published"
+            if warnings:
+                meta = f"WARNING ({'; '.join(warnings)})" + (f": {meta}" if meta else "")
+            elif is_fallback(meta):
+                meta = f"FALLBACK|{meta}"
+        return (self.path, meta, status, self.url, self.title or "", self.canonical or "",
+                self.og.get("title", ""), self.og.get("description", ""))
+
+
+def sitemap_urls(session, url, timeout=TIMEOUT):
+    """Page URLs listed in a sitemap, following <sitemapindex> entries"""
+    response = session.get(url, timeout=timeout)
+    response.raise_for_status()
+    root = ET.fromstring(response.content)
+    locs = [loc.text.strip() for loc in root.iter(f"{SITEMAP_NS}loc") if loc.text]
+    if root.tag == f"{SITEMAP_NS}sitemapindex":
+        return [page for child in locs for page in sitemap_urls(session, child, timeout)]
+    return locs
+
+
+def fetch_page(session, url, timeout=TIMEOUT):
+    """Fetch one page and parse its metadata; redirects are reported, not followed"""
+    page = PageMeta(url)
+    try:
+        with session.get(url, timeout=timeout, stream=True, allow_redirects=False) as response:
+            page.http_status = response.status_code
+            if response.is_redirect:
+                page.location = response.headers.get("Location")
+                return page
+            if response.status_code >= 400:
+                return page
+            if "charset" not in response.headers.get("Content-Type", ""):
+                response.encoding = "utf-8"
+            parser = MetaParser()
+            for chunk in response.iter_content(CHUNK_SIZE, decode_unicode=True):
+                parser.feed(chunk)
+                if parser.done:
+                    break
+            parser.close()
+    except requests.RequestException as exc:
+        page.error = type(exc).__name__
+        return page
+    page.title, page.description = parser.title, parser.description
+    page.canonical, page.og = parser.canonical, parser.og
+    return page
+
+
+def crawl(base_url=BASE_URL, workers=MAX_WORKERS, session=None, timeout=TIMEOUT):
+    """Audit rows for every sitemap page, grouped into sections in sitemap order"""
+    session = session or make_session(workers)
+    urls = list(dict.fromkeys(sitemap_urls(session, f"{base_url.rstrip('/')}/sitemap.xml", timeout)))
+    print(f"Crawling {len(urls)} pages from {base_url} ({workers} at a time)...")
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pages = list(pool.map(lambda url: fetch_page(session, url, timeout), urls))
+
+    rows = []
+    for section in SECTIONS:
+        members = [page for page in pages if page.section == section]
+        if members:
+            title = section if section != "City Pages" else f"{section} ({len(members)})"
+            rows.append(("SECTION", title, "", "", ""))
+            rows.extend(page.row() for page in members)
+    return rows
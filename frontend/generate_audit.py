@@ -1,9 +1,27 @@
-import openpyxl
-from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
-
-wb = openpyxl.Workbook()
-ws = wb.active
-ws.title = "DFW HVAC Site Audit"
+"""
+DFW HVAC site audit spreadsheet
+One row per page: URL, meta description, publish status and live URL, grouped
+into sections. Red marks a code-built fallback description (nothing set in
+Sanity), yellow a page that needs fixing. By default the rows come from the
+hand-typed `pages` snapshot below; --crawl reads them off the live sitemap
+instead (see audit_crawler.py) and adds title, canonical and OG columns.
+The sheet is written in openpyxl write-only mode, one row at a time, with
+every cell sharing one of a few named styles, so time grows linearly with
+the page count and memory stays flat.
+
+Usage:
+    python generate_audit.py
+    python generate_audit.py --crawl [--base-url https://dfwhvac.com] [--workers 8]
+"""
+import argparse
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, Alignment, NamedStyle, PatternFill, Border, Side
+from openpyxl.utils import get_column_letter
+from openpyxl.worksheet.cell_range import CellRange
+
+AUDIT_XLSX = "/app/frontend/internal/DFW_HVAC_Site_Audit.xlsx"
 
 # Styles
 header_font = Font(bold=True, color="FFFFFF", size=11)
@@ -11,26 +29,34 @@ header_fill = PatternFill(start_color="003153", end_color="003153", fill_type="s
 warning_fill = PatternFill(start_color="FFF3CD", end_color="FFF3CD", fill_type="solid")
 null_fill = PatternFill(start_color="F8D7DA", end_color="F8D7DA", fill_type="solid")
 section_fill = PatternFill(start_color="E8F5E9", end_color="E8F5E9", fill_type="solid")
+unpublished_fill = PatternFill(start_color="E0E0E0", end_color="E0E0E0", fill_type="solid")
 section_font = Font(bold=True, size=11)
 wrap = Alignment(wrap_text=True, vertical="top")
+center = Alignment(horizontal="center", vertical="top")
 thin_border = Border(
     left=Side(style="thin"), right=Side(style="thin"),
     top=Side(style="thin"), bottom=Side(style="thin")
 )
 
-# Headers
+# Registered once per workbook; every cell points at one of these
+# (name, font, fill, alignment, border)
+styles = [
+    ("audit_header", header_font, header_fill, wrap, thin_border),
+    ("audit_text", None, None, wrap, thin_border),
+    ("audit_status", None, None, center, thin_border),
+    ("audit_section", section_font, section_fill, None, thin_border),
+    ("audit_warning", None, warning_fill, wrap, thin_border),
+    ("audit_fallback", None, null_fill, wrap, thin_border),
+    ("audit_unpublished", None, unpublished_fill, center, thin_border),
+    ("audit_legend", Font(bold=True), None, None, None),
+    ("audit_legend_warning", None, warning_fill, None, None),
+    ("audit_legend_fallback", None, null_fill, None, None),
+]
+
+# Headers (crawled rows carry four more columns)
 headers = ["Webpage (URL)", "Meta Description", "Status", "Live URL"]
-ws.column_dimensions["A"].width = 50
-ws.column_dimensions["B"].width = 80
-ws.column_dimensions["C"].width = 14
-ws.column_dimensions["D"].width = 55
-
-for col, header in enumerate(headers, 1):
-    cell = ws.cell(row=1, column=col, value=header)
-    cell.font = header_font
-    cell.fill = header_fill
-    cell.alignment = wrap
-    cell.border = thin_border
+crawl_headers = headers + ["Title", "Canonical", "OG Title", "OG Description"]
+widths = [50, 80, 14, 55, 50, 45, 50, 80]
 
 # Data
 pages = [
@@ -91,51 +117,118 @@ pages = [
     ("/cities-served/the-colony", "FALLBACK|Professional heating and air conditioning services in The Colony, Texas. Same-day HVAC repair, installation, and maintenance. Serving zip codes: 75056.", "Published", "https://dfwhvac.com/cities-served/the-colony"),
 ]
 
-row = 2
-for page in pages:
-    if page[0] == "SECTION":
-        cell = ws.cell(row=row, column=1, value=page[1])
-        cell.font = section_font
-        cell.fill = section_fill
-        for col in range(1, 5):
-            ws.cell(row=row, column=col).fill = section_fill
-            ws.cell(row=row, column=col).border = thin_border
-        ws.merge_cells(start_row=row, start_column=1, end_row=row, end_column=4)
-        row += 1
-        continue
-
-    url, meta, status, cms_nav = page[0], page[1], page[2], page[3]
-    is_fallback = meta.startswith("FALLBACK|")
-    display_meta = meta.replace("FALLBACK|", "") if is_fallback else meta
-
-    ws.cell(row=row, column=1, value=url).alignment = wrap
-    ws.cell(row=row, column=2, value=display_meta).alignment = wrap
-    ws.cell(row=row, column=3, value=status).alignment = Alignment(horizontal="center", vertical="top")
-    ws.cell(row=row, column=4, value=cms_nav).alignment = wrap
-
-    for col in range(1, 5):
-        ws.cell(row=row, column=col).border = thin_border
-
-    # Highlight issues
-    if "WARNING" in meta:
-        ws.cell(row=row, column=2).fill = warning_fill
-    elif is_fallback:
-        ws.cell(row=row, column=2).fill = null_fill
-
-    if status == "Unpublished":
-        ws.cell(row=row, column=3).fill = PatternFill(start_color="E0E0E0", end_color="E0E0E0", fill_type="solid")
-
-    row += 1
-
-# Legend
-row += 1
-ws.cell(row=row, column=1, value="Legend:").font = Font(bold=True)
-row += 1
-ws.cell(row=row, column=1, value="Yellow = Needs immediate fix (test/incorrect data)")
-ws.cell(row=row, column=1).fill = warning_fill
-row += 1
-ws.cell(row=row, column=1, value="Red = Fallback code description (no custom meta description set in CMS)")
-ws.cell(row=row, column=1).fill = null_fill
-
-wb.save("/app/frontend/internal/DFW_HVAC_Site_Audit.xlsx")
-print("Spreadsheet saved!")
+
+def named_styles():
+    result = []
+    for name, font, fill, alignment, border in styles:
+        style = NamedStyle(name=name)
+        if font:
+            style.font = font
+        if fill:
+            style.fill = fill
+        if alignment:
+            style.alignment = alignment
+        if border:
+            style.border = border
+        result.append(style)
+    return result
+
+
+class AuditSheet:
+    """Write-only audit sheet, emitted one row at a time
+
+    Section rows are merged across the sheet; openpyxl writes the merges
+    after the rows when the workbook is saved.
+    """
+
+    def __init__(self, ws, headers):
+        self.ws = ws
+        self.columns = len(headers)
+        self.row = 0
+        # Write-only sheets ignore column widths set after the first append
+        for col in range(1, self.columns + 1):
+            ws.column_dimensions[get_column_letter(col)].width = widths[col - 1]
+        self.append([self._cell(header, "audit_header") for header in headers])
+
+    def _cell(self, value, style):
+        cell = WriteOnlyCell(self.ws, value)
+        cell.style = style
+        return cell
+
+    def append(self, cells):
+        self.ws.append(cells)
+        self.row += 1
+
+    def section(self, title):
+        self.append([self._cell(title, "audit_section")] +
+                    [self._cell(None, "audit_section") for _ in range(self.columns - 1)])
+        self.ws.merged_cells.add(CellRange(min_col=1, min_row=self.row, max_col=self.columns, max_row=self.row))
+
+    def page(self, page):
+        url, meta, status, cms_nav = page[0], page[1], page[2], page[3]
+        is_fallback = meta.startswith("FALLBACK|")
+        display_meta = meta.replace("FALLBACK|", "") if is_fallback else meta
+
+        # Highlight issues
+        if "WARNING" in meta:
+            meta_style = "audit_warning"
+        elif is_fallback:
+            meta_style = "audit_fallback"
+        else:
+            meta_style = "audit_text"
+        status_style = "audit_unpublished" if status == "Unpublished" else "audit_status"
+
+        cells = [
+            self._cell(url, "audit_text"),
+            self._cell(display_meta, meta_style),
+            self._cell(status, status_style),
+            self._cell(cms_nav, "audit_text"),
+        ]
+        cells += [self._cell(value, "audit_text") for value in page[4:self.columns]]
+        self.append(cells)
+
+    def legend(self):
+        self.append([])
+        self.append([self._cell("Legend:", "audit_legend")])
+        self.append([self._cell("Yellow = Needs immediate fix (test/incorrect data)", "audit_legend_warning")])
+        self.append([self._cell("Red = Fallback code description (no custom meta description set in CMS)",
+                                "audit_legend_fallback")])
+
+
+def write_audit(pages, path=AUDIT_XLSX, headers=headers):
+    """Write the audit workbook; `pages` can be any iterable of rows, consumed once"""
+    wb = Workbook(write_only=True)
+    for style in named_styles():
+        wb.add_named_style(style)
+    sheet = AuditSheet(wb.create_sheet("DFW HVAC Site Audit"), headers)
+    for page in pages:
+        if page[0] == "SECTION":
+            sheet.section(page[1])
+        else:
+            sheet.page(page)
+    sheet.legend()
+
+    wb.save(path)
+    print("Spreadsheet saved!")
+    return path
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Build the DFW HVAC site audit spreadsheet")
+    parser.add_argument("--crawl", action="store_true", help="Crawl the live sitemap instead of using the hand-typed pages list")
+    parser.add_argument("--base-url", default="https://dfwhvac.com", help="Site to crawl (its /sitemap.xml lists the pages)")
+    parser.add_argument("--workers", type=int, default=8, help="Pages fetched at once when crawling")
+    parser.add_argument("--output", default=AUDIT_XLSX, help="Where to write the .xlsx")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.crawl:
+        from audit_crawler import crawl
+        return write_audit(crawl(args.base_url, workers=args.workers), args.output, crawl_headers)
+    return write_audit(pages, args.output)
+
+
+if __name__ == "__main__":
+    main()
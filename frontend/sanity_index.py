@@ -0,0 +1,267 @@
+"""
+Sanity export index
+Streams an NDJSON dataset export (one document per line) into a SQLite
+index that audit citations can be resolved against without grepping:
+
+    fields      one row per string in every document: _id, _type, field path
+                (same form the audits cite: "answer", "faqs[4].answer",
+                "processSteps[4].description"), export line and text
+    fields_fts  FTS5 token index over the text, for word and phrase search
+
+The export is read a line at a time and rows are inserted in batches, so
+memory stays flat however large the export is; the index is written to a
+temp file and moved into place. Lookups and phrase searches are indexed
+SQLite queries (milliseconds).
+
+    index = SanityIndex.load()
+    index.lookup("faq-rs3 answer")                   # [Field(doc_id='faq-rs3', ...)]
+    index.lookup("siteSettings.leadFormDescription")
+    index.search("within 2 business hours")          # phrase search, any document
+
+Build it or query from the shell:
+    python sanity_index.py --build [--source sanity-import.ndjson]
+    python sanity_index.py "faq-rs3 answer" "service-commercial-maintenance processSteps[4]"
+    python sanity_index.py --search "same-day"
+"""
+
+import argparse
+import json
+import os
+import re
+import sqlite3
+import tempfile
+from pathlib import Path
+from typing import NamedTuple
+
+INDEX_VERSION = 1
+FRONTEND = Path(__file__).resolve().parent
+SANITY_EXPORT = FRONTEND / "sanity-import.ndjson"
+SANITY_INDEX = "/app/.cache/sanity/sanity-index.sqlite"
+
+BATCH_SIZE = 1000
+
+SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE fields (
+    id INTEGER PRIMARY KEY,
+    doc_id TEXT NOT NULL,
+    doc_type TEXT,
+    path TEXT NOT NULL,
+    line INTEGER NOT NULL,
+    text TEXT NOT NULL
+);
+CREATE INDEX fields_doc ON fields (doc_id, path);
+CREATE INDEX fields_type ON fields (doc_type);
+CREATE VIRTUAL TABLE fields_fts USING fts5 (text, content='fields', content_rowid='id',
+                                            tokenize='unicode61 remove_diacritics 2');
+"""
+
+
+class Field(NamedTuple):
+    doc_id: str
+    doc_type: str
+    path: str
+    line: int
+    text: str
+
+    @property
+    def citation(self):
+        return f"{self.doc_id} {self.path}"
+
+
+def strings(value, path=""):
+    """(field path, text) for every string in a document, skipping _-prefixed keys"""
+    if isinstance(value, str):
+        yield path, value
+    elif isinstance(value, list):
+        for i, item in enumerate(value):
+            yield from strings(item, f"{path}[{i}]")
+    elif isinstance(value, dict):
+        for key, item in value.items():
+            if not key.startswith("_"):
+                yield from strings(item, f"{path}.{key}" if path else key)
+
+
+def iter_documents(source, match=None, skipped=None):
+    """(export line, document) for an NDJSON export, streamed
+
+    Blank lines are passed over; malformed ones are reported and skipped
+    (their line numbers appended to `skipped`, if given). With `match`, a
+    compiled pattern, lines it finds nothing in are skipped before decoding.
+    """
+    with open(source, encoding="utf-8") as f:
+        for lineno, line in enumerate(f, 1):
+            if not line.strip() or (match is not None and not match.search(line)):
+                continue
+            try:
+                doc = json.loads(line)
+            except ValueError:
+                print(f"  Skipping malformed line {lineno} of {Path(source).name}")
+                if skipped is not None:
+                    skipped.append(lineno)
+                continue
+            if isinstance(doc, dict) and "_id" in doc:
+                yield lineno, doc
+
+
+def iter_fields(source):
+    """Field rows of an NDJSON export, streamed"""
+    for lineno, doc in iter_documents(source):
+        for path, text in strings(doc):
+            yield Field(doc["_id"], doc.get("_type"), path, lineno, text)
+
+
+def build_index(source=SANITY_EXPORT, path=SANITY_INDEX, batch_size=BATCH_SIZE):
+    """Index an NDJSON export into `path` (atomically replaced); returns (path, documents, fields)"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    os.close(fd)
+    conn = sqlite3.connect(tmp)
+    try:
+        conn.executescript(SCHEMA)
+        count, batch = 0, []
+        for field in iter_fields(source):
+            count += 1
+            batch.append((count, *field))
+            if len(batch) >= batch_size:
+                _insert(conn, batch)
+                batch = []
+        _insert(conn, batch)
+        documents = conn.execute("SELECT COUNT(DISTINCT doc_id) FROM fields").fetchone()[0]
+        conn.executemany("INSERT INTO meta VALUES (?, ?)", [
+            ("version", str(INDEX_VERSION)), ("source", str(source)),
+            ("documents", str(documents)), ("fields", str(count)),
+        ])
+        conn.execute("INSERT INTO fields_fts (fields_fts) VALUES ('optimize')")
+        conn.commit()
+    except BaseException:
+        conn.close()
+        os.unlink(tmp)
+        raise
+    conn.close()
+    os.chmod(tmp, 0o644)
+    os.replace(tmp, path)
+    return path, documents, count
+
+
+def _insert(conn, batch):
+    conn.executemany("INSERT INTO fields VALUES (?, ?, ?, ?, ?, ?)", batch)
+    conn.executemany("INSERT INTO fields_fts (rowid, text) VALUES (?, ?)", [(row[0], row[5]) for row in batch])
+
+
+def _phrase(text):
+    """FTS5 query matching `text` as one phrase (tokens in order)"""
+    tokens = re.findall(r"\w+", text.lower())
+    return '"' + " ".join(tokens) + '"' if tokens else None
+
+
+class SanityIndex:
+    """Read-only queries over a built index"""
+
+    def __init__(self, conn):
+        self.conn = conn
+        meta = dict(conn.execute("SELECT key, value FROM meta"))
+        if meta.get("version") != str(INDEX_VERSION):
+            raise ValueError(f"Unsupported Sanity index version {meta.get('version')!r} "
+                             f"(expected {INDEX_VERSION}); rebuild with --build")
+        self.meta = meta
+
+    @classmethod
+    def load(cls, path=SANITY_INDEX):
+        if not Path(path).exists():
+            raise FileNotFoundError(f"No Sanity index at {path}; build it with --build")
+        return cls(sqlite3.connect(f"file:{path}?mode=ro", uri=True, check_same_thread=False))
+
+    def _fields(self, where, params):
+        rows = self.conn.execute(f"SELECT doc_id, doc_type, path, line, text FROM fields WHERE {where} ORDER BY id",
+                                 params)
+        return [Field(*row) for row in rows]
+
+    def get(self, doc_id, path=None):
+        """Fields of one document; `path` narrows to a field and everything under it"""
+        if not path:
+            return self._fields("doc_id = ?", (doc_id,))
+        return self._fields("doc_id = ? AND (path = ? OR substr(path, 1, ?) IN (?, ?))",
+                            (doc_id, path, len(path) + 1, path + ".", path + "["))
+
+    def by_type(self, doc_type, path=None):
+        """Fields of every document of a type, optionally narrowed to a field path"""
+        if not path:
+            return self._fields("doc_type = ?", (doc_type,))
+        return self._fields("doc_type = ? AND (path = ? OR substr(path, 1, ?) IN (?, ?))",
+                            (doc_type, path, len(path) + 1, path + ".", path + "["))
+
+    def lookup(self, citation):
+        """Fields for an audit citation: "faq-rs3 answer", "siteSettings.leadFormDescription", "faq-rs3"
+
+        The first word is a document id (or, failing that, a type, for
+        singletons like siteSettings); a dotted "doc.field" is split at the
+        first dot when the whole word is not an id.
+        """
+        doc, _, path = citation.strip().partition(" ")
+        candidates = [(doc, path.strip() or None)]
+        if "." in doc and not path:
+            head, _, rest = doc.partition(".")
+            candidates.append((head, rest))
+        for doc_id, field in candidates:
+            found = self.get(doc_id, field) or self.by_type(doc_id, field)
+            if found:
+                return found
+        return []
+
+    def search(self, text, phrase=True, limit=50):
+        """Fields containing `text` as a phrase (or all of its words, phrase=False), in export order"""
+        if phrase:
+            query = _phrase(text)
+        else:
+            tokens = re.findall(r"\w+", text.lower())
+            query = " AND ".join(f'"{t}"' for t in tokens) if tokens else None
+        if query is None:
+            return []
+        rows = self.conn.execute(
+            "SELECT f.doc_id, f.doc_type, f.path, f.line, f.text FROM fields_fts "
+            "JOIN fields f ON f.id = fields_fts.rowid WHERE fields_fts MATCH ? ORDER BY fields_fts.rowid LIMIT ?",
+            (query, limit))
+        return [Field(*row) for row in rows]
+
+    def __len__(self):
+        return int(self.meta.get("fields", 0))
+
+    def close(self):
+        self.conn.close()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Build or query the Sanity export index")
+    parser.add_argument("citations", nargs="*", help='Citations to resolve, e.g. "faq-rs3 answer"')
+    parser.add_argument("--build", action="store_true", help="Rebuild the index from the export")
+    parser.add_argument("--source", default=SANITY_EXPORT, help="NDJSON dataset export")
+    parser.add_argument("--index", default=SANITY_INDEX, help="Index path")
+    parser.add_argument("--search", metavar="PHRASE", help="Phrase to search for across all documents")
+    parser.add_argument("--limit", type=int, default=50, help="Maximum search hits")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.build:
+        path, documents, fields = build_index(args.source, args.index)
+        print(f"Indexed {documents} documents ({fields} text fields) → {path}")
+    if not args.citations and not args.search:
+        return
+    index = SanityIndex.load(args.index)
+    for citation in args.citations:
+        found = index.lookup(citation)
+        print(f"{citation}: {len(found)} field(s)" if found else f"{citation}: not found")
+        for field in found:
+            print(f"  [{field.doc_type}] {field.citation} (line {field.line}): {field.text}")
+    if args.search:
+        hits = index.search(args.search, limit=args.limit)
+        print(f'"{args.search}": {len(hits)} hit(s)')
+        for field in hits:
+            print(f"  [{field.doc_type}] {field.citation} (line {field.line}): {field.text[:160]}")
+
+
+if __name__ == "__main__":
+    main()
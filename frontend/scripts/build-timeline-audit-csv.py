@@ -15,7 +15,6 @@ import csv
 from pathlib import Path
 
 OUTPUT = Path("/app/frontend/public/internal/timeline-commitments-audit.csv")
-OUTPUT.parent.mkdir(parents=True, exist_ok=True)
 
 # Production site root. Switch to the preview URL if you need to QA an
 # unmerged branch (preview deploys are gated noindex, so links there will
@@ -161,11 +160,18 @@ HEADERS = [
     "Live URL",
 ]
 
-with OUTPUT.open("w", newline="", encoding="utf-8") as f:
-    writer = csv.writer(f, quoting=csv.QUOTE_ALL)
-    writer.writerow(HEADERS)
-    for row in ROWS:
-        writer.writerow(row)
 
-print(f"Wrote {len(ROWS)} rows → {OUTPUT}")
-print(f"File size: {OUTPUT.stat().st_size:,} bytes")
+def main():
+    OUTPUT.parent.mkdir(parents=True, exist_ok=True)
+    with OUTPUT.open("w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f, quoting=csv.QUOTE_ALL)
+        writer.writerow(HEADERS)
+        for row in ROWS:
+            writer.writerow(row)
+
+    print(f"Wrote {len(ROWS)} rows → {OUTPUT}")
+    print(f"File size: {OUTPUT.stat().st_size:,} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Scan the copy surface for timeline commitments.
+
+Output: /app/frontend/public/internal/timeline-commitments-candidates.csv
+
+Run from anywhere:
+    python3 /app/frontend/scripts/scan-timeline-commitments.py [--workers 4]
+
+Walks app/, components/ and lib/ plus sanity-import.ndjson and emits one
+candidate row per line that promises a timeframe ("within 2 business hours",
+"same-day", "Mon-Fri 7 AM - 6 PM", "since 1974", ...), in the same columns as
+timeline-commitments-audit.csv, with an exact file:line citation. Rows
+already covered by build-timeline-audit-csv.py's ROWS (same citation, or same
+file and same language) are marked with that row's ID; everything else is
+new copy to review. Customer testimonials are skipped.
+
+Every phrase lives in one compiled alternation (one named group per
+phrase), so each file is matched in a single pass; files are spread over a
+process pool. In the NDJSON export only lines with a hit are decoded, to
+name the Sanity document and field path the phrase sits in.
+"""
+import argparse
+import bisect
+import csv
+import importlib.util
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+FRONTEND = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(FRONTEND))
+
+from sanity_index import iter_documents, strings  # noqa: E402
+
+AUDIT_SCRIPT = FRONTEND / "scripts" / "build-timeline-audit-csv.py"
+OUTPUT = Path("/app/frontend/public/internal/timeline-commitments-candidates.csv")
+
+SOURCE_DIRS = ["app", "components", "lib"]
+SOURCE_SUFFIXES = {".js", ".jsx", ".ts", ".tsx", ".mjs"}
+SANITY_EXPORT = "sanity-import.ndjson"
+SKIP_DIRS = {"node_modules", ".next", "ui"}
+# Customer reviews quote customers, not brand commitments
+SKIP_TYPES = {"testimonial"}
+
+MAX_TEXT = 300
+
+# (category, pattern) — categories follow the audit CSV's
+PHRASES = [
+    ("Response time", r"within\s+(?:\d+|one|two|an?)\s+business\s+(?:hours?|days?)"),
+    ("Response time", r"within\s+(?:\d+|one|two|an?)\s+hours?"),
+    ("Response time", r"next\s+business\s+(?:day|morning)"),
+    ("Response time", r"(?:call|contact|get\s+back\s+to)\s+you\s+(?:shortly|promptly|right\s+away)"),
+    ("Same-day dispatch", r"same[-\s]day"),
+    ("Commercial response", r"within\s+\d+\s*[-–]\s*\d+\s+hours"),
+    ("Appointment scheduling", r"within\s+\d+\s*[-–]\s*\d+\s+business\s+days"),
+    ("Business hours", r"\d{1,2}(?::\d{2})?\s*[AP]\.?M\.?\s*(?:[-–]|to)\s*\d{1,2}(?::\d{2})?\s*[AP]\.?M\.?"),
+    ("Business hours", r"Mo(?:n(?:day)?)?\s*(?:[-–]|through|thru)\s*(?:Fr(?:i(?:day)?)?|Sat(?:urday)?)"),
+    ("After-hours coverage", r"24/7|after[-\s]hours|around[-\s]the[-\s]clock"),
+    ("Quote turnaround", r"(?:within|under)\s+(?:\d+|sixty)\s+(?:seconds|minutes)"),
+    ("Install duration", r"(?:one|1|single)[-\s]day\s+install|\d+\s*[-–]\s*\d+\s+hours"),
+    ("Tool duration", r"\bPT\d+[HMS]\b"),
+    ("Company history", r"since\s+(?:19|20)\d{2}|\d+\+?\s+years\s+(?:of\s+)?(?:serving|experience|in\s+business)"),
+]
+MATCHER = re.compile("|".join(f"(?P<p{i}>{pattern})" for i, (_, pattern) in enumerate(PHRASES)), re.IGNORECASE)
+
+
+def load_audit(path=AUDIT_SCRIPT):
+    """The hand-maintained audit script as a module (HEADERS, ROWS, NO_URL)"""
+    spec = importlib.util.spec_from_file_location("build_timeline_audit_csv", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+AUDIT = load_audit()
+# Columns of timeline-commitments-audit.csv
+HEADERS = AUDIT.HEADERS
+ID, LANGUAGE, STATUS, CITATION = (HEADERS.index(h) for h in ("ID", "Current / revised language", "Status", "Citation"))
+
+
+def source_files(root):
+    """Files to scan, relative to the frontend root, in a stable order"""
+    files = []
+    for name in SOURCE_DIRS:
+        for dirpath, dirnames, filenames in os.walk(root / name):
+            dirnames[:] = sorted(d for d in dirnames if d not in SKIP_DIRS)
+            files.extend(Path(dirpath, f).relative_to(root).as_posix()
+                         for f in sorted(filenames) if Path(f).suffix in SOURCE_SUFFIXES)
+    if (root / SANITY_EXPORT).exists():
+        files.append(SANITY_EXPORT)
+    return files
+
+
+def _hits(text):
+    """(category, phrase, start, end) for every commitment phrase in text"""
+    for match in MATCHER.finditer(text):
+        yield PHRASES[int(match.lastgroup[1:])][0], match.group(), match.start(), match.end()
+
+
+def _group(hits):
+    """Merge hits of one category into a single (category, phrases) entry, first-seen order"""
+    grouped = {}
+    for category, phrase, *_ in hits:
+        phrases = grouped.setdefault(category, [])
+        if phrase not in phrases:
+            phrases.append(phrase)
+    return grouped
+
+
+def scan_source(root, relpath):
+    """Candidates in one source file: one per (line, category)"""
+    text = Path(root, relpath).read_text(encoding="utf-8", errors="replace")
+    starts = [0] + [m.end() for m in re.finditer("\n", text)]
+    by_line = {}
+    for hit in _hits(text):
+        by_line.setdefault(bisect.bisect_right(starts, hit[2]), []).append(hit)
+
+    lines = text.splitlines()
+    candidates = []
+    for lineno, hits in by_line.items():
+        for category, phrases in _group(hits).items():
+            candidates.append({"category": category, "phrases": phrases, "surface": "Source (code)",
+                               "text": lines[lineno - 1].strip()[:MAX_TEXT], "citation": f"{relpath}:{lineno}"})
+    return candidates
+
+
+def _sentence(text, start, end):
+    """The sentence around text[start:end]"""
+    left = max(text.rfind(". ", 0, start), text.rfind("\n", 0, start))
+    right = min((i for i in (text.find(". ", end), text.find("\n", end)) if i != -1), default=len(text) - 1)
+    return text[left + 1:right + 1].strip()[:MAX_TEXT]
+
+
+def scan_sanity(root, relpath):
+    """Candidates in an NDJSON export: one per (document field, category), cited by export line"""
+    candidates = []
+    for lineno, doc in iter_documents(Path(root, relpath), match=MATCHER):
+        if doc.get("_type") in SKIP_TYPES:
+            continue
+        for path, text in strings(doc):
+            hits = list(_hits(text))
+            for category, phrases in _group(hits).items():
+                first = next(h for h in hits if h[0] == category)
+                candidates.append({
+                    "category": category, "phrases": phrases,
+                    "surface": f"Sanity ({doc.get('_type', 'document')})",
+                    "text": _sentence(text, first[2], first[3]),
+                    "citation": f"{relpath}:{lineno} ({doc.get('_id')} {path})",
+                })
+    return candidates
+
+
+def scan_file(root, relpath):
+    if relpath.endswith(".ndjson"):
+        return scan_sanity(root, relpath)
+    return scan_source(root, relpath)
+
+
+def _scan_task(args):
+    return scan_file(*args)
+
+
+def scan(root=FRONTEND, workers=None):
+    """Every candidate under root, in file order; files are scanned in a process pool"""
+    root = Path(root)
+    files = source_files(root)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = pool.map(_scan_task, [(str(root), f) for f in files], chunksize=8)
+        return [candidate for found in results for candidate in found]
+
+
+def _words(text):
+    return " ".join(re.sub(r"\[[^\]]*\]", " ", text).split()).lower()
+
+
+def candidate_rows(candidates, audit_rows=()):
+    """Audit-CSV rows for the candidates
+
+    A candidate already covered by the audit gets the audit row's ID: same
+    file:line citation, or (citations drift as code moves) same file and
+    its line contains the row's current language.
+    """
+    by_citation, by_file = {}, {}
+    for row in audit_rows:
+        citation = row[CITATION].split(" (")[0]
+        by_citation.setdefault(citation, row[ID])
+        language = _words(row[LANGUAGE])
+        if language:
+            by_file.setdefault(citation.split(":")[0], []).append((language, row[ID]))
+    rows = []
+    for n, c in enumerate(candidates, 1):
+        citation = c["citation"].split(" (")[0]
+        audited = by_citation.get(citation)
+        if audited is None:
+            text = _words(c["text"])
+            audited = next((row_id for language, row_id in by_file.get(citation.split(":")[0], ())
+                            if language[:60] in text or (len(text) > 20 and text in language)), None)
+        cells = {
+            "ID": audited or f"S{n:03d}",
+            "Category": c["category"],
+            "Surface": c["surface"],
+            "Timeframe (current)": "; ".join(c["phrases"]),
+            "Current / revised language": c["text"],
+            "Status": f"In audit ({audited})" if audited else "Candidate (not in audit)",
+            "Citation": c["citation"],
+            "Notes": "Found by scan-timeline-commitments.py",
+        }
+        rows.append([cells.get(header, "") for header in HEADERS])
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Scan the site copy for timeline commitments")
+    parser.add_argument("--root", type=Path, default=FRONTEND, help="Frontend directory to scan")
+    parser.add_argument("--output", type=Path, default=OUTPUT, help="Candidate CSV to write")
+    parser.add_argument("--workers", type=int, default=None, help="Scanner processes (default: CPU count)")
+    args = parser.parse_args(argv)
+
+    rows = candidate_rows(scan(args.root, args.workers), AUDIT.ROWS)
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    with args.output.open("w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f, quoting=csv.QUOTE_ALL)
+        writer.writerow(HEADERS)
+        writer.writerows(rows)
+
+    new = sum(1 for row in rows if row[STATUS].startswith("Candidate"))
+    print(f"Wrote {len(rows)} candidate rows ({new} not in the audit) → {args.output}")
+    return args.output
+
+
+if __name__ == "__main__":
+    main()
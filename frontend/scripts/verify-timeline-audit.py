@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Verify the timeline-commitments audit against the code and the live site.
+
+Output: /app/frontend/public/internal/timeline-commitments-audit-verified.csv
+
+Run from anywhere:
+    python3 /app/frontend/scripts/verify-timeline-audit.py [--no-live] [--workers 8] [--source export.ndjson]
+
+For every row in build-timeline-audit-csv.py's ROWS:
+
+    Citation check  does the "Current / revised language" appear at the cited
+                    file:line? ("ok", "moved to line N", "not in file"); for
+                    "Sanity doc: <id> [field]" citations, in that document of
+                    sanity-import.ndjson ("ok", "moved to <field>", ...)
+    Live check      does the same copy appear on the row's Live URL?
+
+Each cited source file is read and line-indexed once, the NDJSON export is
+streamed once keeping only the cited documents, and each unique Live URL is
+fetched exactly once, concurrently over one pooled session, however many
+rows share it. Copy is compared on a loose form (lowercase letters and
+digits only), so quotes, entities, markup and line wrapping don't matter;
+"{placeholders}", "..." and "[notes]" split the language into fragments and
+the longest fragment is the one checked.
+
+sanity-import.ndjson is a seed export and lags the dataset; cited documents
+it lacks are summarised separately from real drift. Point --source at a
+fresh `sanity dataset export` to check them.
+"""
+import argparse
+import bisect
+import csv
+import html
+import importlib.util
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import requests
+from requests.adapters import HTTPAdapter
+
+FRONTEND = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(FRONTEND))
+
+from sanity_index import iter_documents, strings  # noqa: E402
+
+AUDIT_SCRIPT = FRONTEND / "scripts" / "build-timeline-audit-csv.py"
+SANITY_EXPORT = FRONTEND / "sanity-import.ndjson"
+OUTPUT = Path("/app/frontend/public/internal/timeline-commitments-audit-verified.csv")
+
+MAX_WORKERS = 8
+TIMEOUT = 20
+# Lines after the cited one still counted as "at the citation" (wrapped JSX text)
+WRAP_LINES = 3
+
+CITATION_RE = re.compile(r"^(?P<path>[\w./\[\]-]+\.\w+)(?::(?P<start>\d+)(?:-(?P<end>\d+))?)?")
+SANITY_RE = re.compile(r"^Sanity doc(?: id)?:\s*(?P<id>[\w.-]+)\s*(?P<rest>.*)$")
+
+
+def load_audit(path=AUDIT_SCRIPT):
+    """The hand-maintained audit script as a module (HEADERS, ROWS, NO_URL)"""
+    spec = importlib.util.spec_from_file_location("build_timeline_audit_csv", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+AUDIT = load_audit()
+LANGUAGE, CITATION, LIVE_URL = (AUDIT.HEADERS.index(h) for h in ("Current / revised language", "Citation", "Live URL"))
+
+
+def loose(text):
+    return " ".join(re.sub(r"[^a-z0-9]+", " ", html.unescape(text).lower()).split())
+
+
+def fragment(language):
+    """Longest checkable piece of the quoted language, loosened; None when nothing is quoted"""
+    language = re.sub(r"\[[^\]]*\]", " ", language).strip()
+    if not language or (language.startswith("(") and language.endswith(")")):
+        return None
+    pieces = [loose(p) for p in re.split(r"\$?\{[^}]*\}|\.\.\.|…|\s[—–]\s", language)]
+    best = max(pieces, key=len)
+    return best if len(best.split()) >= 2 else None
+
+
+class LineIndex:
+    """Loose text of a file with line starts, for locating copy that may wrap lines"""
+
+    def __init__(self, text):
+        parts = [loose(line) for line in text.splitlines()]
+        self.starts = []
+        offset = 0
+        for part in parts:
+            self.starts.append(offset)
+            offset += len(part) + 1
+        self.text = " ".join(parts)
+
+    def line_of(self, offset):
+        return bisect.bisect_right(self.starts, offset)
+
+    def find(self, needle, start_line=None, end_line=None):
+        """1-based line where needle starts (within the line range, if given), or None"""
+        lo = self.starts[start_line - 1] if start_line and start_line <= len(self.starts) else 0
+        hi = self.starts[end_line] if end_line and end_line < len(self.starts) else len(self.text)
+        at = self.text.find(needle, lo, hi + len(needle))
+        return self.line_of(at) if at != -1 and (start_line is None or at < hi) else None
+
+
+def parse_citation(citation):
+    """("sanity", id, field) | ("file", path, start, end) | None"""
+    match = SANITY_RE.match(citation)
+    if match:
+        rest = match["rest"].strip()
+        id_match = re.search(r"\(id ([\w-]+)\)", rest)
+        if id_match:
+            return ("sanity", id_match[1], None)
+        field = rest if rest and not rest.startswith("(") else None
+        return ("sanity", match["id"], field)
+    match = CITATION_RE.match(citation)
+    if match:
+        start = int(match["start"]) if match["start"] else None
+        end = int(match["end"]) if match["end"] else start
+        return ("file", match["path"], start, end)
+    return None
+
+
+def load_sanity_docs(ids, path=SANITY_EXPORT, skipped=None):
+    """{_id or _type: doc} for the cited ids, streaming the export once"""
+    docs = {}
+    if not Path(path).exists():
+        return docs
+    for _, doc in iter_documents(path, skipped=skipped):
+        for key in (doc.get("_id"), doc.get("_type")):
+            if key in ids:
+                docs.setdefault(key, doc)
+    return docs
+
+
+def check_sanity(doc, field, needle):
+    if doc is None:
+        return "doc not in export"
+    found = [path for path, text in strings(doc) if needle in loose(text)]
+    if not found:
+        return "not in doc"
+    if field is None or any(path == field or path.startswith(field + ".") or path.startswith(field + "[")
+                            for path in found):
+        return "ok"
+    return f"moved to {found[0]}"
+
+
+def check_file(index, start, end, needle):
+    if index is None:
+        return "file missing"
+    if start is not None and index.find(needle, start, end + WRAP_LINES) is not None:
+        return "ok"
+    line = index.find(needle)
+    if line is None:
+        return "not in file"
+    return f"moved to line {line}" if start is not None else f"ok (line {line})"
+
+
+def check_citations(rows, root=FRONTEND, sanity_path=SANITY_EXPORT, skipped=None):
+    """Citation check per row, reading each cited file once; malformed export lines go to `skipped`"""
+    parsed = [parse_citation(row[CITATION]) for row in rows]
+    indexes = {}
+    for cited in parsed:
+        if cited and cited[0] == "file" and cited[1] not in indexes:
+            path = Path(root, cited[1])
+            indexes[cited[1]] = LineIndex(path.read_text(encoding="utf-8")) if path.exists() else None
+    docs = load_sanity_docs({cited[1] for cited in parsed if cited and cited[0] == "sanity"}, sanity_path, skipped)
+
+    results = []
+    for row, cited in zip(rows, parsed):
+        needle = fragment(row[LANGUAGE])
+        if needle is None:
+            results.append("not checked (no quoted copy)")
+        elif cited is None:
+            results.append("unrecognised citation")
+        elif cited[0] == "sanity":
+            results.append(check_sanity(docs.get(cited[1]), cited[2], needle))
+        else:
+            results.append(check_file(indexes[cited[1]], cited[2], cited[3], needle))
+    return results
+
+
+def make_session(pool_size=MAX_WORKERS):
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def fetch_text(session, url, timeout=TIMEOUT):
+    """(loose page text, None) or (None, problem)"""
+    try:
+        response = session.get(url, timeout=timeout)
+    except requests.RequestException as exc:
+        return None, f"fetch failed ({type(exc).__name__})"
+    if response.status_code >= 400:
+        return None, f"HTTP {response.status_code}"
+    text = re.sub(r"<[^>]+>", " ", response.text)
+    return loose(text), None
+
+
+def check_live(rows, no_url, session=None, workers=MAX_WORKERS, timeout=TIMEOUT):
+    """Live check per row; every unique URL is fetched once, concurrently"""
+    urls = sorted({row[LIVE_URL] for row in rows if row[LIVE_URL] and row[LIVE_URL] != no_url})
+    session = session or make_session(workers)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pages = dict(zip(urls, pool.map(lambda url: fetch_text(session, url, timeout), urls)))
+    print(f"Fetched {len(urls)} unique Live URLs for {len(rows)} rows")
+
+    results = []
+    for row in rows:
+        url, needle = row[LIVE_URL], fragment(row[LANGUAGE])
+        if not url or url == no_url:
+            results.append("n/a (no page)")
+        elif needle is None:
+            results.append("not checked (no quoted copy)")
+        else:
+            text, problem = pages[url]
+            results.append(problem or ("ok" if needle in text else "not on page"))
+    return results
+
+
+def missing_docs(rows, results):
+    """Cited Sanity ids the export doesn't contain, in first-cited order"""
+    missing = {}
+    for row, result in zip(rows, results):
+        if result == "doc not in export":
+            missing.setdefault(parse_citation(row[CITATION])[1])
+    return list(missing)
+
+
+def export_summary(rows, results, sanity_path=SANITY_EXPORT, skipped=()):
+    """Lines describing the export itself rather than the audit: cited docs it lacks, lines it skipped"""
+    lines = []
+    missing = missing_docs(rows, results)
+    if missing:
+        affected = results.count("doc not in export")
+        lines.append(f"Source export {Path(sanity_path).name} lacks {len(missing)} cited docs ({affected} rows): "
+                     f"{', '.join(missing)}. The export is likely stale; re-run with --source pointing at a "
+                     "fresh `sanity dataset export` before treating these rows as drift.")
+    if skipped:
+        lines.append(f"Skipped {len(skipped)} malformed line(s) of {Path(sanity_path).name}: "
+                     f"{', '.join(map(str, skipped))}")
+    return lines
+
+
+def verify(rows, no_url, live=True, root=FRONTEND, sanity_path=SANITY_EXPORT, skipped=None, **live_kwargs):
+    """Rows with "Citation check" and "Live check" appended"""
+    citations = check_citations(rows, root, sanity_path, skipped)
+    lives = check_live(rows, no_url, **live_kwargs) if live else ["not checked"] * len(rows)
+    return [[*row, citation, state] for row, citation, state in zip(rows, citations, lives)]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check the timeline audit's citations and live copy")
+    parser.add_argument("--output", type=Path, default=OUTPUT, help="Verified CSV to write")
+    parser.add_argument("--no-live", action="store_true", help="Skip fetching the Live URLs")
+    parser.add_argument("--workers", type=int, default=MAX_WORKERS, help="Live URLs fetched at once")
+    parser.add_argument("--source", type=Path, default=SANITY_EXPORT,
+                        help="Sanity NDJSON export to check Sanity citations against (e.g. a fresh dataset export)")
+    args = parser.parse_args(argv)
+
+    skipped = []
+    verified = verify(AUDIT.ROWS, AUDIT.NO_URL, live=not args.no_live, sanity_path=args.source, skipped=skipped,
+                      workers=args.workers)
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    with args.output.open("w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f, quoting=csv.QUOTE_ALL)
+        writer.writerow([*AUDIT.HEADERS, "Citation check", "Live check"])
+        writer.writerows(verified)
+
+    citations = [row[-2] for row in verified]
+    stale = citations.count("doc not in export")
+    drifted = sum(1 for c in citations if not c.startswith(("ok", "not checked")) and c != "doc not in export")
+    not_live = sum(1 for row in verified if not row[-1].startswith(("ok", "n/a", "not checked")))
+    print(f"Wrote {len(verified)} rows → {args.output} ({drifted} citation problems, "
+          f"{stale} citing docs missing from the export, {not_live} not confirmed live)")
+    for line in export_summary(AUDIT.ROWS, citations, args.source, skipped):
+        print(line)
+    return args.output
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Census pipeline benchmark against a local ACS stand-in
+Starts demographics.acs_stub on 127.0.0.1 (recorded or synthetic ACS rows,
+configurable latency and error rate) and times the three stages of a
+service-area refresh at several ZCTA counts:
+
+    fetch   get_census_data (real HTTP, retries, bisection)
+    decode  process_census_data
+    merge   merge_service_area.build_master (zones, cities, ranking)
+
+Each stage is timed on its own pass and then re-run under tracemalloc for
+peak memory. Results go to a JSON file; --compare prints the change
+against an earlier run. No network beyond localhost is used.
+
+Usage:
+    python scripts/census_pipeline_benchmark.py [--sizes 100,2000,10000] [--latency 0.05] [--error-rate 0.02]
+    python scripts/census_pipeline_benchmark.py --recording rec.json --compare memory/audits/benchmarks/<old>.json
+"""
+
+import argparse
+import contextlib
+import datetime
+import gc
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import merge_service_area  # noqa: E402
+from demographics.acs_stub import ACSStub, Recording  # noqa: E402
+from demographics.client import CensusClient, get_census_data  # noqa: E402
+from demographics.config import BATCH_SIZE, MAX_WORKERS  # noqa: E402
+from demographics.decode import process_census_data  # noqa: E402
+from demographics.zones import ZONE_COLUMNS  # noqa: E402
+
+STAGES = ["fetch", "decode", "merge"]
+RESULTS_DIR = ROOT / "memory" / "audits" / "benchmarks"
+
+
+def service_area(zip_codes, seed=0):
+    """Synthetic zones CSV frame: each ZIP split across one or two adjacent zones"""
+    rng = np.random.default_rng(seed)
+    n = len(zip_codes)
+    first = rng.integers(0, 4, n)
+    split = rng.uniform(50, 100, n).round(1)
+    pct = np.zeros((n, 4))
+    pct[np.arange(n), first] = split
+    pct[np.arange(n), np.minimum(first + 1, 3)] += 100 - split
+    return pd.DataFrame({'Zip Code': zip_codes, **dict(zip(ZONE_COLUMNS, pct.T))})
+
+
+def run_stages(stub, zip_codes, args):
+    """Run fetch -> decode -> merge once; yields (stage, seconds, detail)"""
+    client = CensusClient(base_url=stub.url, rate=args.rate, batch_size=args.batch_size,
+                          max_workers=args.workers, backoff_base=args.backoff)
+    start = time.perf_counter()
+    census = get_census_data(zip_codes, client=client)
+    yield "fetch", time.perf_counter() - start, {
+        "requests": census.report.requests, "retries": census.report.retries,
+        "splits": census.report.splits, "unrecoverable": len(census.report.unrecoverable)}
+
+    start = time.perf_counter()
+    demo_df = process_census_data(census.tables)
+    yield "decode", time.perf_counter() - start, {"rows": len(demo_df)}
+
+    service_df = service_area(zip_codes)
+    start = time.perf_counter()
+    master = merge_service_area.build_master(service_df, demo_df)
+    yield "merge", time.perf_counter() - start, {"rows": len(master)}
+
+
+def peak_memory(stub, zip_codes, args):
+    """Peak traced MiB per stage (a separate pass: tracemalloc slows everything down)"""
+    peaks = {}
+    gc.collect()
+    tracemalloc.start()
+    try:
+        for stage, _, _ in run_stages(stub, zip_codes, args):
+            peaks[stage] = tracemalloc.get_traced_memory()[1] / 2 ** 20
+            tracemalloc.reset_peak()
+    finally:
+        tracemalloc.stop()
+    return peaks
+
+
+def benchmark(recording, sizes, args):
+    results = []
+    with ACSStub(recording, latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+                 seed=args.seed) as stub:
+        for n in sizes:
+            zip_codes = recording.zctas()[:n]
+            with contextlib.redirect_stdout(io.StringIO()):
+                errors_before = stub.errors
+                timed = list(run_stages(stub, zip_codes, args))
+                injected = stub.errors - errors_before
+                peaks = {} if args.no_memory else peak_memory(stub, zip_codes, args)
+            for stage, seconds, detail in timed:
+                results.append({
+                    "zctas": len(zip_codes),
+                    "stage": stage,
+                    "wall_s": round(seconds, 4),
+                    "zctas_per_s": round(len(zip_codes) / seconds, 1) if seconds else None,
+                    "peak_mib": round(peaks[stage], 2) if stage in peaks else None,
+                    **detail,
+                    **({"errors_injected": injected} if stage == "fetch" else {}),
+                })
+    return results
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_results(results, previous=None):
+    before = {(r["zctas"], r["stage"]): r for r in (previous or {}).get("results", [])}
+    print("| ZCTAs | Stage | Wall (s) | ZCTAs/s | Peak MiB |" + (" vs previous wall |" if previous else ""))
+    print("|---:|---|---:|---:|---:|" + ("---:|" if previous else ""))
+    for r in results:
+        peak = f"{r['peak_mib']:.1f}" if r["peak_mib"] is not None else "-"
+        line = f"| {r['zctas']:,} | {r['stage']} | {r['wall_s']:.3f} | {r['zctas_per_s'] or 0:,.0f} | {peak} |"
+        if previous:
+            old = before.get((r["zctas"], r["stage"]))
+            line += f" {(r['wall_s'] / old['wall_s'] - 1) * 100:+.0f}% |" if old and old["wall_s"] else " n/a |"
+        print(line)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="100,2000,10000", help="Comma-separated ZCTA counts")
+    parser.add_argument("--recording", help="Recorded ACS rows (demographics.acs_stub JSON); default: synthetic")
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds added to every stub response")
+    parser.add_argument("--jitter", type=float, default=0.02, help="Up to this many extra seconds per response")
+    parser.add_argument("--error-rate", type=float, default=0.02, help="Share of requests answered 503/429")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--rate", type=float, default=None, help="Client request budget per second (default: unlimited)")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--workers", type=int, default=MAX_WORKERS)
+    parser.add_argument("--backoff", type=float, default=0.05, help="Client retry backoff base (seconds)")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc pass")
+    parser.add_argument("--out", help="Results JSON (default: memory/audits/benchmarks/census_pipeline_<date>.json)")
+    parser.add_argument("--compare", help="Earlier results JSON to compare wall times against")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    sizes = [int(s) for s in args.sizes.split(",")]
+    if args.recording:
+        recording = Recording.load(args.recording)
+    else:
+        recording = Recording.synthetic([f"{i:05d}" for i in range(1001, 1001 + max(sizes))])
+    print(f"Benchmarking {', '.join(f'{n:,}' for n in sizes)} ZCTAs against a local ACS stub "
+          f"({len(recording):,} recorded ZCTAs, {args.latency * 1000:.0f} ms latency, "
+          f"{args.error_rate:.0%} errors)...")
+
+    report = {
+        "benchmark": "census_pipeline",
+        "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "cpus": os.cpu_count(),
+        "settings": {k: getattr(args, k) for k in
+                     ("latency", "jitter", "error_rate", "seed", "rate", "batch_size", "workers", "backoff")},
+        "recording": args.recording or "synthetic",
+        "results": benchmark(recording, sizes, args),
+    }
+
+    previous = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            previous = json.load(f)
+    print_results(report["results"], previous)
+
+    out = Path(args.out) if args.out else RESULTS_DIR / f"census_pipeline_{datetime.date.today().isoformat()}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    print(f"\nSaved to {out}")
+
+
+if __name__ == "__main__":
+    main()
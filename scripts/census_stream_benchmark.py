@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Census streaming memory / throughput benchmark
+Runs the in-memory housing analysis path (fetch everything, decode, sort,
+save) and the streaming path (demographics.stream) against the local ACS
+stand-in (demographics.acs_stub, as in census_pipeline_benchmark.py) at
+several ZCTA counts, and prints peak traced memory, wall time and ZCTAs per
+second for each. The stub adds no latency by default, so the numbers
+isolate our own fetch, decode and write overhead from Census API latency.
+
+Usage:
+    python scripts/census_stream_benchmark.py [--sizes 100,2000,33000] [--latency 0.05] [--recording rec.json]
+"""
+
+import argparse
+import contextlib
+import gc
+import io
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from demographics.acs_stub import ACSStub, Recording  # noqa: E402
+from demographics.client import CensusClient, FetchReport  # noqa: E402
+from demographics.columnar import save_outputs  # noqa: E402
+from demographics.decode import process_census_data  # noqa: E402
+from demographics.stream import stream_housing  # noqa: E402
+
+
+def in_memory(client, zip_codes, csv_path):
+    census = client.fetch(zip_codes)
+    df = process_census_data(census.tables)
+    df = df.sort_values('% Single-Family Detached', ascending=False)
+    save_outputs(df, csv_path)
+
+
+def streaming(client, zip_codes, csv_path):
+    stream_housing(client, zip_codes, csv_path, FetchReport())
+
+
+def measure(run, stub, zip_codes, workdir):
+    client = CensusClient(base_url=stub.url, rate=None)
+    n = len(zip_codes)
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        run(client, zip_codes, Path(workdir) / f"{run.__name__}_{n}.csv")
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 2 ** 20, elapsed, n / elapsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="100,2000,33000", help="Comma-separated ZCTA counts")
+    parser.add_argument("--recording", help="Recorded ACS rows (demographics.acs_stub JSON); default: synthetic")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every stub response")
+    args = parser.parse_args(argv)
+    sizes = [int(s) for s in args.sizes.split(",")]
+    if args.recording:
+        recording = Recording.load(args.recording)
+    else:
+        recording = Recording.synthetic([f"{i:05d}" for i in range(1001, 1001 + max(sizes))])
+
+    print("| ZCTAs | Mode | Peak traced memory (MiB) | Wall time (s) | ZCTAs/s |")
+    print("|---:|---|---:|---:|---:|")
+    with tempfile.TemporaryDirectory() as workdir, ACSStub(recording, latency=args.latency) as stub:
+        for n in sizes:
+            zip_codes = recording.zctas()[:n]
+            for run in (in_memory, streaming):
+                peak, elapsed, rate = measure(run, stub, zip_codes, workdir)
+                print(f"| {len(zip_codes):,} | {run.__name__.replace('_', '-')} | {peak:.1f} | {elapsed:.2f} | {rate:,.0f} |")
+
+
+if __name__ == "__main__":
+    main()
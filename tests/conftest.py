@@ -0,0 +1,104 @@
+"""
+Shared test doubles: a fake requests session that answers like the Census
+ACS endpoint, so client, pipeline and CLI tests run without a network.
+"""
+import json
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from urllib.parse import parse_qs, urlsplit
+
+from demographics.acs_stub import Recording
+from demographics.client import ZCTA_FIELD
+
+
+class FakeResponse:
+    """The parts of requests.Response the client reads"""
+
+    def __init__(self, payload, status_code=200):
+        self._payload = payload
+        self.status_code = status_code
+        self.content = b"" if payload is None else json.dumps(payload).encode("utf-8")
+
+    def json(self):
+        return self._payload
+
+
+@dataclass
+class ACSRequest:
+    """One GET as FakeACS saw it"""
+
+    url: str
+    variables: list
+    geography: str
+    units: list  # the for= values: ZCTAs, or ["*"]
+    within: dict = field(default_factory=dict)  # the in= clauses, e.g. {"state": "48"}
+    attempt: int = 0  # earlier requests for the same URL
+    time: float = 0.0
+
+    @classmethod
+    def parse(cls, url, **kwargs):
+        query = parse_qs(urlsplit(url).query)
+        geography, _, units = query["for"][0].rpartition(":")
+        within = dict(part.split(":") for part in query["in"][0].split(" ")) if "in" in query else {}
+        return cls(url, query["get"][0].split(","), geography, units.split(","), within, **kwargs)
+
+
+class FakeACS:
+    """requests.Session stand-in answering ZCTA queries like the ACS endpoint
+
+    Rows come from `recording` (acs_stub.Recording.table: only the requested
+    variables, unknown ZCTAs left out); without one, every requested ZCTA
+    gets Recording.synthetic() values. `handler(request)` may return a
+    FakeResponse (or raise) to override an answer; None falls through to the
+    recording, and it is required for non-ZCTA geographies. `delay` is added
+    to every answer, plus up to `jitter` more so batches finish out of order.
+
+    Every request is kept in `calls`; `peak` is the most requests in flight
+    at once and `bytes` the body bytes of every 200 answer.
+    """
+
+    def __init__(self, recording=None, handler=None, delay=0.0, jitter=0.0):
+        self.recording = recording
+        self.handler = handler
+        self.delay = delay
+        self.jitter = jitter
+        self.calls = []
+        self.active = 0
+        self.peak = 0
+        self.bytes = 0
+        self._lock = threading.Lock()
+
+    @property
+    def requested(self):
+        """The ZCTAs (for= values) of every request, in order"""
+        return [call.units for call in self.calls]
+
+    def table(self, request):
+        recording = self.recording or Recording.synthetic(request.units, request.variables)
+        return recording.table(request.variables, request.units)
+
+    def get(self, url, timeout=None):
+        with self._lock:
+            request = ACSRequest.parse(url, attempt=sum(1 for c in self.calls if c.url == url),
+                                       time=time.monotonic())
+            self.calls.append(request)
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            delay = self.delay + (random.uniform(0, self.jitter) if self.jitter else 0)
+            if delay:
+                time.sleep(delay)
+            response = self.handler(request) if self.handler else None
+            if response is None:
+                if request.geography != ZCTA_FIELD:
+                    raise ValueError(f"FakeACS needs a handler for {request.geography} queries")
+                response = FakeResponse(self.table(request))
+            if response.status_code == 200:
+                with self._lock:
+                    self.bytes += len(response.content)
+            return response
+        finally:
+            with self._lock:
+                self.active -= 1
@@ -0,0 +1,57 @@
+"""
+Unit tests for demographics.acs_stub (the local ACS stand-in used by the
+pipeline benchmark); the client talks to it over real localhost HTTP.
+"""
+import json
+
+from demographics.acs_stub import ACSStub, Recording
+from demographics.client import ZCTA_FIELD, CensusClient
+from demographics.decode import process_census_data
+
+ZIPS = [f"{75000 + i}" for i in range(120)]
+
+
+def _client(stub, **kwargs):
+    return CensusClient(base_url=stub.url, rate=None, backoff_base=0.001, **kwargs)
+
+
+def test_stub_serves_requested_variables_over_http():
+    with ACSStub(Recording.synthetic(ZIPS)) as stub:
+        result = _client(stub).fetch(ZIPS + ["99999"])
+    df = process_census_data(result.tables)
+    assert sorted(df['Zip Code']) == ZIPS
+    assert result.report.missing == ["99999"]
+    assert stub.requests == 3
+
+
+def test_injected_errors_are_retried():
+    with ACSStub(Recording.synthetic(ZIPS), latency=0.001, error_rate=0.3, seed=1) as stub:
+        result = _client(stub, batch_size=10, max_retries=6).fetch(ZIPS)
+    assert stub.errors > 0
+    assert result.report.retries >= stub.errors - len(result.report.failed)
+    assert result.report.returned == len(ZIPS)
+
+
+def test_respond_matches_api_shapes():
+    stub = ACSStub(Recording.synthetic(ZIPS[:2]))
+    try:
+        status, body = stub.respond(f"/x?get=NAME,B25024_001E&for={ZCTA_FIELD}:{ZIPS[1]},00000")
+        assert status == 200
+        assert json.loads(body) == [["NAME", "B25024_001E", ZCTA_FIELD], [f"ZCTA5 {ZIPS[1]}", "201", ZIPS[1]]]
+        assert stub.respond(f"/x?get=NAME&for={ZCTA_FIELD}:00000")[0] == 204
+        assert stub.respond(f"/x?get=B99999_001E&for={ZCTA_FIELD}:{ZIPS[0]}")[0] == 400
+        assert stub.respond("/x?get=NAME&for=tract:*")[0] == 400
+    finally:
+        stub.stop()
+
+
+def test_recording_round_trips_and_lists_zctas(tmp_path):
+    tables = [[["NAME", "B25024_001E", ZCTA_FIELD], ["ZCTA5 75019", "100", "75019"]],
+              [["NAME", "B25024_001E", ZCTA_FIELD], ["ZCTA5 75063", "200", "75063"]]]
+    recording = Recording.from_tables(tables)
+    recording.save(tmp_path / "rec.json")
+    loaded = Recording.load(tmp_path / "rec.json")
+    assert loaded.rows == {"75019": ["ZCTA5 75019", "100"], "75063": ["ZCTA5 75063", "200"]}
+
+    with ACSStub(loaded) as stub:
+        assert _client(stub, variables="NAME,B25024_001E").list_zctas() == ["75019", "75063"]
@@ -0,0 +1,185 @@
+"""
+Unit tests for frontend/audit_crawler.py (sitemap crawl feeding the site
+audit) against a small site served over localhost HTTP, plus the
+generate_audit.py --crawl path.
+"""
+import re
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import openpyxl
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "frontend"))
+
+import generate_audit  # noqa: E402
+from audit_crawler import PLACEHOLDER, SERVICE_META_COPY, MetaParser, crawl, is_fallback  # noqa: E402
+
+SERVICE_PAGE = Path(__file__).resolve().parents[1] / "frontend" / "app" / "services" / "[category]" / "[slug]" / "page.jsx"
+
+
+def _service_meta_copy():
+    """SERVICE_META_COPY as written in the service page source"""
+    source = SERVICE_PAGE.read_text(encoding="utf-8")
+    block = source[source.index("const SERVICE_META_COPY = {"):]
+    block = block[:block.index("\n}")]
+    return dict(re.findall(r"'([\w/-]+)':\s*'([^']*)'", block))
+
+
+def _page(description=None, canonical=None, title="DFW HVAC", og_title=None, streamed=False):
+    meta = f'<meta name="description" content="{description}"/>' if description is not None else ""
+    link = f'<link rel="canonical" href="{canonical}"/>' if canonical else ""
+    og = f'<meta property="og:title" content="{og_title}"/>' if og_title else ""
+    if streamed:
+        return f"<html><head><title>{title}</title></head><body><div>x</div>{meta}{link}{og}</body></html>"
+    return f"<html><head><title>{title}</title>{meta}{link}{og}</head><body>{'<p>filler</p>' * 500}</body></html>"
+
+
+PAGES = {
+    "/": _page("Family-owned HVAC contractor serving Dallas-Fort Worth.", "/", og_title="Home"),
+    "/about": _page("About DFW HVAC &amp; our family.", "/about"),
+    "/faq": _page(None, "/faq"),
+    "/estimate": _page("Lorem ipsum estimate copy", "/estimate"),
+    "/financing": _page("Financing options.", "/about"),
+    "/services/residential/heating": _page(
+        _service_meta_copy()["residential/heating"].replace("&", "&amp;"), "/services/residential/heating"),
+    "/cities-served/allen": _page(
+        "Allen, TX AC &amp; heating repair, install &amp; maintenance. Same-day service. "
+        "Call (972) 777-2665. Licensed, family-owned. Zip: 75013.", "/cities-served/allen", streamed=True),
+    "/cities-served/plano": _page("Custom Plano copy from Sanity.", "/cities-served/plano"),
+}
+REDIRECTS = {"/recent-projects": "/reviews"}
+SITEMAP_PATHS = ["/", "/about", "/faq", "/estimate", "/financing", "/recent-projects", "/gone",
+                 "/services/residential/heating", "/cities-served/allen", "/cities-served/plano"]
+
+
+class Site:
+    """Serves a sitemap index, a child sitemap and PAGES on a free localhost port"""
+
+    def __init__(self):
+        site = self
+        self.requests = []
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                site.requests.append(self.path)
+                if self.path == "/sitemap.xml":
+                    body = ('<?xml version="1.0"?><sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+                            f'<sitemap><loc>{site.url}/sitemap-0.xml</loc></sitemap></sitemapindex>')
+                    return self._send(200, body, "application/xml")
+                if self.path == "/sitemap-0.xml":
+                    urls = "".join(f"<url><loc>{site.url}{p}</loc></url>" for p in SITEMAP_PATHS)
+                    body = f'<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{urls}</urlset>'
+                    return self._send(200, body, "application/xml")
+                if self.path in REDIRECTS:
+                    self.send_response(307)
+                    self.send_header("Location", REDIRECTS[self.path])
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                if self.path in PAGES:
+                    return self._send(200, PAGES[self.path], "text/html; charset=utf-8")
+                return self._send(404, "not found", "text/plain")
+
+            def _send(self, status, body, content_type):
+                data = body.encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def __enter__(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def site():
+    with Site() as site:
+        yield site
+
+
+def _by_path(rows):
+    return {row[0]: row for row in rows if row[0] != "SECTION"}
+
+
+def test_crawl_marks_fallbacks_warnings_and_redirects(site):
+    rows = crawl(site.url, workers=4)
+    pages = _by_path(rows)
+    assert set(pages) == set(SITEMAP_PATHS)
+
+    assert pages["/"][1:3] == ("Family-owned HVAC contractor serving Dallas-Fort Worth.", "Published")
+    assert pages["/"][4:] == ("DFW HVAC", "/", "Home", "")
+    assert pages["/about"][1] == "About DFW HVAC & our family."
+    assert pages["/faq"][1] == "WARNING (no meta description)"
+    assert pages["/estimate"][1].startswith("WARNING (placeholder text): Lorem")
+    assert pages["/financing"][1].startswith("WARNING (canonical points to /about)")
+    assert pages["/recent-projects"][1:3] == ("N/A (307 redirects to /reviews)", "Unpublished")
+    assert pages["/gone"][1:3] == ("WARNING (HTTP 404)", "Error")
+    assert pages["/services/residential/heating"][1] == \
+        "FALLBACK|" + _service_meta_copy()["residential/heating"]
+    assert pages["/cities-served/allen"][1].startswith("FALLBACK|Allen, TX AC & heating")
+    assert pages["/cities-served/plano"][1] == "Custom Plano copy from Sanity."
+    assert pages["/cities-served/plano"][3] == f"{site.url}/cities-served/plano"
+
+
+def test_crawl_groups_sections_in_sitemap_order(site):
+    rows = crawl(site.url, workers=2)
+    sections = [row[1] for row in rows if row[0] == "SECTION"]
+    assert sections == ["Static Pages", "Service Pages", "City Pages (2)"]
+    assert [row[0] for row in rows][-2:] == ["/cities-served/allen", "/cities-served/plano"]
+
+
+def test_parser_stops_at_head_once_description_is_seen():
+    parser = MetaParser()
+    parser.feed(PAGES["/"][:200])
+    assert not parser.done
+    parser.feed(PAGES["/"][200:400])
+    assert parser.done and parser.canonical == "/"
+
+    streamed = MetaParser()
+    streamed.feed(PAGES["/cities-served/allen"])
+    assert streamed.description.startswith("Allen, TX") and streamed.title == "DFW HVAC"
+
+
+def test_service_meta_copy_matches_the_service_page():
+    assert SERVICE_META_COPY == _service_meta_copy()
+    assert all(is_fallback(copy) for copy in SERVICE_META_COPY.values())
+
+
+def test_fallback_and_placeholder_checks_match_code_output_only():
+    assert is_fallback("Financing - DFW HVAC serving Dallas-Fort Worth.")
+    assert is_fallback("Coppell, TX AC & heating repair, install & maintenance. Same-day service. "
+                       "Call (972) 777-2665. Licensed, family-owned.")
+    assert is_fallback("Ductless Mini-Splits in Dallas-Fort Worth. Same-day service available. "
+                       "Call (972) 777-2665. Licensed, family-owned.")
+    assert not is_fallback("Coppell's trusted AC repair. Call (972) 777-2665.")
+    for leak in ("Lorem ipsum dolor", "Serving undefined, TX", "[object Object]", "Call {} today"):
+        assert PLACEHOLDER.search(leak)
+    for copy in ("Annual pressure test of your gas lines.", "Warranty is null and void if...", "TODO list"):
+        assert not PLACEHOLDER.search(copy)
+
+
+def test_generate_audit_crawl_writes_extra_columns(site, tmp_path):
+    path = generate_audit.main(["--crawl", "--base-url", site.url, "--workers", "2",
+                                "--output", str(tmp_path / "audit.xlsx")])
+    ws = openpyxl.load_workbook(path).active
+    assert [c.value for c in ws[1]] == generate_audit.crawl_headers
+    cells = {row[0].value: row for row in ws.iter_rows(min_row=2)}
+    assert cells["/faq"][1].fill.start_color.rgb.endswith("FFF3CD")
+    assert cells["/cities-served/allen"][1].value.startswith("Allen, TX")
+    assert cells["/cities-served/allen"][1].fill.start_color.rgb.endswith("F8D7DA")
+    assert "A2:H2" in {str(r) for r in ws.merged_cells.ranges}
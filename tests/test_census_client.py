@@ -0,0 +1,113 @@
+"""
+Unit tests for demographics.client (no network: tests.conftest.FakeACS answers requests).
+"""
+import time
+
+import pytest
+import requests
+
+from demographics.acs_stub import Recording
+from demographics.client import CensusClient, RateLimiter, batched, get_census_data, make_session
+from tests.conftest import FakeACS, FakeResponse
+
+HEADERS = ["NAME", "B25024_001E", "B25024_002E", "B19013_001E", "zip code tabulation area"]
+
+
+def _client(session, **kwargs):
+    kwargs.setdefault("rate", None)
+    kwargs.setdefault("backoff_base", 0)
+    return CensusClient(session=session, **kwargs)
+
+
+def test_batched_keeps_order_and_remainder():
+    assert batched(list("abcde"), 2) == [["a", "b"], ["c", "d"], ["e"]]
+    assert batched([], 50) == []
+
+
+def test_fetch_returns_tables_in_batch_order():
+    zips = [f"{75000 + i:05d}" for i in range(23)]
+    result = _client(FakeACS(jitter=0.02), batch_size=5, max_workers=4).fetch(zips)
+
+    assert len(result.tables) == 5
+    returned = [row[-1] for table in result.tables for row in table[1:]]
+    assert returned == zips
+    assert result.report.returned == 23
+    assert result.report.unrecoverable == []
+
+
+def test_get_census_data_returns_tables_and_report():
+    zips = ["75019", "75063", "75067"]
+    result = get_census_data(zips, client=_client(FakeACS(), batch_size=2))
+    assert [row[-1] for table in result.tables for row in table[1:]] == zips
+    assert result.tables[0][0] == HEADERS
+    assert result.report.requested == 3
+
+
+def test_transient_errors_are_retried():
+    def flaky(request):
+        if request.attempt == 0:
+            return FakeResponse(None, status_code=503)
+        if request.attempt == 1:
+            raise requests.ConnectionError("reset by peer")
+
+    session = FakeACS(handler=flaky)
+    result = _client(session, batch_size=2).fetch(["75019", "75063"])
+
+    assert result.tables[0][1][-1] == "75019"
+    assert result.report.retries == 2
+    assert result.report.requests == 3
+    assert result.report.unrecoverable == []
+
+
+def test_failing_batch_is_split_to_isolate_bad_zcta():
+    def bad_zcta(request):
+        if "99999" in request.units:
+            return FakeResponse(None, status_code=400)
+
+    zips = ["75019", "75063", "99999", "75067", "75039"]
+    result = _client(FakeACS(handler=bad_zcta), batch_size=5).fetch(zips)
+
+    returned = [row[-1] for row in result.tables[0][1:]]
+    assert returned == ["75019", "75063", "75067", "75039"]
+    assert result.report.failed == {"99999": "HTTP 400"}
+    assert result.report.unrecoverable == ["99999"]
+    assert result.report.splits >= 1
+
+
+def test_retries_exhausted_lands_in_report():
+    session = FakeACS(handler=lambda request: FakeResponse(None, status_code=500))
+    result = _client(session, batch_size=2, max_retries=1).fetch(["75019", "75063"])
+
+    assert result.tables == [None]
+    assert result.report.failed == {"75019": "HTTP 500", "75063": "HTTP 500"}
+    # 2 attempts for the pair, then 2 per singleton after the split
+    assert result.report.requests == 6
+
+
+def test_zctas_missing_from_response_are_reported():
+    session = FakeACS(Recording.synthetic(["75019", "75067"]))
+    result = _client(session, batch_size=3).fetch(["75019", "75063", "75067"])
+    assert result.report.missing == ["75063"]
+    assert result.report.unrecoverable == ["75063"]
+
+
+def test_rate_limiter_spaces_requests():
+    session = FakeACS()
+    _client(session, batch_size=1, rate=50, max_workers=8).fetch([f"{75000 + i:05d}" for i in range(11)])
+
+    started = sorted(call.time for call in session.calls)
+    # 11 requests at 50 rps with a burst of 1 need at least 10 intervals of 20ms
+    assert started[-1] - started[0] >= 10 / 50 * 0.9
+
+
+def test_unlimited_rate_limiter_never_blocks():
+    limiter = RateLimiter(None)
+    start = time.monotonic()
+    for _ in range(1000):
+        limiter.acquire()
+    assert time.monotonic() - start < 0.5
+
+
+def test_session_pool_fits_workers():
+    session = make_session(pool_size=12)
+    assert session.get_adapter("https://api.census.gov")._pool_maxsize == 12
@@ -0,0 +1,62 @@
+"""
+Unit tests for demographics.columnar (Arrow IPC output + memory-mapped loader).
+"""
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+
+from demographics.columnar import arrow_path, load_columnar, read_table, to_columnar, write_columnar
+
+MASTER_CSV = Path(__file__).resolve().parents[1] / "frontend/internal/DFW_HVAC_Master_Service_Area.csv"
+
+
+@pytest.fixture(scope="module")
+def master():
+    return pd.read_csv(MASTER_CSV, dtype={'Zip Code': str})
+
+
+def test_roundtrip_keeps_types_and_values(tmp_path, master):
+    path = write_columnar(master, tmp_path / "master.arrow")
+    loaded = load_columnar(path)
+
+    assert loaded['Zip Code'].dtype == 'string'
+    assert loaded['City'].dtype == 'category'
+    assert loaded['Primary Zone'].dtype == 'category'
+    assert loaded['Total Housing Units'].dtype == 'int32'
+    assert loaded['Median Household Income'].dtype == 'Int32'
+    assert loaded['Zip Code'].tolist() == master['Zip Code'].tolist()
+    assert loaded['Median Household Income'].isna().sum() == master['Median Household Income'].isna().sum()
+    assert loaded['Total Housing Units'].tolist() == master['Total Housing Units'].tolist()
+    pd.testing.assert_series_equal(loaded['% Other'].astype('float64'), master['% Other'],
+                                   check_exact=False, atol=1e-4)
+
+
+def test_leading_zeros_survive(tmp_path):
+    df = pd.DataFrame({'Zip Code': ['01001', '75019'], 'Total Housing Units': [10, 20],
+                       'Median Household Income': [None, 90000.0]})
+    loaded = load_columnar(write_columnar(df, tmp_path / "z.arrow"))
+    assert loaded['Zip Code'].tolist() == ['01001', '75019']
+    assert loaded['Median Household Income'].isna().tolist() == [True, False]
+
+
+def test_read_table_is_memory_mapped(tmp_path, master):
+    path = write_columnar(master, tmp_path / "master.arrow")
+    table = read_table(path, columns=['Zip Code', 'Total Housing Units'])
+    assert table.column_names == ['Zip Code', 'Total Housing Units']
+    # Buffers point into the mapped file rather than freshly allocated memory
+    assert pa.total_allocated_bytes() < path.stat().st_size
+
+
+def test_missing_demographics_become_nullable_counts(master):
+    df = master.copy()
+    df.loc[0, 'Total Housing Units'] = None
+    typed = to_columnar(df)
+    assert typed['Total Housing Units'].dtype == 'Int32'
+    assert typed['Total Housing Units'].isna().sum() == 1
+
+
+def test_arrow_path():
+    assert arrow_path('/app/frontend/public/DFW_HVAC_Housing_Types.csv').name == 'DFW_HVAC_Housing_Types.arrow'
@@ -0,0 +1,95 @@
+"""
+Unit tests for demographics.decode — parity with the per-record loop it replaced.
+"""
+import numpy as np
+import pandas as pd
+
+from demographics.decode import decode_tables, housing_metrics, process_census_data, round1
+
+HEADERS = ["NAME", "B25024_001E", "B25024_002E", "B19013_001E", "zip code tabulation area"]
+
+
+def legacy_process(census_data):
+    """The dict-per-record loop from merge_service_area.process_census_data"""
+    results = []
+    for record in census_data:
+        try:
+            zcta = record.get('zip code tabulation area', '')
+            total_units = int(record.get('B25024_001E', 0) or 0)
+            sf_detached = int(record.get('B25024_002E', 0) or 0)
+            other = total_units - sf_detached
+            income_raw = record.get('B19013_001E', None)
+            median_income = int(income_raw) if income_raw and int(income_raw) > 0 else None
+            if total_units > 0:
+                sf_pct = round((sf_detached / total_units) * 100, 1)
+                other_pct = round(100 - sf_pct, 1)
+            else:
+                sf_pct = 0
+                other_pct = 0
+            results.append({
+                'Zip Code': zcta,
+                'Total Housing Units': total_units,
+                'Single-Family Detached': sf_detached,
+                '% Single-Family Detached': sf_pct,
+                'Other Dwellings': other,
+                '% Other': other_pct,
+                'Median Household Income': median_income
+            })
+        except Exception:
+            pass
+    df = pd.DataFrame(results)
+    df['Zip Code'] = df['Zip Code'].astype(str).str.zfill(5)
+    return df
+
+
+def _tables(seed=7, batches=4, per_batch=50):
+    rng = np.random.default_rng(seed)
+    tables, n = [], 0
+    for _ in range(batches):
+        table = [HEADERS]
+        for _ in range(per_batch):
+            total = int(rng.integers(0, 30000)) if n % 17 else 0
+            sf = int(rng.integers(0, total + 1))
+            income = str(int(rng.integers(20000, 250001))) if n % 11 else "-666666666"
+            table.append([f"ZCTA5 {75000 + n}", str(total), str(sf), income, str(75000 + n)])
+            n += 1
+        tables.append(table)
+    tables[1][3][3] = None  # null income from the API
+    return tables
+
+
+def test_matches_legacy_loop():
+    tables = _tables()
+    records = [dict(zip(t[0], row)) for t in tables for row in t[1:]]
+    expected = legacy_process(records)
+    actual = process_census_data(tables)
+    pd.testing.assert_frame_equal(actual, expected, check_dtype=False)
+
+
+def test_suppressed_income_and_zero_units():
+    df = process_census_data([[HEADERS,
+                               ["ZCTA5 75261", "0", "0", "-666666666", "75261"],
+                               ["ZCTA5 75019", "17329", "11809", "136679", "75019"]]])
+    assert df['Median Household Income'].isna().tolist() == [True, False]
+    assert df['% Single-Family Detached'].tolist() == [0.0, 68.1]
+    assert df['% Other'].tolist() == [0.0, 31.9]
+    assert df['Other Dwellings'].tolist() == [0, 5520]
+
+
+def test_decode_types_and_leading_zeros():
+    raw = decode_tables([[["NAME", "B25024_001E", "zip code tabulation area"],
+                          ["ZCTA5 01001", "7000", "1001"]], None])
+    assert raw["zip code tabulation area"].tolist() == ["01001"]
+    assert raw["B25024_001E"].dtype.kind in "if"
+    assert raw["NAME"].tolist() == ["ZCTA5 01001"]
+
+
+def test_empty_input():
+    assert process_census_data([None, []]).empty
+    assert list(housing_metrics(decode_tables([])).columns)[0] == 'Zip Code'
+
+
+def test_round1_matches_python_round():
+    for total in range(1, 1500):
+        x = np.arange(total + 1) / total * 100
+        assert round1(x).tolist() == [round(v, 1) for v in x.tolist()]
@@ -0,0 +1,60 @@
+"""
+Unit tests for frontend/generate_audit.py's write-only workbook writer
+(named styles, section merges, highlighting and the legend).
+"""
+import sys
+from pathlib import Path
+
+import openpyxl
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "frontend"))
+
+import generate_audit  # noqa: E402
+
+
+def _rows(n, section_every=100):
+    for i in range(n):
+        if i % section_every == 0:
+            yield ("SECTION", f"Block {i // section_every}", "", "", "")
+        meta = "FALLBACK|Generic copy." if i % 3 == 1 else "WARNING: test data" if i % 3 == 2 else "Custom copy."
+        yield (f"/page-{i}", meta, "Unpublished" if i % 5 == 0 else "Published", f"https://dfwhvac.com/page-{i}")
+
+
+def test_hand_typed_pages_keep_layout_and_highlighting(tmp_path):
+    path = generate_audit.write_audit(generate_audit.pages, tmp_path / "audit.xlsx")
+    ws = openpyxl.load_workbook(path).active
+    assert ws.title == "DFW HVAC Site Audit"
+    assert [c.value for c in ws[1]] == generate_audit.headers
+    assert ws["A1"].font.b and ws["A1"].fill.fgColor.rgb.endswith("003153")
+    assert [ws.column_dimensions[c].width for c in "ABCD"] == [50, 80, 14, 55]
+
+    sections = [r for r in ws.iter_rows(min_row=2) if r[0].value in ("Static Pages", "Service Pages")]
+    assert len(sections) == 2 and sections[0][0].fill.fgColor.rgb.endswith("E8F5E9") and sections[0][0].font.b
+    assert f"A{sections[0][0].row}:D{sections[0][0].row}" in {str(r) for r in ws.merged_cells.ranges}
+
+    cells = {r[0].value: r for r in ws.iter_rows(min_row=2)}
+    recent = cells["/recent-projects"]
+    assert recent[2].fill.fgColor.rgb.endswith("E0E0E0") and recent[2].alignment.horizontal == "center"
+    heating = cells["/services/residential/heating"]
+    assert not heating[1].value.startswith("FALLBACK|") and heating[1].fill.fgColor.rgb.endswith("F8D7DA")
+    assert cells["/about"][1].fill.fill_type is None and cells["/about"][1].border.left.style == "thin"
+
+    legend = [r[0].value for r in ws.iter_rows(min_row=ws.max_row - 2)]
+    assert legend[0] == "Legend:" and legend[1].startswith("Yellow") and legend[2].startswith("Red")
+
+
+def test_streamed_rows_share_named_styles(tmp_path):
+    path = generate_audit.write_audit(_rows(1000), tmp_path / "audit.xlsx")
+    wb = openpyxl.load_workbook(path)
+    ws = wb.active
+    assert set(wb.named_styles) >= {name for name, *_ in generate_audit.styles}
+    assert ws.max_row == 1 + 1000 + 10 + 4
+    assert len(ws.merged_cells.ranges) == 10
+    # One cell format per style in use, however many rows
+    assert len(wb._cell_styles) <= len(generate_audit.styles) + 1
+
+    cells = {r[0].value: r for r in ws.iter_rows(min_row=2)}
+    assert cells["/page-1"][1].style == "audit_fallback"
+    assert cells["/page-2"][1].style == "audit_warning"
+    assert cells["/page-5"][2].style == "audit_unpublished"
+    assert cells["/page-3"][1].style == "audit_text" and cells["/page-3"][1].value == "Custom copy."
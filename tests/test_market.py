@@ -0,0 +1,70 @@
+"""
+Unit tests for demographics.market (zone-weighted addressable homes).
+"""
+import numpy as np
+import pandas as pd
+
+from demographics.market import INCOME_BAND_LABELS, income_band, market_size
+from demographics.zones import ZONE_COLUMNS, ZONES
+
+MASTER = pd.DataFrame({
+    'Zip Code': ['75019', '75063', '75067', '76051', '75002', '75039'],
+    'City': ['Coppell', 'Irving', 'Lewisville', 'Grapevine', 'Allen', 'Irving'],
+    'Zone 1 (%)': [100.0, 73.6, 0.0, 0.0, 0.0, 50.0],
+    'Zone 2 (%)': [0.0, 26.4, 100.0, 40.0, 0.0, 50.0],
+    'Zone 3 (%)': [0.0, 0.0, 0.0, 60.0, 0.0, 0.0],
+    'Zone 4 (%)': [0.0, 0.0, 0.0, 0.0, 100.0, 0.0],
+    'Total Housing Units': [15000, 12000, 20000, 9000, 30000, 4000],
+    'Single-Family Detached': [11000, 3000, 9000, 7000, 21000, 500],
+    'Other Dwellings': [4000, 9000, 11000, 2000, 9000, 3500],
+    'Median Household Income': [135000, 80000, 70000, np.nan, 110000, 95000],
+})
+
+
+def _loop_addressable(master):
+    """Reference: re-filter once per zone and weight row by row"""
+    totals = {}
+    for zone, col in zip(ZONES, ZONE_COLUMNS):
+        rows = master[master[col] > 0]
+        totals[zone] = round(sum(sf * pct / 100 for sf, pct in zip(rows['Single-Family Detached'], rows[col])))
+    return totals
+
+
+def test_split_zips_are_weighted_by_zone_percentage():
+    by_zone, by_city = market_size(MASTER)
+    assert by_zone['Addressable Homes'].tolist() == list(_loop_addressable(MASTER).values())
+    irving = by_city[by_city['City'] == 'Irving'].set_index('Zone')
+    assert irving.loc[1, 'Addressable Homes'] == round(3000 * 0.736 + 500 * 0.5)
+    assert irving.loc[2, 'ZIP Codes'] == 2
+
+
+def test_city_table_rolls_up_to_zone_table():
+    by_zone, by_city = market_size(MASTER)
+    rolled = by_city.groupby('Zone')[['Housing Units', 'ZIP Codes']].sum()
+    assert (rolled['ZIP Codes'].to_numpy() == by_zone['ZIP Codes'].to_numpy()).all()
+    assert np.abs(rolled['Housing Units'].to_numpy() - by_zone['Housing Units'].to_numpy()).max() <= 1
+    assert by_zone['Housing Units'].sum() == MASTER['Total Housing Units'].sum()
+
+
+def test_income_bands_partition_addressable_homes():
+    by_zone, _ = market_size(MASTER)
+    bands = by_zone[[f'Addressable {label}' for label in INCOME_BAND_LABELS]].sum(axis=1)
+    assert (np.abs(bands - by_zone['Addressable Homes']) <= len(INCOME_BAND_LABELS)).all()
+    zone3 = by_zone.set_index('Zone').loc[3]
+    assert zone3['Addressable Income N/A'] == zone3['Addressable Homes'] == 4200
+    assert income_band([74999, 75000, 150000, np.nan]).tolist() == [0, 1, 3, 4]
+
+
+def test_unit_weighted_income_and_sf_share():
+    by_zone, _ = market_size(MASTER)
+    zone4 = by_zone.set_index('Zone').loc[4]
+    assert zone4['Avg Median Income'] == 110000
+    assert zone4['% Single-Family Detached'] == 70.0
+    assert np.isnan(by_zone.set_index('Zone').loc[3, 'Avg Median Income'])
+
+
+def test_market_columns_are_weighted_when_present():
+    master = MASTER.assign(**{'Owner Occupied': 1000})
+    by_zone, _ = market_size(master)
+    assert by_zone['Owner Occupied'].sum() == 1000 * len(master)
+    assert 'Owner Occupied' not in market_size(MASTER)[0].columns
@@ -0,0 +1,189 @@
+"""
+End-to-end tests for merge_service_area.main with a fake Census session (tests.conftest.FakeACS),
+covering full and manifest-driven incremental refreshes.
+"""
+import json
+
+import pandas as pd
+import pytest
+
+import demographics.cli
+import merge_service_area
+from demographics.areas import ZIP_CODES
+from demographics.client import CensusClient
+from demographics.config import VARIABLE_SETS
+from demographics.decode import MARKET_COLUMNS
+from demographics.manifest import dataset_id
+from demographics.zipindex import ZipIndex
+from tests.conftest import FakeACS
+
+ZONES = pd.DataFrame({
+    'Zip Code': ['75019', '75063', '75067', '76051', '75039'],
+    'Zone 1 (%)': [100.0, 73.6, 0.0, 0.0, 10.0],
+    'Zone 2 (%)': [0.0, 26.4, 100.0, 40.0, 90.0],
+    'Zone 3 (%)': [0.0, 0.0, 0.0, 60.0, 0.0],
+    'Zone 4 (%)': [0.0, 0.0, 0.0, 0.0, 0.0],
+})
+
+
+@pytest.fixture
+def workspace(tmp_path, monkeypatch):
+    paths = {
+        'SERVICE_AREA_CSV': tmp_path / "zones.csv",
+        'MASTER_CSV': tmp_path / "master.csv",
+        'MANIFEST_PATH': tmp_path / "master.manifest.json",
+        'ZIP_INDEX_JSON': tmp_path / "zip_index.json",
+        'MARKET_BY_ZONE_CSV': tmp_path / "market_by_zone.csv",
+        'MARKET_BY_CITY_CSV': tmp_path / "market_by_city.csv",
+        'MASTER_XLSX': tmp_path / "master.xlsx",
+    }
+    for name, path in paths.items():
+        monkeypatch.setattr(merge_service_area, name, str(path))
+    paths['RUN_REPORT'] = tmp_path / "runs.jsonl"
+    monkeypatch.setattr(demographics.cli, "PIPELINE_DIR", str(tmp_path / "pipeline"))
+    monkeypatch.setattr(demographics.cli, "RUN_REPORT_JSONL", str(paths['RUN_REPORT']))
+    monkeypatch.setattr(demographics.cli, "PROFILE_DIR", str(tmp_path / "profiles"))
+    session = FakeACS()
+    monkeypatch.setattr(merge_service_area, "client_from_args",
+                        lambda args, telemetry=None: CensusClient(session=session, rate=None, telemetry=telemetry))
+    return paths, session
+
+
+def test_incremental_fetches_only_added_zips(workspace):
+    paths, session = workspace
+    ZONES.to_csv(paths['SERVICE_AREA_CSV'], index=False)
+    merge_service_area.main([])
+    # Full runs fetch the shared pipeline universe (housing-analysis list + zones)
+    fetched = [z for b in session.requested for z in b]
+    assert sorted(fetched) == sorted(set(ZIP_CODES) | set(ZONES['Zip Code']))
+
+    _edit_zones(paths)
+
+    session.calls.clear()
+    merge_service_area.main(["--incremental"])
+    assert session.requested == [['76092']]
+    patched = pd.read_csv(paths['MASTER_CSV'], dtype={'Zip Code': str})
+    index = ZipIndex.load(paths['ZIP_INDEX_JSON'])
+    assert '76092' in index and '75067' not in index
+
+    # A full rebuild of the edited zones produces the same master
+    merge_service_area.main([])
+    rebuilt = pd.read_csv(paths['MASTER_CSV'], dtype={'Zip Code': str})
+    pd.testing.assert_frame_equal(patched, rebuilt)
+    market = pd.read_csv(paths['MARKET_BY_ZONE_CSV'])
+    # Zone-weighted counts are rounded once per zone
+    assert market['Housing Units'].sum() == pytest.approx(rebuilt['Total Housing Units'].sum(), abs=len(market) / 2)
+    assert '75067' not in set(patched['Zip Code'])
+    assert patched.loc[patched['Zip Code'] == '75039', 'Primary Zone'].item() == 2
+
+
+def _edit_zones(paths):
+    """Add 76092, drop 75067, re-zone 75039"""
+    edited = ZONES[ZONES['Zip Code'] != '75067'].copy()
+    edited.loc[edited['Zip Code'] == '75039', ['Zone 1 (%)', 'Zone 2 (%)']] = [0.0, 100.0]
+    edited = pd.concat([edited, pd.DataFrame([{
+        'Zip Code': '76092', 'Zone 1 (%)': 0.0, 'Zone 2 (%)': 0.0, 'Zone 3 (%)': 100.0, 'Zone 4 (%)': 0.0,
+    }])], ignore_index=True)
+    edited.to_csv(paths['SERVICE_AREA_CSV'], index=False)
+
+
+def _use_variables(monkeypatch, session, variables):
+    monkeypatch.setattr(merge_service_area, "client_from_args",
+                        lambda args, telemetry=None: CensusClient(session=session, rate=None, telemetry=telemetry,
+                                                                  variables=variables))
+
+
+def test_incremental_replays_market_columns(workspace, monkeypatch):
+    paths, session = workspace
+    _use_variables(monkeypatch, session, VARIABLE_SETS["market"])
+    ZONES.to_csv(paths['SERVICE_AREA_CSV'], index=False)
+    merge_service_area.main([])
+    _edit_zones(paths)
+
+    session.calls.clear()
+    merge_service_area.main(["--incremental"])
+    # One request per column shard, for the added ZIP only
+    assert session.requested == [['76092'], ['76092']]
+    patched = pd.read_csv(paths['MASTER_CSV'], dtype={'Zip Code': str})
+    assert patched[MARKET_COLUMNS].notna().all().all()
+
+    merge_service_area.main([])
+    rebuilt = pd.read_csv(paths['MASTER_CSV'], dtype={'Zip Code': str})
+    pd.testing.assert_frame_equal(patched, rebuilt)
+
+
+def test_manifest_missing_columns_forces_full_refresh(workspace, monkeypatch, capsys):
+    paths, session = workspace
+    ZONES.to_csv(paths['SERVICE_AREA_CSV'], index=False)
+    merge_service_area.main([])
+    # A housing-only manifest that claims the market dataset
+    manifest = json.loads(paths['MANIFEST_PATH'].read_text())
+    market = CensusClient(session=session, rate=None, variables=VARIABLE_SETS["market"])
+    manifest['dataset'] = dataset_id(market.base_url, market.variables)
+    paths['MANIFEST_PATH'].write_text(json.dumps(manifest))
+
+    _use_variables(monkeypatch, session, VARIABLE_SETS["market"])
+    ZONES.iloc[:4].to_csv(paths['SERVICE_AREA_CSV'], index=False)
+    session.calls.clear()
+    merge_service_area.main(["--incremental"])
+    assert "missing columns for the current variables" in capsys.readouterr().out
+    assert sorted(z for b in session.requested for z in b) == sorted(ZONES['Zip Code'].iloc[:4].tolist() * 2)
+    master = pd.read_csv(paths['MASTER_CSV'], dtype={'Zip Code': str})
+    assert master[MARKET_COLUMNS].notna().all().all()
+
+
+def test_unchanged_zones_skip_the_refresh(workspace, capsys):
+    paths, session = workspace
+    ZONES.to_csv(paths['SERVICE_AREA_CSV'], index=False)
+    merge_service_area.main(["--incremental"])  # no master yet: full build
+    session.calls.clear()
+
+    merge_service_area.main(["--incremental"])
+    assert session.requested == []
+    assert "nothing to do" in capsys.readouterr().out
+
+
+def test_dataset_change_forces_full_refresh(workspace, monkeypatch):
+    paths, session = workspace
+    ZONES.to_csv(paths['SERVICE_AREA_CSV'], index=False)
+    merge_service_area.main([])
+    ZONES.iloc[:4].to_csv(paths['SERVICE_AREA_CSV'], index=False)
+
+    monkeypatch.setattr(merge_service_area, "client_from_args",
+                        lambda args, telemetry=None: CensusClient(
+                            session=session, rate=None, telemetry=telemetry,
+                            base_url="https://api.census.gov/data/2021/acs/acs5"))
+    session.calls.clear()
+    merge_service_area.main(["--incremental"])
+    assert sum(len(b) for b in session.requested) == 4
+
+
+def test_runs_append_a_json_lines_report(workspace):
+    paths, session = workspace
+    ZONES.to_csv(paths['SERVICE_AREA_CSV'], index=False)
+    merge_service_area.main([])
+    fetched = sum(len(b) for b in session.requested)
+    ZONES.iloc[:4].to_csv(paths['SERVICE_AREA_CSV'], index=False)
+    merge_service_area.main(["--incremental", "--profile", "merge"])
+
+    events = [json.loads(line) for line in paths['RUN_REPORT'].read_text().splitlines()]
+    runs = [e for e in events if e['event'] == 'run']
+    assert [r['command'] for r in runs] == ['merge-service-area'] * 2
+    assert all(r['status'] == 'ok' for r in runs)
+    full, incremental = (r['run'] for r in runs)
+
+    stages = {e['stage']: e for e in events if e['run'] == full and e['event'] == 'stage'}
+    assert set(stages) == {'fetch', 'decode', 'zones', 'cities', 'rank', 'market', 'report'}
+    assert stages['fetch']['rows_out'] == stages['decode']['rows_out'] == fetched
+    assert stages['zones']['rows_out'] == len(ZONES)
+    counters = next(e for e in events if e['run'] == full and e['event'] == 'counters')
+    assert counters['requests'] == len(session.requested) and counters['dropped_zctas'] == 0
+    assert counters['bytes_downloaded'] == session.bytes
+    assert {e['name'] for e in events if e['run'] == full and e['event'] == 'histogram'} == \
+        {'request_latency_s', 'batch_latency_s'}
+
+    stages = {e['stage']: e for e in events if e['run'] == incremental and e['event'] == 'stage'}
+    assert list(stages) == ['fetch', 'merge', 'save', 'market', 'workbook']
+    assert stages['merge']['rows_out'] == 4
+    assert stages['merge']['profile']['top'] and 'profile' not in stages['fetch']
+    assert stages['merge']['profile']['path'].startswith(str(paths['RUN_REPORT'].parent / "profiles"))
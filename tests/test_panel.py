@@ -0,0 +1,96 @@
+"""
+Unit tests for demographics.panel (multi-vintage fetch + growth).
+"""
+import re
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from demographics.client import CensusClient
+from demographics.panel import acs5_dataset, fetch_panel, panel_growth, parse_years
+from tests.conftest import FakeACS, FakeResponse
+
+HEADERS = ["NAME", "B25024_001E", "B25024_002E", "B19013_001E", "zip code tabulation area"]
+
+
+def _vintages(request):
+    """Each vintage adds 100 units and $1,000 income; 75063 has no 2017 data"""
+    year = int(re.search(r"/data/(\d{4})/", request.url).group(1))
+    step = year - 2017
+    rows = [[f"ZCTA5 {z}", str(1000 + 100 * step), str(600 + 20 * step), str(80000 + 1000 * step), z]
+            for z in request.units if not (z == "75063" and year == 2017)]
+    return FakeResponse([HEADERS] + rows)
+
+
+def _acs(delay=0.05):
+    return FakeACS(handler=_vintages, delay=delay)
+
+
+def test_parse_years():
+    assert parse_years("2017-2019") == [2017, 2018, 2019]
+    assert parse_years("2022,2018") == [2018, 2022]
+
+
+def test_pre_2020_vintages_nest_in_state():
+    assert acs5_dataset(2019) == ("https://api.census.gov/data/2019/acs/acs5", "state:48")
+    assert acs5_dataset(2022) == ("https://api.census.gov/data/2022/acs/acs5", None)
+
+
+def test_fetch_panel_runs_years_in_parallel():
+    session = _acs()
+    client = CensusClient(session=session, rate=None)
+    panel = fetch_panel(["75019", "75063"], [2017, 2018, 2019, 2020, 2021, 2022], client)
+
+    assert 1 < session.peak <= client.max_workers
+    urls = [call.url for call in session.calls]
+    assert len(urls) == 6
+    assert all("&in=state:48" in u for u in urls if "/2019/" in u or "/2017/" in u)
+    assert not any("&in=" in u for u in urls if "/2022/" in u)
+    assert panel[['Zip Code', 'Year']].values.tolist()[:3] == [["75019", 2017], ["75019", 2018], ["75019", 2019]]
+    assert len(panel) == 11
+
+
+def test_fetch_panel_stays_within_the_worker_budget():
+    session = _acs(delay=0.02)
+    client = CensusClient(session=session, rate=None, batch_size=1, max_workers=4)
+    fetch_panel([f"{75000 + i:05d}" for i in range(8)], [2017, 2018, 2019, 2020, 2021, 2022], client)
+
+    assert len(session.calls) == 6 * 8
+    assert 1 < session.peak <= client.max_workers
+
+
+def test_panel_growth():
+    client = CensusClient(session=_acs(delay=0), rate=None)
+    growth = panel_growth(fetch_panel(["75019", "75063"], [2017, 2022], client)).set_index('Zip Code')
+
+    row = growth.loc["75019"]
+    assert (row['Housing Units First Year'], row['Housing Units Last Year']) == (2017, 2022)
+    assert row['Housing Unit Growth (%)'] == pytest.approx(50.0)
+    assert row['Single-Family Share Change (pts)'] == pytest.approx(46.7 - 60.0, abs=0.05)
+    assert row['Median Income Growth (%)'] == pytest.approx(6.2)
+
+    # Only one vintage: no growth to report
+    only = growth.loc["75063"]
+    assert only['Housing Units First Year'] == only['Housing Units Last Year'] == 2022
+    assert only['Housing Unit Growth (%)'] == 0
+
+
+def test_panel_growth_measures_each_metric_over_its_own_vintages():
+    panel = pd.DataFrame({
+        'Zip Code': ['75019', '75019', '75019'],
+        'Year': [2017, 2019, 2022],
+        'Total Housing Units': [1000, 1100, 1200],
+        '% Single-Family Detached': [60.0, 61.0, 62.0],
+        'Median Household Income': [np.nan, 100000.0, 110000.0],
+    })
+    row = panel_growth(panel).iloc[0]
+    assert (row['Housing Units First Year'], row['Housing Units Last Year']) == (2017, 2022)
+    assert row['Housing Unit Growth (%)'] == pytest.approx(20.0)
+    assert (row['Median Income First Year'], row['Median Income Last Year']) == (2019, 2022)
+    assert (row['Median Income (First)'], row['Median Income (Last)']) == (100000.0, 110000.0)
+    assert row['Median Income Growth (%)'] == pytest.approx(10.0)
+
+    # Never reported: no years, no growth
+    row = panel_growth(panel.assign(**{'Median Household Income': np.nan})).iloc[0]
+    assert pd.isna(row['Median Income First Year']) and pd.isna(row['Median Income Growth (%)'])
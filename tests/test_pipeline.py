@@ -0,0 +1,177 @@
+"""
+Unit tests for demographics.pipeline (stage keys, stored outputs, and reuse
+between housing-analysis and merge-service-area).
+"""
+import pandas as pd
+import pytest
+
+from demographics import reports
+from demographics.areas import ZIP_CODES
+from demographics.cache import StageStore
+from demographics.client import CensusClient
+from demographics.pipeline import (
+    Pipeline,
+    Stage,
+    acs_universe,
+    housing_pipeline,
+    load_service_area,
+    service_area_pipeline,
+)
+from demographics.zipindex import ZipIndex
+from tests.conftest import FakeACS, FakeResponse
+
+ZONES = pd.DataFrame({
+    'Zip Code': ['75019', '75063', '75067', '76051', '75002'],
+    'Zone 1 (%)': [100.0, 73.6, 0.0, 0.0, 0.0],
+    'Zone 2 (%)': [0.0, 26.4, 100.0, 40.0, 0.0],
+    'Zone 3 (%)': [0.0, 0.0, 0.0, 60.0, 0.0],
+    'Zone 4 (%)': [0.0, 0.0, 0.0, 0.0, 100.0],
+})
+
+
+@pytest.fixture
+def workspace(tmp_path):
+    zones_csv = tmp_path / "zones.csv"
+    ZONES.to_csv(zones_csv, index=False)
+    return {
+        'zones_csv': zones_csv,
+        'store': StageStore(tmp_path / "pipeline"),
+        'session': FakeACS(),
+        'housing_csv': tmp_path / "housing.csv",
+        'master_csv': tmp_path / "master.csv",
+        'manifest': tmp_path / "master.manifest.json",
+        'zip_index': tmp_path / "zip_index.json",
+        'market_csvs': (tmp_path / "market_by_zone.csv", tmp_path / "market_by_city.csv"),
+        'workbook': tmp_path / "master.xlsx",
+    }
+
+
+def _client(session):
+    return CensusClient(session=session, rate=None, backoff_base=0, max_retries=0)
+
+
+def _housing(ws, **kwargs):
+    return housing_pipeline(_client(ws['session']), load_service_area(ws['zones_csv']),
+                            ws['housing_csv'], store=ws['store'], **kwargs)
+
+
+def _merge(ws, **kwargs):
+    return service_area_pipeline(_client(ws['session']), load_service_area(ws['zones_csv']),
+                                 zones_csv=ws['zones_csv'], master_csv=ws['master_csv'],
+                                 manifest_path=ws['manifest'], zip_index_path=ws['zip_index'],
+                                 market_csvs=ws['market_csvs'], workbook_path=ws['workbook'],
+                                 store=ws['store'], **kwargs)
+
+
+def test_commands_share_fetch_and_decode(workspace):
+    housing = _housing(workspace)
+    housing.run("report")
+    assert housing.status == {"fetch": "ran", "decode": "ran", "rank": "ran", "report": "ran"}
+    fetched = sorted(z for b in workspace['session'].requested for z in b)
+    assert fetched == acs_universe(ZONES)
+
+    workspace['session'].calls.clear()
+    merge = _merge(workspace)
+    merge.run("report")
+    assert workspace['session'].requested == []
+    assert merge.status["decode"] == "cached"
+    assert merge.status["zones"] == merge.status["rank"] == "ran"
+
+    master = pd.read_csv(workspace['master_csv'], dtype={'Zip Code': str})
+    assert master['Zip Code'].tolist() == ['75019', '75063', '75067', '76051', '75002']
+    assert master['City'].tolist() == ['Coppell', 'Irving', 'Lewisville', 'Grapevine', 'Allen']
+    assert ZipIndex.load(workspace['zip_index'])['75002'].primary_zone == 4
+    housing_df = pd.read_csv(workspace['housing_csv'], dtype={'Zip Code': str})
+    assert sorted(housing_df['Zip Code']) == sorted(ZIP_CODES)
+
+
+def test_report_changes_rerun_only_the_report(workspace, monkeypatch):
+    _merge(workspace).run("report")
+
+    printed = []
+    monkeypatch.setattr(reports, "print_service_area_report", lambda master, *_: printed.append(len(master)))
+    rerun = _merge(workspace)
+    rerun.run("report")
+
+    assert printed == [5]
+    assert rerun.status == {"rank": "cached", "decode": "cached", "market": "cached", "report": "ran"}
+
+
+def test_rezoning_reuses_fetch_and_decode(workspace):
+    _merge(workspace).run("report")
+    edited = ZONES.copy()
+    edited.loc[edited['Zip Code'] == '75067', ['Zone 1 (%)', 'Zone 2 (%)']] = [100.0, 0.0]
+    edited.to_csv(workspace['zones_csv'], index=False)
+
+    workspace['session'].calls.clear()
+    rerun = _merge(workspace)
+    rerun.run("report")
+
+    assert workspace['session'].requested == []
+    assert rerun.status["decode"] == "cached"
+    assert rerun.status["zones"] == rerun.status["cities"] == rerun.status["rank"] == rerun.status["market"] == "ran"
+    master = pd.read_csv(workspace['master_csv'], dtype={'Zip Code': str})
+    assert master['Zip Code'].tolist()[:3] == ['75019', '75067', '75063']
+
+
+def test_transient_failures_are_not_stored(workspace):
+    workspace['session'].handler = lambda request: \
+        FakeResponse(None, status_code=500) if "75019" in request.units else None
+    first = _merge(workspace)
+    first.run("report")
+    assert first.status["fetch"] == first.status["decode"] == "ran (not stored)"
+
+    workspace['session'].handler = None
+    workspace['session'].calls.clear()
+    second = _merge(workspace)
+    second.run("report")
+    assert second.status["fetch"] == "ran"
+    master = pd.read_csv(workspace['master_csv'], dtype={'Zip Code': str})
+    assert master['Total Housing Units'].notna().all()
+
+
+def test_force_recomputes_every_stage(workspace):
+    _housing(workspace).run("report")
+    forced = _housing(workspace, force=True)
+    forced.run("report")
+    assert set(forced.status.values()) == {"ran"}
+
+
+def test_stage_key_follows_code_params_and_upstream():
+    def double(x):
+        return x * 2
+
+    def triple(x):
+        return x * 3
+
+    def key(run, params):
+        pipeline = Pipeline([Stage("source", lambda: 1, params=params), Stage("scale", run, after=("source",))])
+        return pipeline.key("scale")
+
+    assert key(double, 1) == key(double, 1)
+    assert key(double, 1) != key(triple, 1)
+    assert key(double, 1) != key(double, 2)
+
+
+def test_stage_key_follows_module_settings(workspace, monkeypatch):
+    from demographics import decode, pipeline
+
+    before = _merge(workspace)
+    monkeypatch.setattr(pipeline, "COLUMN_ORDER", pipeline.COLUMN_ORDER[::-1])
+    reordered = _merge(workspace)
+    assert reordered.key("cities") == before.key("cities")
+    assert reordered.key("rank") != before.key("rank")
+
+    monkeypatch.setattr(decode, "MARKET_COLUMNS", decode.MARKET_COLUMNS[:-1])
+    assert _merge(workspace).key("rank") != reordered.key("rank")
+
+    monkeypatch.setattr(pipeline, "ZIP_TO_CITY", {**pipeline.ZIP_TO_CITY, "75001": "Elsewhere"})
+    assert _merge(workspace).key("cities") != before.key("cities")
+
+
+def test_store_keeps_newest_entries(tmp_path):
+    store = StageStore(tmp_path, keep=2)
+    for i in range(4):
+        store.put("decode", f"k{i}", i)
+    assert store.get("decode", "k0") == (False, None)
+    assert store.get("decode", "k3") == (True, 3)
@@ -0,0 +1,122 @@
+"""
+Unit tests for demographics.quality (per-batch data-quality counts,
+thresholds, fail-fast and quarantine policies inside the client's fetch).
+"""
+import json
+
+import pytest
+
+from demographics.acs_stub import Recording
+from demographics.cli import add_fetch_arguments, fetch_errors, guard_from_args
+from demographics.client import ZCTA_FIELD, CensusClient, FetchReport
+from demographics.quality import QualityError, QualityGuard, measure, parse_threshold
+from demographics.stream import stream_housing
+from tests.conftest import FakeACS
+
+HEADERS = ["NAME", "B25024_001E", "B25024_002E", "B19013_001E", ZCTA_FIELD]
+
+
+def _row(z, total=1000, sf=600, income=60000):
+    return [f"ZCTA5 {z}", str(total), str(sf), str(income), z]
+
+
+def _acs(zips, broken=(), delay=0.0):
+    """Good rows, except ZCTAs listed in `broken` come back with suppressed income and no units"""
+    rows = {z: (_row(z, total=0, sf=0, income=-666666666) if z in broken else _row(z))[:-1] for z in zips}
+    return FakeACS(Recording(HEADERS[:-1], rows), delay=delay)
+
+
+def _zips(start, n):
+    return [f"{start + i:05d}" for i in range(n)]
+
+
+def test_measure_counts_each_problem():
+    batch = _zips(75000, 5)
+    table = [HEADERS, _row("75000"), _row("75001", income=-666666666), _row("75002", total=0, sf=0),
+             _row("75003", total=100, sf=150)]
+    quality = measure(1, batch, table, failed=())
+    assert (quality.rows, quality.suppressed_income, quality.zero_units, quality.missing, quality.out_of_range) == \
+        (4, 1, 1, 1, 1)
+    assert measure(2, batch, table, failed=["75004"]).missing == 0
+    assert measure(3, batch, [], failed=()).missing == 5
+
+
+def test_thresholds_and_small_batches():
+    guard = QualityGuard("fail", {"missing": 0.2})
+    big = _zips(75000, 10)
+    table = [HEADERS] + [_row(z) for z in big[:7]]
+    with pytest.raises(QualityError, match="3/10 ZCTAs not returned"):
+        guard.check(1, big, table)
+    # Under QUALITY_MIN_BATCH only the absolute out-of-range check applies
+    assert not guard.check(2, ["76092"], []).bad
+    with pytest.raises(QualityError, match="outside 0-100"):
+        guard.check(3, ["76092"], [HEADERS, _row("76092", total=10, sf=20)])
+
+
+def test_fail_policy_stops_the_fetch_at_the_first_bad_batch():
+    zips = _zips(75000, 500)
+    session = _acs(zips, broken=zips[:50], delay=0.02)
+    client = CensusClient(session=session, rate=None, batch_size=50, max_workers=1, guard=QualityGuard("fail"))
+    with pytest.raises(QualityError, match="Batch 1"):
+        client.fetch(zips)
+    # Queued batches are cancelled rather than fetched
+    assert len(session.calls) < 10
+
+
+def test_quarantine_policy_drops_and_saves_bad_batches(tmp_path):
+    zips = _zips(75000, 100)
+    guard = QualityGuard("quarantine", quarantine_dir=tmp_path)
+    client = CensusClient(session=_acs(zips, broken=zips[50:]), rate=None, batch_size=50, guard=guard)
+    result = client.fetch(zips)
+    assert result.tables[1] is None and len(result.tables[0]) == 51
+    assert result.report.quarantined == zips[50:] and result.report.returned == 50
+    saved = json.loads(next(tmp_path.glob("*-batch00002.json")).read_text())
+    assert saved["zctas"] == zips[50:] and saved["quality"]["zero_units"] == 50
+    assert "1 quarantined: 2" in guard.summary()
+
+
+def test_too_many_quarantined_batches_abort_the_stream(tmp_path):
+    zips = _zips(75000, 100)
+    guard = QualityGuard("quarantine", max_quarantined=1, quarantine_dir=tmp_path / "q")
+    client = CensusClient(session=_acs(zips, broken=zips), rate=None, batch_size=20, max_workers=1, guard=guard)
+    out = tmp_path / "out.csv"
+    with pytest.raises(QualityError, match="2 batches quarantined"):
+        stream_housing(client, zips, out, FetchReport())
+    assert not out.exists()
+
+
+def test_cli_builds_the_guard():
+    import argparse
+    parser = add_fetch_arguments(argparse.ArgumentParser())
+    args = parser.parse_args(["--quality", "quarantine", "--quality-threshold", "missing=0.8"])
+    guard = guard_from_args(args)
+    assert guard.policy == "quarantine" and guard.thresholds["missing"] == 0.8
+    assert guard_from_args(parser.parse_args(["--quality", "off"])) is None
+    assert parse_threshold("zero_units=0") == ("zero_units", 0.0)
+    with pytest.raises(SystemExit):
+        parser.parse_args(["--quality-threshold", "missing=2"])
+
+
+def test_vintages_sharing_a_guard_quarantine_to_separate_files(tmp_path):
+    zips = _zips(75000, 50)
+    guard = QualityGuard("quarantine", quarantine_dir=tmp_path)
+    client = CensusClient(session=_acs(zips, broken=zips), rate=None, guard=guard)
+    for year, geo_in in ((2017, "state:48"), (2022, None)):
+        client.for_dataset(f"https://api.census.gov/data/{year}/acs/acs5", geo_in).fetch(zips)
+
+    names = sorted(p.name.split("-", 1)[1] for p in tmp_path.glob("*.json"))
+    assert names == ["2017-acs-acs5-state-48-batch00001.json", "2022-acs-acs5-batch00001.json"]
+    assert "2 quarantined: 2017-acs-acs5-state-48 1, 2022-acs-acs5 1" in guard.summary()
+
+
+def test_quality_failure_exits_with_the_guard_summary():
+    zips = _zips(75000, 50)
+    guard = QualityGuard("fail")
+    client = CensusClient(session=_acs(zips, broken=zips), rate=None, guard=guard)
+    with pytest.raises(SystemExit) as exit_:
+        with fetch_errors(guard):
+            client.fetch(zips)
+    message = str(exit_.value.code)
+    assert message.startswith("Batch 1 failed data-quality checks: 50/50 suppressed median income")
+    assert "\nData quality: 1 batches checked (50 suppressed income, 50 zero units)\n" in message
+    assert message.endswith("--quality-threshold.")
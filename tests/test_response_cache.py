@@ -0,0 +1,113 @@
+"""
+Unit tests for demographics.cache and the client's cache/offline paths.
+"""
+import gzip
+import json
+import os
+import time
+
+import pandas as pd
+import pytest
+
+from demographics import pipeline
+from demographics.cache import CacheMiss, ResponseCache, cache_key
+from demographics.client import CensusClient
+from tests.conftest import FakeACS, FakeResponse
+
+TABLE = [["NAME", "B25024_001E", "zip code tabulation area"], ["ZCTA5 75019", "17329", "75019"]]
+
+
+def test_key_ignores_batch_order_but_not_dataset():
+    a = cache_key("https://x/2022/acs/acs5", "NAME", ["75019", "75063"])
+    assert a == cache_key("https://x/2022/acs/acs5", "NAME", ["75063", "75019"])
+    assert a != cache_key("https://x/2021/acs/acs5", "NAME", ["75019", "75063"])
+    assert a != cache_key("https://x/2022/acs/acs5", "NAME,B19013_001E", ["75019", "75063"])
+
+
+def test_roundtrip_is_compressed(tmp_path):
+    cache = ResponseCache(tmp_path)
+    body = json.dumps(TABLE * 200).encode()
+    cache.put("k", body)
+    assert cache.get("k") == TABLE * 200
+    assert cache.get("missing") is None
+    assert (tmp_path / "k.json.gz").stat().st_size < len(body)
+
+
+@pytest.mark.parametrize("damage", [
+    lambda data: data[:len(data) // 2],             # interrupted write: truncated gzip stream
+    lambda data: data[:10] + b"\x00" * (len(data) - 10),  # corrupt deflate data
+    lambda data: gzip.compress(b'[["NAME"'),         # valid gzip, truncated JSON
+    lambda data: b"not gzip at all",
+])
+def test_unreadable_entries_are_misses_and_removed(tmp_path, damage):
+    cache = ResponseCache(tmp_path)
+    cache.put("k", json.dumps(TABLE * 50).encode())
+    path = tmp_path / "k.json.gz"
+    path.write_bytes(damage(path.read_bytes()))
+    assert cache.get("k") is None
+    assert not path.exists()
+
+
+def test_lru_eviction_keeps_recently_read_entries(tmp_path):
+    body = os.urandom(2000)  # incompressible, so every entry is ~2KB on disk
+    cache = ResponseCache(tmp_path, max_bytes=7000)
+    for i, key in enumerate(["a", "b", "c"]):
+        cache.put(key, body)
+        os.utime(tmp_path / f"{key}.json.gz", (time.time() - 100 + i, time.time() - 100 + i))
+    os.utime(tmp_path / "a.json.gz")  # "a" becomes most recently used
+
+    cache.put("d", body)
+    remaining = sorted(p.name.split(".")[0] for p in tmp_path.glob("*.json.gz"))
+    assert remaining == ["a", "c", "d"]
+    assert cache.size() <= 7000
+
+
+def _acs():
+    return FakeACS(handler=lambda request: FakeResponse(TABLE))
+
+
+def _no_network(request):
+    pytest.fail("network used")
+
+
+def test_client_replays_cache_without_network(tmp_path):
+    session = _acs()
+    cache = ResponseCache(tmp_path)
+    result = CensusClient(cache=cache, rate=None, session=session).fetch(["75019"])
+    assert result.tables == [TABLE]
+    assert len(session.calls) == 1
+
+    offline = CensusClient(cache=ResponseCache(tmp_path, offline=True), rate=None, session=FakeACS(handler=_no_network))
+    result = offline.fetch(["75019"])
+    assert result.tables == [TABLE]
+    assert result.report.cache_hits == 1
+
+
+def test_offline_miss_raises(tmp_path):
+    offline = CensusClient(cache=ResponseCache(tmp_path, offline=True), rate=None, session=FakeACS(handler=_no_network))
+    with pytest.raises(CacheMiss) as miss:
+        offline.fetch(["75019"])
+    assert miss.value.missing == ["75019"]
+
+
+def test_corrupt_entry_is_refetched(tmp_path):
+    session = _acs()
+    cache = ResponseCache(tmp_path)
+    CensusClient(cache=cache, rate=None, session=session).fetch(["75019"])
+    for entry in tmp_path.glob("*.json.gz"):
+        entry.write_bytes(entry.read_bytes()[:8])
+    assert CensusClient(cache=cache, rate=None, session=session).fetch(["75019"]).tables == [TABLE]
+    assert len(session.calls) == 2
+
+
+def test_offline_cold_cache_exits_naming_the_zips(tmp_path):
+    # The fetch stage covers every known DFW ZIP; the zones file only has to load
+    zones = tmp_path / "zones.csv"
+    pd.DataFrame({'Zip Code': ['75019'], 'Zone 1 (%)': [100.0], 'Zone 2 (%)': [0.0],
+                  'Zone 3 (%)': [0.0], 'Zone 4 (%)': [0.0]}).to_csv(zones, index=False)
+    with pytest.raises(SystemExit) as exit_:
+        pipeline.main(["merge-service-area", "--zones", str(zones), "--offline", "--run-report", "",
+                       "--cache-dir", str(tmp_path / "cache"), "--pipeline-dir", str(tmp_path / "pipeline")])
+    message = str(exit_.value.code)
+    assert message.startswith("No cached response for 50 zip codes (offline mode): 75001, 75006, ")
+    assert "(50 in all)\nRun once without --offline" in message
@@ -0,0 +1,96 @@
+"""
+Unit tests for demographics.revenue (estimator-matrix parsing, price grid,
+and the ZIP x price-grid revenue projection).
+"""
+import itertools
+import math
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from demographics.revenue import (
+    DUCTS_UNKNOWN,
+    duct_prices,
+    load_matrix,
+    price_grid,
+    project_revenue,
+    round_to_hundred,
+)
+
+MATRIX_JS = Path(__file__).resolve().parents[1] / "frontend" / "lib" / "estimator-matrix.js"
+
+
+def _js_range(matrix, sqft, system_type, stage, seer, ducts):
+    """calculateReplacementRange() from estimator-matrix.js, line by line"""
+    tonnage = matrix["SQFT_TONNAGE"][sqft]
+    base = matrix["SYSTEM_TYPE_BASE"][system_type]
+    stage_mult = matrix["STAGE_MULTIPLIER"][stage]
+    low = (base["low"] * tonnage * stage_mult + matrix["SEER_ADD"][seer] + matrix["DUCT_ADD"][ducts]["low"]) \
+        * matrix["GLOBAL_VARIANCE"]["lowPct"]
+    high = (base["high"] * tonnage * stage_mult + matrix["SEER_ADD"][seer] + matrix["DUCT_ADD"][ducts]["high"]) \
+        * matrix["GLOBAL_VARIANCE"]["highPct"]
+    return math.floor(low / 100 + 0.5) * 100, math.floor(high / 100 + 0.5) * 100
+
+
+@pytest.fixture(scope="module")
+def matrix():
+    return load_matrix(MATRIX_JS)
+
+
+def test_load_matrix_reads_every_sheet(matrix):
+    assert matrix["SQFT_TONNAGE"]["1500_2500"] == 3.5
+    assert matrix["SYSTEM_TYPE_BASE"]["matched"] == {"low": 2500, "high": 3500}
+    assert matrix["DUCT_ADD"]["full_replacement"]["high"] == 7000
+    assert matrix["GLOBAL_VARIANCE"] == {"lowPct": 0.92, "highPct": 1.08}
+
+
+def test_price_grid_matches_estimator_math(matrix):
+    grid = price_grid(matrix)
+    sheets = ["SQFT_TONNAGE", "SYSTEM_TYPE_BASE", "STAGE_MULTIPLIER", "SEER_ADD", "DUCT_ADD"]
+    assert len(grid) == np.prod([len(matrix[s]) for s in sheets])
+    expected = [_js_range(matrix, *combo) for combo in itertools.product(*(matrix[s] for s in sheets))]
+    assert list(zip(grid["low"], grid["high"])) == expected
+
+    row = grid[(grid["sqft"] == "1500_2500") & (grid["system_type"] == "matched") & (grid["stage"] == "standard")
+               & (grid["seer"] == "mid") & (grid["ducts"] == "older_ok")].iloc[0]
+    assert (row["low"], row["high"]) == (10400, 17200)
+
+
+def test_round_to_hundred_rounds_halves_up():
+    assert round_to_hundred([250, 350, -250, 149.9]).tolist() == [300, 400, -200, 100]
+
+
+def test_single_combo_mix_prices_that_combo(matrix):
+    grid = price_grid(matrix)
+    mix = {"sqft": {"under_1500": 1}, "system_type": {"ac_only": 1}, "stage": {"value": 1}, "seer": {"baseline": 1}}
+    prices = duct_prices(grid, mix)
+    assert tuple(prices.loc["unknown"]) == _js_range(matrix, "under_1500", "ac_only", "value", "baseline", "unknown")
+
+
+def test_projection_by_zip_and_zone(matrix):
+    grid = price_grid(matrix)
+    master = pd.DataFrame({
+        'Zip Code': ['75019', '75063', '76051'],
+        'Primary Zone': [1, 1, 3],
+        'Zone 1 (%)': [100.0, 50.0, 0.0], 'Zone 2 (%)': [0.0, 50.0, 0.0],
+        'Zone 3 (%)': [0.0, 0.0, 100.0], 'Zone 4 (%)': [0.0, 0.0, 0.0],
+        'Single-Family Detached': [1000, 2000, 0],
+    })
+    by_zip, by_zone = project_revenue(master, grid)
+    unknown = duct_prices(grid).loc[list(DUCTS_UNKNOWN)[0]]
+    assert by_zip.loc[0, 'Revenue Potential (Low)'] == round(1000 * unknown['low'])
+    assert by_zip.loc[2, 'Revenue Potential (High)'] == 0
+    assert by_zone['Single-Family Detached'].tolist() == [2000, 1000, 0, 0]
+    assert abs(by_zone['Revenue Potential (Low)'].sum() - by_zip['Revenue Potential (Low)'].sum()) <= 2
+
+
+def test_older_housing_stock_projects_more_revenue(matrix):
+    grid = price_grid(matrix)
+    master = pd.DataFrame({
+        'Zone 1 (%)': [100.0, 100.0], 'Zone 2 (%)': 0.0, 'Zone 3 (%)': 0.0, 'Zone 4 (%)': 0.0,
+        'Single-Family Detached': [1000, 1000], '% Built Before 2000': [10.0, 90.0],
+    })
+    by_zip, _ = project_revenue(master, grid)
+    assert (by_zip['Revenue Potential (High)'].diff().iloc[1]) > 0
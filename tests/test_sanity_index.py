@@ -0,0 +1,90 @@
+"""
+Unit tests for frontend/sanity_index.py (streaming NDJSON export index with
+citation lookups and FTS5 phrase search).
+"""
+import json
+import sqlite3
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "frontend"))
+
+import sanity_index  # noqa: E402
+from sanity_index import SanityIndex, build_index  # noqa: E402
+
+DOCS = [
+    {"_id": "siteSettings", "_type": "siteSettings", "leadFormDescription": "We'll call you within 2 business hours.",
+     "leadFormDescriptionShort": "Fast callbacks."},
+    {"_id": "faq-rs3", "_type": "faq", "question": "Do you offer same-day repair?",
+     "answer": "Yes, we offer same-day HVAC repair across Dallas-Fort Worth."},
+    {"_id": "service-commercial-maintenance", "_type": "service", "title": "Commercial Maintenance",
+     "processSteps": [{"_key": f"s{i}", "_type": "step", "description": f"Step {i} of the visit."} for i in range(5)],
+     "heroBenefits": ["Priority dispatch for contracted clients (24/7)", "Café-grade filters"]},
+    {"_id": "faq-rs5", "_type": "faq", "answer": "Family-owned since 1974.", "order": 5},
+]
+
+
+@pytest.fixture
+def index(tmp_path):
+    source = tmp_path / "export.ndjson"
+    lines = [json.dumps(d) for d in DOCS[:2]] + ["", "}"] + [json.dumps(d) for d in DOCS[2:]]
+    source.write_text("\n".join(lines) + "\n")
+    path, documents, fields = build_index(source, tmp_path / "index" / "sanity.sqlite", batch_size=3)
+    assert (documents, fields) == (4, 13)
+    index = SanityIndex.load(path)
+    yield index
+    index.close()
+
+
+def test_lookup_resolves_audit_citation_forms(index):
+    assert [f.text for f in index.lookup("faq-rs3 answer")] == [DOCS[1]["answer"]]
+    assert [f.path for f in index.lookup("siteSettings.leadFormDescription")] == ["leadFormDescription"]
+    assert index.lookup("service-commercial-maintenance processSteps[4]")[0].text == "Step 4 of the visit."
+    assert len(index.lookup("service-commercial-maintenance processSteps")) == 5
+    assert [f.path for f in index.lookup("faq-rs3")] == ["question", "answer"]
+    assert index.lookup("faq-rs3 missingField") == [] and index.lookup("nope") == []
+
+
+def test_lookup_keeps_export_lines_and_types(index):
+    field = index.lookup("faq-rs5 answer")[0]
+    assert (field.doc_type, field.line, field.citation) == ("faq", 6, "faq-rs5 answer")
+    assert [f.doc_id for f in index.by_type("faq", "answer")] == ["faq-rs3", "faq-rs5"]
+
+
+def test_search_matches_phrases_and_words(index):
+    assert [f.citation for f in index.search("same-day")] == ["faq-rs3 question", "faq-rs3 answer"]
+    assert [f.citation for f in index.search("within 2 business hours")] == ["siteSettings leadFormDescription"]
+    assert index.search("business within hours") == []
+    assert [f.citation for f in index.search("business within hours", phrase=False)] == \
+        ["siteSettings leadFormDescription"]
+    assert [f.citation for f in index.search("cafe")] == ["service-commercial-maintenance heroBenefits[1]"]
+    assert index.search('"24/7"') and index.search("  ") == []
+
+
+def test_rebuild_replaces_index_and_version_is_checked(tmp_path, index):
+    path = tmp_path / "index" / "sanity.sqlite"
+    source = tmp_path / "small.ndjson"
+    source.write_text(json.dumps(DOCS[0]) + "\n")
+    build_index(source, path)
+    assert len(SanityIndex.load(path)) == 2
+    assert not list(path.parent.glob("*.tmp"))
+
+    conn = sqlite3.connect(path)
+    conn.execute("UPDATE meta SET value = '0' WHERE key = 'version'")
+    conn.commit()
+    conn.close()
+    with pytest.raises(ValueError, match="rebuild"):
+        SanityIndex.load(path)
+
+
+def test_main_builds_and_queries(tmp_path, capsys):
+    source = tmp_path / "export.ndjson"
+    source.write_text("".join(json.dumps(d) + "\n" for d in DOCS))
+    sanity_index.main(["--build", "--source", str(source), "--index", str(tmp_path / "i.sqlite"),
+                       "faq-rs3 answer", "--search", "since 1974"])
+    out = capsys.readouterr().out
+    assert "Indexed 4 documents (13 text fields)" in out
+    assert "faq-rs3 answer (line 2): Yes, we offer" in out
+    assert '"since 1974": 1 hit(s)' in out
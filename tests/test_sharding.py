@@ -0,0 +1,104 @@
+"""
+Unit tests for column-sharded ACS fetches (wide variable lists split across
+calls and joined back on ZCTA) and the market columns decoded from them.
+"""
+import numpy as np
+
+from demographics.client import ZCTA_FIELD, CensusClient, FetchReport, join_shards, shard_variables
+from demographics.config import HOUSING_VARIABLES, MARKET_VARIABLES, VARIABLE_SETS
+from demographics.decode import HOUSING_COLUMNS, MARKET_COLUMNS, process_census_data
+from tests.conftest import FakeACS, FakeResponse
+
+
+def _failing(variable, zctas):
+    """Handler: requests for `variable` covering any of `zctas` get a 500"""
+    def handler(request):
+        if variable in request.variables and set(zctas) & set(request.units):
+            return FakeResponse(None, status_code=500)
+    return handler
+
+
+def _client(session, variables, **kwargs):
+    return CensusClient(session=session, variables=variables, rate=None, backoff_base=0,
+                        max_retries=0, **kwargs)
+
+
+def test_shard_variables_caps_and_dedupes():
+    shards = shard_variables(VARIABLE_SETS["market"])
+    assert [len(s.split(",")) for s in shards] == [50, len(HOUSING_VARIABLES) + len(MARKET_VARIABLES) - 50]
+    assert shards[0].startswith("NAME,")
+    assert shard_variables("NAME, B25024_001E,NAME") == ["NAME,B25024_001E"]
+
+
+def test_housing_set_is_a_single_shard():
+    client = _client(FakeACS(), HOUSING_VARIABLES)
+    assert client.shards == ["NAME,B25024_001E,B25024_002E,B19013_001E"]
+    assert client.variables == client.shards[0]
+
+
+def test_wide_fetch_joins_shards_per_batch():
+    session = FakeACS()
+    zips = [f"{75000 + i:05d}" for i in range(12)]
+    client = _client(session, VARIABLE_SETS["market"], batch_size=5, max_workers=4)
+    result = client.fetch(zips)
+
+    assert len(session.calls) == 3 * 2
+    assert result.report.returned == 12 and result.report.unrecoverable == []
+    headers = result.tables[0][0]
+    assert headers[:len(HOUSING_VARIABLES)] == HOUSING_VARIABLES
+    assert set(VARIABLE_SETS["market"]) | {ZCTA_FIELD} == set(headers)
+    assert headers.count(ZCTA_FIELD) == 1
+    assert [row[headers.index(ZCTA_FIELD)] for t in result.tables for row in t[1:]] == zips
+
+
+def test_iter_fetch_yields_joined_batches():
+    client = _client(FakeACS(), VARIABLE_SETS["market"], batch_size=4, max_workers=2)
+    report = FetchReport()
+    batches = dict(client.iter_fetch([f"{76000 + i:05d}" for i in range(10)], report, window=2))
+    assert sorted(batches) == [1, 2, 3]
+    assert all(len(t[0]) == len(VARIABLE_SETS["market"]) + 1 for t in batches.values())
+    assert report.returned == 10
+
+
+def test_shard_failure_keeps_other_columns():
+    session = FakeACS(handler=_failing("B19001_017E", ["75003"]))
+    client = _client(session, VARIABLE_SETS["market"], batch_size=5)
+    result = client.fetch(["75001", "75002", "75003"])
+
+    assert list(result.report.failed) == ["75003"]
+    table = result.tables[0]
+    row = next(r for r in table[1:] if r[table[0].index(ZCTA_FIELD)] == "75003")
+    assert row[table[0].index("B25024_001E")] is not None
+    assert row[table[0].index("B19001_017E")] is None
+
+
+def test_join_shards_outer_joins_on_zcta():
+    a = [["NAME", "X_001E", ZCTA_FIELD], ["n1", "1", "75001"]]
+    b = [["Y_001E", ZCTA_FIELD], ["2", "75001"], ["3", "75002"]]
+    assert join_shards([a, b]) == [
+        ["NAME", "X_001E", ZCTA_FIELD, "Y_001E"],
+        ["n1", "1", "75001", "2"],
+        [None, None, "75002", "3"],
+    ]
+    assert join_shards([a, None]) is a
+    assert join_shards([None, []]) is None
+
+
+def test_market_columns_decode_only_for_market_tables():
+    housing = process_census_data(_client(FakeACS(), HOUSING_VARIABLES).fetch(["75019"]).tables)
+    assert list(housing.columns) == HOUSING_COLUMNS
+
+    tables = _client(FakeACS(), VARIABLE_SETS["market"]).fetch(["75019", "75063"]).tables
+    headers = tables[0][0]
+    for row in tables[0][1:]:
+        row[headers.index("B25003_001E")] = "200"
+        row[headers.index("B25003_002E")] = "150"
+        row[headers.index("B25077_001E")] = "-666666666"
+    df = process_census_data(tables)
+
+    assert list(df.columns) == HOUSING_COLUMNS + MARKET_COLUMNS
+    assert df['% Owner Occupied'].tolist() == [75.0, 75.0]
+    assert np.isnan(df['Median Home Value']).all()
+    # Sum of the seven pre-2000 year-built lines (B25034_005E..011E)
+    first = headers.index("B25034_005E")
+    assert df['Built Before 2000'].iloc[0] == sum(int(v) for v in tables[0][1][first:first + 7])
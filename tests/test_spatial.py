@@ -0,0 +1,113 @@
+"""
+Unit tests for demographics.spatial (Gazetteer loading, grid index, zoning).
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from demographics.spatial import (
+    HQ,
+    Depot,
+    GridIndex,
+    assign_zones,
+    drive_minutes,
+    haversine_miles,
+    load_centroids,
+    parse_depot,
+    zones_frame,
+)
+from demographics.zones import primary_zone
+
+
+@pytest.fixture(scope="module")
+def centroids():
+    rng = np.random.default_rng(7)
+    n = 3000
+    return pd.DataFrame({
+        "Zip Code": [f"{75000 + i:05d}" for i in range(n)],
+        "Latitude": HQ.lat + rng.uniform(-1.5, 1.5, n),
+        "Longitude": HQ.lon + rng.uniform(-1.5, 1.5, n),
+    })
+
+
+def test_load_gazetteer_file(tmp_path):
+    # Gazetteer files are tab-separated and pad the last header with spaces
+    path = tmp_path / "2020_Gaz_zcta_national.txt"
+    path.write_text(
+        "GEOID\tALAND\tAWATER\tALAND_SQMI\tAWATER_SQMI\tINTPTLAT\tINTPTLONG            \n"
+        "00601\t166836392\t798613\t64.416\t0.308\t18.180555\t-66.749961\n"
+        "75019\t47000000\t1000000\t18.1\t0.4\t32.9668\t-96.9862\n"
+    )
+    df = load_centroids(path)
+    assert df["Zip Code"].tolist() == ["00601", "75019"]
+    assert df.loc[1, "Latitude"] == pytest.approx(32.9668)
+    assert df.loc[1, "Longitude"] == pytest.approx(-96.9862)
+
+
+def test_load_rejects_other_layouts(tmp_path):
+    path = tmp_path / "zips.csv"
+    path.write_text("zip,lat,lon\n75019,32.9,-96.9\n")
+    with pytest.raises(ValueError, match="INTPTLAT"):
+        load_centroids(path)
+
+
+def test_haversine_one_degree_of_latitude():
+    assert haversine_miles(0, 0, 1, 0) == pytest.approx(69.09, abs=0.05)
+    assert haversine_miles(HQ.lat, HQ.lon, HQ.lat, HQ.lon) == 0
+
+
+def test_grid_within_matches_brute_force(centroids):
+    index = GridIndex(centroids["Latitude"], centroids["Longitude"])
+    for lat, lon, miles in [(HQ.lat, HQ.lon, 25), (33.4, -96.2, 40), (31.0, -98.0, 10)]:
+        idx, dist = index.within(lat, lon, miles)
+        brute = haversine_miles(lat, lon, centroids["Latitude"], centroids["Longitude"])
+        assert set(idx.tolist()) == set(np.flatnonzero(brute <= miles).tolist())
+        assert np.all(np.diff(dist) >= 0)
+
+
+def test_grid_nearest_matches_brute_force(centroids):
+    index = GridIndex(centroids["Latitude"], centroids["Longitude"])
+    brute = haversine_miles(32.5, -97.3, centroids["Latitude"], centroids["Longitude"])
+    idx, dist = index.nearest(32.5, -97.3, k=5)
+    assert idx.tolist() == np.argsort(brute, kind="stable")[:5].tolist()
+    # Far outside the data the search keeps widening until it finds points
+    idx, _ = index.nearest(40.0, -90.0)
+    assert idx.tolist() == [int(np.argmin(haversine_miles(40.0, -90.0, centroids["Latitude"], centroids["Longitude"])))]
+
+
+def test_assign_zones_uses_drive_time_bounds(centroids):
+    result = assign_zones(centroids, [HQ])
+    miles = haversine_miles(HQ.lat, HQ.lon, centroids["Latitude"], centroids["Longitude"])
+    minutes = drive_minutes(miles)
+    expected = np.select([minutes <= 15, minutes <= 30, minutes <= 45, minutes <= 60], [1, 2, 3, 4], 0)
+
+    by_zip = dict(zip(result["Zip Code"], result["Primary Zone"]))
+    assert by_zip == {z: e for z, e in zip(centroids["Zip Code"], expected) if e}
+    assert result["Primary Zone"].is_monotonic_increasing
+
+
+def test_second_depot_rezones_its_neighbourhood(centroids):
+    frisco = Depot("Frisco", 33.1507, -96.8236)
+    one = assign_zones(centroids, [HQ]).set_index("Zip Code")
+    two = assign_zones(centroids, [HQ, frisco]).set_index("Zip Code")
+
+    assert set(one.index) <= set(two.index)
+    shared = one.index
+    assert (two.loc[shared, "Drive Time (min)"] <= one.loc[shared, "Drive Time (min)"]).all()
+    moved = two[two["Nearest Depot"] == "Frisco"]
+    assert len(moved) > 0
+    points = centroids.set_index("Zip Code").loc[moved.index]
+    depot_miles = haversine_miles(frisco.lat, frisco.lon, points["Latitude"], points["Longitude"])
+    assert np.allclose(moved["Distance (mi)"], np.round(depot_miles, 1))
+
+
+def test_zones_frame_feeds_the_merge(centroids):
+    assignments = assign_zones(centroids, [HQ])
+    zones = zones_frame(assignments)
+    assert (primary_zone(zones) == assignments["Primary Zone"].to_numpy()).all()
+    assert (zones[["Zone 1 (%)", "Zone 2 (%)", "Zone 3 (%)", "Zone 4 (%)"]].sum(axis=1) == 100).all()
+
+
+def test_parse_depot():
+    assert parse_depot("Coppell HQ:32.9545,-96.9903") == HQ
+    assert parse_depot("33.1,-96.8") == Depot("33.1,-96.8", 33.1, -96.8)
@@ -0,0 +1,136 @@
+"""
+Unit tests for the streaming mode (demographics.stream + CensusClient.iter_fetch).
+"""
+import pandas as pd
+import pytest
+
+from demographics.acs_stub import Recording
+from demographics.client import CensusClient, FetchError, FetchReport
+from demographics.decode import process_census_data
+from demographics.stream import StreamWriter, stream_housing
+from tests.conftest import FakeACS, FakeResponse
+
+HEADERS = ["NAME", "B25024_001E", "B25024_002E", "B19013_001E", "zip code tabulation area"]
+
+
+def _row(zcta):
+    n = int(zcta)
+    total = 100 + n % 900
+    income = "-666666666" if n % 7 == 0 else str(40000 + (n * 37) % 90000)
+    return [f"ZCTA5 {zcta}", str(total), str(total * (n % 10) // 10), income, zcta]
+
+
+def _acs(universe, drop=()):
+    """ACS stand-in over a fixed ZCTA universe; ZCTAs in `drop` return no row"""
+    return FakeACS(Recording(HEADERS[:-1], {z: _row(z)[:-1] for z in universe if z not in drop}))
+
+
+def _client(session, **kwargs):
+    kwargs.setdefault("rate", None)
+    kwargs.setdefault("backoff_base", 0)
+    return CensusClient(session=session, **kwargs)
+
+
+ZIPS = [f"{75000 + i:05d}" for i in range(537)]
+
+
+def test_iter_fetch_yields_every_batch_once():
+    client = _client(_acs(ZIPS), batch_size=50, max_workers=4)
+    report = FetchReport()
+    numbers = []
+    returned = []
+    for number, table in client.iter_fetch(ZIPS, report):
+        numbers.append(number)
+        returned.extend(row[-1] for row in table[1:])
+
+    assert sorted(numbers) == list(range(1, 12))
+    assert sorted(returned) == ZIPS
+    assert report.requested == report.returned == len(ZIPS)
+
+
+def test_iter_fetch_keeps_a_bounded_window():
+    session = _acs(ZIPS)
+    client = _client(session, batch_size=10, max_workers=2)
+    stream = client.iter_fetch(ZIPS, window=4)
+    next(stream)
+    # Only the window was submitted before the consumer took the first batch
+    assert len(session.calls) <= 4
+    stream.close()
+    assert len(session.calls) < len(ZIPS) // 10
+
+
+def test_stream_matches_in_memory_run(tmp_path):
+    session = _acs(ZIPS, drop={"75003", "75400"})
+    client = _client(session, batch_size=40, max_workers=4)
+    expected = process_census_data(client.fetch(ZIPS).tables)
+
+    report = FetchReport()
+    stats = stream_housing(client, ZIPS, tmp_path / "housing.csv", report, top_n=20, chunk_rows=100)
+
+    written = pd.read_csv(tmp_path / "housing.csv", dtype={'Zip Code': str})
+    written = written.sort_values('Zip Code').reset_index(drop=True)
+    pd.testing.assert_frame_equal(written, expected.sort_values('Zip Code').reset_index(drop=True),
+                                  check_dtype=False)
+    assert report.unrecoverable == ["75003", "75400"]
+
+    assert stats.zip_codes == len(expected)
+    assert stats.total_units == expected['Total Housing Units'].sum()
+    assert stats.single_family == expected['Single-Family Detached'].sum()
+    assert stats.average_income == pytest.approx(expected['Median Household Income'].mean())
+
+    top_sf = expected.sort_values('% Single-Family Detached', ascending=False)
+    assert (stats.top_single_family['% Single-Family Detached'].tolist()
+            == top_sf['% Single-Family Detached'].head(20).tolist())
+    top_income = expected.nlargest(20, 'Median Household Income')
+    assert stats.top_income['Zip Code'].tolist() == top_income['Zip Code'].tolist()
+
+
+def test_stream_writes_columnar_sibling(tmp_path):
+    pytest.importorskip("pyarrow")
+    from demographics.columnar import load_columnar
+
+    client = _client(_acs(ZIPS), batch_size=25, max_workers=3)
+    stream_housing(client, ZIPS, tmp_path / "housing.csv", FetchReport(), chunk_rows=60)
+
+    loaded = load_columnar(tmp_path / "housing.arrow")
+    assert loaded['Zip Code'].dtype == 'string'
+    assert sorted(loaded['Zip Code']) == ZIPS
+    assert loaded['Median Household Income'].isna().sum() == sum(int(z) % 7 == 0 for z in ZIPS)
+
+
+def test_interrupted_stream_leaves_no_output(tmp_path):
+    class Boom(Exception):
+        pass
+
+    client = _client(_acs(ZIPS), batch_size=25)
+    original = client.iter_fetch
+
+    def failing(zip_codes, report):
+        for i, item in enumerate(original(zip_codes, report)):
+            if i == 3:
+                raise Boom()
+            yield item
+
+    client.iter_fetch = failing
+    with pytest.raises(Boom):
+        stream_housing(client, ZIPS, tmp_path / "housing.csv", FetchReport(), chunk_rows=50)
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_empty_stream_writes_header_only(tmp_path):
+    writer = StreamWriter(tmp_path / "empty.csv", columnar=False)
+    assert writer.close() == [tmp_path / "empty.csv"]
+    assert pd.read_csv(tmp_path / "empty.csv").empty
+
+
+def test_list_zctas_filters_by_prefix():
+    universe = ["75019", "88510", "10001", "79936", "90210"]
+    client = _client(_acs(universe))
+    assert client.list_zctas(("75", "79", "885")) == ["75019", "79936", "88510"]
+    assert client.list_zctas() == sorted(universe)
+
+
+def test_list_zctas_failure_raises():
+    down = FakeACS(handler=lambda request: FakeResponse(None, status_code=400))
+    with pytest.raises(FetchError, match="HTTP 400"):
+        _client(down, max_retries=0).list_zctas()
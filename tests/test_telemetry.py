@@ -0,0 +1,133 @@
+"""
+Unit tests for demographics.telemetry (histograms, stage timing, cProfile
+hook, JSON-lines run reports) and its hooks in the client and pipeline.
+"""
+import argparse
+import json
+
+import pandas as pd
+import pytest
+
+from demographics.acs_stub import Recording
+from demographics.cache import StageStore
+from demographics.client import CensusClient, FetchReport, FetchResult
+from demographics.pipeline import Pipeline, Stage
+from demographics.telemetry import Histogram, Telemetry, count_rows, parse_profile, run_report, timed
+from tests.conftest import FakeACS, FakeResponse
+
+HEADERS = ["NAME", "B25024_001E", "zip code tabulation area"]
+
+
+def _flaky(request):
+    """503 on the first try of every batch"""
+    if request.attempt == 0:
+        return FakeResponse(None, status_code=503)
+
+
+def test_histogram_buckets_and_percentiles():
+    histogram = Histogram(buckets=(0.1, 1.0, float("inf")))
+    for value in (0.05, 0.1, 0.5, 2.0):
+        histogram.observe(value)
+    summary = histogram.summary()
+    assert summary["counts"] == [2, 1, 1]
+    assert summary["buckets"][-1] == "inf"
+    # Percentiles are bucket upper bounds, capped at the largest value seen
+    assert (summary["count"], summary["min"], summary["max"], summary["p50"], summary["p95"]) == (4, 0.05, 2.0, 1.0, 2.0)
+    assert summary["sum"] == 2.65 and not hasattr(histogram, "values")
+
+
+def test_count_rows():
+    df = pd.DataFrame({"a": range(3)})
+    result = FetchResult([[HEADERS, ["x", "1", "75019"]], None, [HEADERS]], FetchReport())
+    assert count_rows(df) == 3
+    assert count_rows(result) == 1
+    assert count_rows([df, df, None]) == 6
+    assert count_rows([]) is None and count_rows("text") is None
+
+
+def test_client_records_latency_bytes_retries_and_drops():
+    telemetry = Telemetry("test")
+    # ZCTA 00000 is never returned
+    session = FakeACS(Recording.synthetic(["75019", "75063"], HEADERS[:-1]), handler=_flaky)
+    client = CensusClient(session=session, rate=None, batch_size=2, variables="NAME,B25024_001E",
+                          backoff_base=0.0, telemetry=telemetry)
+    result = client.fetch(["75019", "75063", "00000"])
+    counters = telemetry.counters
+    assert counters["requests"] == 4 and counters["retries"] == 2
+    assert counters["dropped_zctas"] == 1 and telemetry.dropped == ["00000"]
+    assert counters["returned"] == 2
+    assert counters["bytes_downloaded"] == session.bytes > 0
+    assert telemetry.histograms["request_latency_s"].summary()["count"] == 4
+    assert telemetry.histograms["batch_latency_s"].summary()["count"] == 2
+    assert result.report.missing == ["00000"]
+
+
+def test_stage_times_failures_and_profiles(tmp_path):
+    telemetry = Telemetry("test", profile={"hot"}, profile_dir=tmp_path)
+    with telemetry.stage("hot", rows_in=10) as record:
+        sum(i * i for i in range(1000))
+        record["rows_out"] = 5
+    with pytest.raises(ValueError):
+        with telemetry.stage("broken"):
+            raise ValueError("boom")
+
+    hot, broken = telemetry.stages
+    assert (hot["rows_in"], hot["rows_out"]) == (10, 5) and hot["seconds"] >= 0
+    assert hot["profile"]["top"] and (tmp_path / f"{telemetry.run_id}-hot.prof").exists()
+    assert broken["status"] == "failed" and "profile" not in broken
+
+
+def test_threaded_stages_cannot_be_profiled():
+    assert parse_profile(" decode, merge ,") == ["decode", "merge"]
+    with pytest.raises(ValueError, match="Can't profile fetch"):
+        parse_profile("decode,fetch")
+    with pytest.raises(ValueError, match="worker threads"):
+        Telemetry("test", profile={"stream"})
+
+    from demographics.cli import add_fetch_arguments
+    parser = add_fetch_arguments(argparse.ArgumentParser())
+    assert parser.parse_args(["--profile", "merge"]).profile == ["merge"]
+    with pytest.raises(SystemExit):
+        parser.parse_args(["--profile", "fetch"])
+
+
+def test_timed_without_telemetry_is_a_no_op():
+    with timed(None, "fetch", 3) as record:
+        record["rows_out"] = 2
+    assert record == {"stage": "fetch", "rows_in": 3, "rows_out": 2}
+
+
+def test_run_report_appends_one_run_per_invocation(tmp_path):
+    path = tmp_path / "reports" / "runs.jsonl"
+    for command in ("first", "second"):
+        with run_report(Telemetry(command), path) as telemetry:
+            telemetry.count("requests", 2)
+    with pytest.raises(RuntimeError):
+        with run_report(Telemetry("third"), path):
+            raise RuntimeError
+
+    events = [json.loads(line) for line in path.read_text().splitlines()]
+    runs = [e for e in events if e["event"] == "run"]
+    assert [(r["command"], r["status"]) for r in runs] == [("first", "ok"), ("second", "ok"), ("third", "failed")]
+    assert len({r["run"] for r in runs}) == 3
+    assert [e.get("requests") for e in events if e["event"] == "counters"] == [2, 2, None]
+
+
+def test_pipeline_records_ran_and_cached_stages(tmp_path):
+    def stages():
+        return [Stage("source", lambda: pd.DataFrame({"a": range(4)})),
+                Stage("head", lambda df: df.head(2), after=("source",)),
+                Stage("report", lambda df: None, after=("head",), cache=False)]
+
+    first = Telemetry("test")
+    Pipeline(stages(), store=StageStore(tmp_path), telemetry=first).run("report")
+    assert [(s["stage"], s["status"], s["rows_in"], s["rows_out"]) for s in first.stages] == [
+        ("head", "miss", None, None), ("source", "miss", None, None),
+        ("source", "ran", None, 4), ("head", "ran", 4, 2), ("report", "ran", 2, None),
+    ]
+
+    second = Telemetry("test")
+    Pipeline(stages(), store=StageStore(tmp_path), telemetry=second).run("report")
+    assert [(s["stage"], s["status"], s["rows_out"]) for s in second.stages] == [
+        ("head", "cached", 2), ("report", "ran", None),
+    ]
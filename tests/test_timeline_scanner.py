@@ -0,0 +1,111 @@
+"""
+Unit tests for frontend/scripts/scan-timeline-commitments.py (timeline
+commitment scanner over the frontend copy and the Sanity export).
+"""
+import csv
+import importlib.util
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+SCRIPTS = Path(__file__).resolve().parents[1] / "frontend" / "scripts"
+
+
+def _load(name, filename):
+    spec = importlib.util.spec_from_file_location(name, SCRIPTS / filename)
+    module = importlib.util.module_from_spec(spec)
+    # Registered so the process pool can pickle the module's task function
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+scanner = _load("scan_timeline_commitments", "scan-timeline-commitments.py")
+
+
+@pytest.fixture
+def frontend(tmp_path):
+    (tmp_path / "app" / "thanks").mkdir(parents=True)
+    (tmp_path / "components" / "ui").mkdir(parents=True)
+    (tmp_path / "lib").mkdir()
+    (tmp_path / "node_modules").mkdir()
+    (tmp_path / "app" / "thanks" / "page.jsx").write_text(
+        "export const metadata = {\n"
+        "  description: 'A technician will call you within 2 business hours.',\n"
+        "}\n"
+        "const hours = 'Mon–Fri 7AM–6PM' // same-day when available\n")
+    (tmp_path / "components" / "LeadForm.jsx").write_text(
+        'const a = "Fill out the form and we\'ll call you within 2 business hours"\n'
+        "const b = 'Nothing to see here'\n")
+    (tmp_path / "components" / "ui" / "button.jsx").write_text("// same-day\n")
+    (tmp_path / "lib" / "services.js").write_text("export const x = 'Same-Day Service'\n")
+    (tmp_path / "lib" / "notes.md").write_text("same-day\n")
+    docs = [
+        {"_id": "siteSettings", "_type": "siteSettings", "title": "Site"},
+        {"_id": "faq-rs3", "_type": "faq", "question": "When are you open?",
+         "answer": "We answer calls early. Our office is open Monday-Friday, 7 AM - 6 PM. Call anytime."},
+        {"_id": "service-commercial-maintenance", "_type": "service",
+         "processSteps": [{"_key": "k", "title": "Step", "description": "We respond within 4 hours."}]},
+        {"_id": "testimonial-1", "_type": "testimonial", "text": "They came same-day!"},
+    ]
+    (tmp_path / "sanity-import.ndjson").write_text("".join(json.dumps(d) + "\n" for d in docs))
+    return tmp_path
+
+
+def test_source_files_skip_vendor_dirs_and_other_suffixes(frontend):
+    assert scanner.source_files(frontend) == [
+        "app/thanks/page.jsx", "components/LeadForm.jsx", "lib/services.js", "sanity-import.ndjson"]
+
+
+def test_scan_cites_file_lines_and_sanity_field_paths(frontend):
+    found = {(c["citation"], c["category"]): c for c in scanner.scan(frontend, workers=2)}
+    assert set(found) == {
+        ("app/thanks/page.jsx:2", "Response time"),
+        ("app/thanks/page.jsx:4", "Business hours"),
+        ("app/thanks/page.jsx:4", "Same-day dispatch"),
+        ("components/LeadForm.jsx:1", "Response time"),
+        ("lib/services.js:1", "Same-day dispatch"),
+        ("sanity-import.ndjson:2 (faq-rs3 answer)", "Business hours"),
+        ("sanity-import.ndjson:3 (service-commercial-maintenance processSteps[0].description)", "Response time"),
+    }
+    hours = found[("app/thanks/page.jsx:4", "Business hours")]
+    assert hours["phrases"] == ["Mon–Fri", "7AM–6PM"]
+    faq = found[("sanity-import.ndjson:2 (faq-rs3 answer)", "Business hours")]
+    assert faq["text"] == "Our office is open Monday-Friday, 7 AM - 6 PM."
+    assert faq["surface"] == "Sanity (faq)"
+
+
+def test_candidate_rows_recognise_audited_copy_after_line_drift():
+    audit = [
+        ["A01", "Response time", "", "", "", "", "Fill out the form and we'll call you within 2 business hours",
+         "", "components/LeadForm.jsx:25 (default prop)", "", ""],
+        ["I01", "Company history", "", "", "", "", "Since 1974.", "", "sanity-import.ndjson:9", "", ""],
+    ]
+    candidates = [
+        {"category": "Response time", "phrases": ["within 2 business hours"], "surface": "Source (code)",
+         "text": 'description = "Fill out the form and we\'ll call you within 2 business hours",',
+         "citation": "components/LeadForm.jsx:27"},
+        {"category": "Company history", "phrases": ["since 1974"], "surface": "Sanity (faq)",
+         "text": "Family-owned since 1974.", "citation": "sanity-import.ndjson:9 (faq-rs5 answer)"},
+        {"category": "Same-day dispatch", "phrases": ["same-day"], "surface": "Source (code)",
+         "text": "Same-day service", "citation": "components/LeadForm.jsx:40"},
+    ]
+    rows = scanner.candidate_rows(candidates, audit)
+    assert [(r[scanner.ID], r[scanner.STATUS]) for r in rows] == [
+        ("A01", "In audit (A01)"), ("I01", "In audit (I01)"), ("S003", "Candidate (not in audit)")]
+    assert all(len(r) == len(scanner.HEADERS) for r in rows)
+    first = dict(zip(scanner.HEADERS, rows[0]))
+    assert first["Timeframe (current)"] == "within 2 business hours"
+    assert first["Citation"] == "components/LeadForm.jsx:27"
+    assert first["Action promised"] == first["Live URL"] == ""
+
+
+def test_main_writes_audit_shaped_csv(frontend, tmp_path):
+    output = scanner.main(["--root", str(frontend), "--output", str(tmp_path / "out" / "candidates.csv"),
+                           "--workers", "1"])
+    with open(output, newline="", encoding="utf-8") as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == scanner.HEADERS
+    assert len(rows) == 1 + 7
@@ -0,0 +1,147 @@
+"""
+Unit tests for frontend/scripts/verify-timeline-audit.py (citation and Live
+URL checks for the timeline audit), with live pages served over localhost.
+"""
+import csv
+import importlib.util
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+SCRIPT = Path(__file__).resolve().parents[1] / "frontend" / "scripts" / "verify-timeline-audit.py"
+spec = importlib.util.spec_from_file_location("verify_timeline_audit", SCRIPT)
+verifier = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(verifier)
+
+NO_URL = "—"
+PAGES = {
+    "/request-service": "<p>We&apos;ll call you <!-- -->within <strong>2</strong> business hours</p>",
+    "/thanks?type=service": "<p>A technician will call you soon.</p>",
+}
+
+
+def _row(row_id, language, citation, url=NO_URL):
+    return [row_id, "Response time", "", "", "", "", language, "", citation, "", url]
+
+
+@pytest.fixture
+def frontend(tmp_path):
+    (tmp_path / "components").mkdir()
+    (tmp_path / "components" / "LeadForm.jsx").write_text(
+        "const LeadForm = ({\n"
+        "  title = 'Request Service',\n"
+        "  description = \"Fill out the form and we'll call you within 2 business hours\",\n"
+        "  successMessage = `Thanks, ${firstName}! We'll call you\n"
+        "    within 2 business hours.`,\n"
+        "}) => null\n")
+    docs = [{"_id": "faq-rs3", "_type": "faq", "answer": "Yes, we offer same-day HVAC repair."},
+            {"_id": "siteSettings", "_type": "siteSettings",
+             "processSteps": [{"_key": "a", "description": "A quote within 48 hours."}]}]
+    (tmp_path / "sanity-import.ndjson").write_text("".join(json.dumps(d) + "\n" for d in docs) + "}\n")
+    return tmp_path
+
+
+@pytest.fixture
+def site():
+    hits = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            hits.append(self.path)
+            body = PAGES.get(self.path)
+            status = 200 if body is not None else 404
+            data = (body or "missing").encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}", hits
+    server.shutdown()
+    server.server_close()
+
+
+def test_fragment_strips_notes_placeholders_and_ellipses():
+    assert verifier.fragment("[NEW IN P1.11] Thanks, {firstName}! We'll call you within 2 business hours.") == \
+        "we ll call you within 2 business hours"
+    assert verifier.fragment("comprehensive services including ... and same-day repairs.") == "comprehensive services including"
+    assert verifier.fragment("(field unset Feb 28, 2026 — no code consumers)") is None
+
+
+def test_parse_citation_forms():
+    assert verifier.parse_citation("components/LeadForm.jsx:25 (default prop)") == ("file", "components/LeadForm.jsx", 25, 25)
+    assert verifier.parse_citation("components/Footer.jsx:172-194") == ("file", "components/Footer.jsx", 172, 194)
+    assert verifier.parse_citation("app/financing/page.jsx (FAQ)") == ("file", "app/financing/page.jsx", None, None)
+    assert verifier.parse_citation("Sanity doc: service-x faqs[4].answer") == ("sanity", "service-x", "faqs[4].answer")
+    assert verifier.parse_citation("Sanity doc: contactPage (id SeG5Q)") == ("sanity", "SeG5Q", None)
+    assert verifier.parse_citation("Sanity doc: aboutPage (statistics array)") == ("sanity", "aboutPage", None)
+
+
+def test_citation_checks_find_drift(frontend):
+    rows = [
+        _row("A01", "Fill out the form and we'll call you within 2 business hours", "components/LeadForm.jsx:3"),
+        _row("A02", "Fill out the form and we'll call you within 2 business hours", "components/LeadForm.jsx:6"),
+        _row("A03", "Thanks, {firstName}! We'll call you within 2 business hours.", "components/LeadForm.jsx:4"),
+        _row("A04", "We'll call within one business day", "components/LeadForm.jsx:3"),
+        _row("A05", "Anything at all", "components/Missing.jsx:1"),
+        _row("B18", "Yes, we offer same-day HVAC repair", "Sanity doc: faq-rs3"),
+        _row("C03", "a quote within 48 hours", "Sanity doc: siteSettings processSteps[4].description"),
+        _row("C05", "within 2-4 hours", "Sanity doc: faq-c5"),
+        _row("A30", "(field unset)", "Sanity doc: siteSettings"),
+    ]
+    assert verifier.check_citations(rows, frontend, frontend / "sanity-import.ndjson") == [
+        "ok", "moved to line 3", "ok", "not in file", "file missing",
+        "ok", "moved to processSteps[0].description", "doc not in export", "not checked (no quoted copy)",
+    ]
+
+
+def test_export_summary_separates_a_stale_export_from_drift(frontend):
+    rows = [
+        _row("B18", "Yes, we offer same-day HVAC repair", "Sanity doc: faq-rs3"),
+        _row("C05", "within 2-4 hours", "Sanity doc: faq-c5"),
+        _row("C06", "within 4 hours", "Sanity doc: faq-c5 answer"),
+        _row("C07", "within 6 hours", "Sanity doc: contactPage (id SeG5Q)"),
+    ]
+    skipped = []
+    results = verifier.check_citations(rows, frontend, frontend / "sanity-import.ndjson", skipped)
+    assert results == ["ok", "doc not in export", "doc not in export", "doc not in export"]
+    assert skipped == [3]
+    assert verifier.missing_docs(rows, results) == ["faq-c5", "SeG5Q"]
+    summary = verifier.export_summary(rows, results, frontend / "sanity-import.ndjson", skipped)
+    assert summary[0].startswith("Source export sanity-import.ndjson lacks 2 cited docs (3 rows): faq-c5, SeG5Q.")
+    assert summary[1] == "Skipped 1 malformed line(s) of sanity-import.ndjson: 3"
+
+
+def test_main_checks_sanity_citations_against_source(frontend, tmp_path, capsys):
+    output = verifier.main(["--no-live", "--source", str(frontend / "sanity-import.ndjson"),
+                            "--output", str(tmp_path / "verified.csv")])
+    with open(output, newline="", encoding="utf-8") as f:
+        rows = list(csv.reader(f))
+    assert rows[0][-2:] == ["Citation check", "Live check"] and len(rows) == 1 + len(verifier.AUDIT.ROWS)
+    out = capsys.readouterr().out
+    assert "Skipped 1 malformed line(s) of sanity-import.ndjson: 3" in out
+    assert "lacks" in out and "--source" in out
+
+
+def test_live_check_fetches_each_url_once(site):
+    base, hits = site
+    rows = [
+        _row("A12", "we'll call you within 2 business hours", "x", f"{base}/request-service"),
+        _row("A13", "We'll call you within 2 business hours", "x", f"{base}/request-service"),
+        _row("A14", "within 2 business hours", "x", f"{base}/request-service"),
+        _row("A24", "A licensed technician will call you within 2 business hours", "x", f"{base}/thanks?type=service"),
+        _row("A25", "Anything at all", "x", f"{base}/gone"),
+        _row("A18", "Our dispatcher will call you", "x"),
+    ]
+    assert verifier.check_live(rows, NO_URL, workers=3) == [
+        "ok", "ok", "ok", "not on page", "HTTP 404", "n/a (no page)"]
+    assert sorted(hits) == ["/gone", "/request-service", "/thanks?type=service"]
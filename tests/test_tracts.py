@@ -0,0 +1,156 @@
+"""
+Unit tests for demographics.tracts (county-partitioned tract / block-group
+queries, zoning by tract centroid, chunked columnar output).
+"""
+import pandas as pd
+import pytest
+
+from demographics.client import CensusClient, FetchReport
+from demographics.columnar import have_arrow, load_columnar
+from demographics.quality import QualityError, QualityGuard
+from demographics.config import VARIABLE_SETS
+from demographics.spatial import HQ
+from demographics import tracts
+from demographics.tracts import add_zones, area_metrics, partitions, stream_areas, tract_zones
+from tests.conftest import FakeACS, FakeResponse
+
+TRACTS_PER_COUNTY = 3
+BLOCK_GROUPS_PER_TRACT = 2
+
+
+def _areas(fail=(), broken=()):
+    """Handler answering tract / block-group queries for any county
+
+    Counties in `fail` answer 500; those in `broken` have no housing units and suppressed income.
+    """
+    def handler(request):
+        county = request.within["county"]
+        if county in fail:
+            return FakeResponse(None, status_code=500)
+        block_groups = request.geography == "block group"
+        geo = ["state", "county", "tract"] + (["block group"] if block_groups else [])
+        rows = []
+        for t in range(TRACTS_PER_COUNTY):
+            tract = f"{100 + t:06d}"
+            for bg in range(BLOCK_GROUPS_PER_TRACT if block_groups else 1):
+                values = {"NAME": f"Tract {tract}", "B25024_001E": "100", "B25024_002E": str(40 + 10 * t),
+                          "B19013_001E": str(60000 + 1000 * t)}
+                if county in broken:
+                    values.update({"B25024_001E": "0", "B25024_002E": "0", "B19013_001E": "-666666666"})
+                ids = [request.within["state"], request.within["county"], tract, str(bg + 1)][:len(geo)]
+                rows.append([values.get(v, "5") for v in request.variables] + ids)
+        return FakeResponse([request.variables + geo] + rows)
+    return handler
+
+
+def _client(session, **kwargs):
+    return CensusClient(session=session, rate=None, backoff_base=0, max_retries=0, **kwargs)
+
+
+# Tract 000100 of Dallas County next to HQ, 000101 ~20 min out, 000102 well outside
+CENTROIDS = pd.DataFrame({
+    'Zip Code': ['48113000100', '48113000101', '48113000102'],
+    'Latitude': [HQ.lat + 0.01, HQ.lat + 0.12, HQ.lat + 2.0],
+    'Longitude': [HQ.lon, HQ.lon, HQ.lon],
+})
+
+
+def test_partitions_per_county():
+    assert partitions("tract", {"113": "Dallas"}) == {"state:48 county:113": "Dallas"}
+    assert partitions("block-group", {"085": "Collin"}) == {"state:48 county:085 tract:*": "Collin"}
+
+
+def test_fetch_areas_one_request_per_county_and_shard():
+    session = FakeACS(handler=_areas())
+    client = _client(session, variables=VARIABLE_SETS["market"], max_workers=4)
+    report = FetchReport()
+    results = dict(client.fetch_areas("tract", partitions("tract"), report))
+
+    assert len(results) == 10
+    assert sorted((c.within["county"], len(c.variables)) for c in session.calls) == sorted(
+        (c, n) for c in ["085", "113", "121", "139", "251", "257", "367", "397", "439", "497"] for n in (50, 6))
+    table = results["state:48 county:113"]
+    assert len(table) == 1 + TRACTS_PER_COUNTY
+    assert table[0][-1] == "B19001_017E" and table[0].count("tract") == 1
+    assert report.returned == 10 * TRACTS_PER_COUNTY
+
+
+def test_fetch_areas_runs_the_quality_guard(tmp_path):
+    guard = QualityGuard("quarantine", min_batch=1, quarantine_dir=tmp_path)
+    client = _client(FakeACS(handler=_areas(broken={"439"})), guard=guard)
+    report = FetchReport()
+    results = dict(client.fetch_areas("tract", partitions("tract"), report))
+
+    assert results["state:48 county:439"] is None
+    assert report.quarantined == ["state:48 county:439"]
+    assert report.returned == 9 * TRACTS_PER_COUNTY
+    [saved] = tmp_path.glob("*.json")
+    assert saved.name.endswith("-acs-acs5-state-48-county-439-batch00009.json")
+
+    failing = _client(FakeACS(handler=_areas(broken={"113"})), guard=QualityGuard("fail", min_batch=1))
+    with pytest.raises(QualityError, match="zero housing units"):
+        stream_areas(failing, "tract", tmp_path / "out.csv", counties={"113": "Dallas"})
+
+
+def test_area_metrics_builds_geoids():
+    table = FakeACS(handler=_areas()).get(
+        "u?get=NAME,B25024_001E,B25024_002E,B19013_001E&for=block%20group:*&in=state:48%20county:113%20tract:*").json()
+    df = area_metrics([table])
+    assert df['GEOID'].tolist()[:2] == ['481130001001', '481130001002']
+    assert set(df['County']) == {'Dallas'}
+    assert df['% Single-Family Detached'].tolist()[::2] == [40.0, 50.0, 60.0]
+
+
+def test_block_groups_take_their_tracts_zone():
+    zones = tract_zones(CENTROIDS)
+    assert zones['Primary Zone'].to_dict() == {'48113000100': 1, '48113000101': 2}
+
+    df = add_zones(pd.DataFrame({'GEOID': ['481130001001', '481130001011', '481130001021'], 'County': 'Dallas'}), zones)
+    assert df['Primary Zone'].tolist()[:2] == [1, 2]
+    assert df['Primary Zone'].isna().tolist() == [False, False, True]
+    assert add_zones(df[['GEOID', 'County']]).filter(like='Zone').isna().all().all()
+
+
+def test_stream_areas_chunks_and_totals(tmp_path):
+    out = tmp_path / "tracts.csv"
+    report = FetchReport()
+    totals = stream_areas(_client(FakeACS(handler=_areas(fail={"439"})), max_workers=3), "tract", out,
+                          zones=tract_zones(CENTROIDS), report=report, chunk_rows=4)
+
+    df = pd.read_csv(out, dtype={'GEOID': str})
+    assert len(df) == 9 * TRACTS_PER_COUNTY == totals.areas
+    assert list(report.failed) == ["state:48 county:439"]
+    assert list(df.columns[:5]) == ['GEOID', 'County', 'Primary Zone', 'Drive Time (min)', 'Nearest Depot']
+
+    table = totals.table().set_index('Primary Zone')
+    assert table.loc[1, 'Areas'] == table.loc[2, 'Areas'] == 1
+    assert table.loc[0, 'Areas'] == 9 * TRACTS_PER_COUNTY - 2
+    assert table.loc[2, 'Unit-Weighted Median Income'] == 61000
+    assert table['Total Housing Units'].sum() == 100 * totals.areas
+
+    if have_arrow():
+        columnar = load_columnar(out.with_suffix('.arrow'))
+        assert len(columnar) == len(df)
+        assert columnar['Primary Zone'].dropna().tolist() == [1, 2]
+
+
+@pytest.mark.parametrize("level, rows", [("tract", TRACTS_PER_COUNTY),
+                                         ("block-group", TRACTS_PER_COUNTY * BLOCK_GROUPS_PER_TRACT)])
+def test_stream_levels(tmp_path, level, rows):
+    totals = stream_areas(_client(FakeACS(handler=_areas())), level, tmp_path / "out.csv", counties={"113": "Dallas"})
+    assert totals.areas == rows
+
+
+def test_cli_needs_centroids_or_no_zones(tmp_path, monkeypatch, capsys):
+    session = FakeACS(handler=_areas())
+    monkeypatch.setattr(tracts, "client_from_args", lambda args, telemetry=None: _client(session))
+    argv = ["--centroids", str(tmp_path / "missing.txt"), "--counties", "113", "--run-report", "",
+            "--out", str(tmp_path / "tracts.csv")]
+    with pytest.raises(SystemExit, match="No tract centroids at .*--no-zones"):
+        tracts.main(argv)
+    assert session.calls == []
+
+    tracts.main(argv + ["--no-zones"])
+    assert "writing rows without zones (--no-zones)" in capsys.readouterr().out
+    df = pd.read_csv(tmp_path / "tracts.csv")
+    assert len(df) == TRACTS_PER_COUNTY and df['Primary Zone'].isna().all()
@@ -0,0 +1,91 @@
+"""
+Unit tests for demographics.workbook (write-only Excel export of the master
+service area: per-zone sheets, summary, market sheets, named styles).
+"""
+import openpyxl
+import pandas as pd
+
+from demographics.market import market_size
+from demographics.workbook import ServiceAreaWorkbook, column_style, save_workbook
+
+MASTER = pd.DataFrame({
+    'Zip Code': ['75019', '75063', '75067', '76051', '75002'],
+    'City': ['Coppell', 'Irving', 'Lewisville', 'Grapevine', 'Allen'],
+    'Primary Zone': [1, 1, 2, 3, 4],
+    'Zone 1 (%)': [100.0, 73.6, 0.0, 0.0, 0.0],
+    'Zone 2 (%)': [0.0, 26.4, 100.0, 40.0, 0.0],
+    'Zone 3 (%)': [0.0, 0.0, 0.0, 60.0, 0.0],
+    'Zone 4 (%)': [0.0, 0.0, 0.0, 0.0, 100.0],
+    'Total Housing Units': [1000, 2000, 0, 500, 800],
+    'Single-Family Detached': [600, 1000, 0, 400, 700],
+    '% Single-Family Detached': [60.0, 50.0, 0.0, 80.0, 87.5],
+    'Other Dwellings': [400, 1000, 0, 100, 100],
+    '% Other': [40.0, 50.0, 0.0, 20.0, 12.5],
+    'Median Household Income': [90000.0, None, 70000.0, 110000.0, 120000.0],
+})
+
+
+def _rows(sheet):
+    return [list(r) for r in sheet.iter_rows(values_only=True)]
+
+
+def test_workbook_sheets_rows_and_styles(tmp_path):
+    by_zone, by_city = market_size(MASTER)
+    path = save_workbook(MASTER, by_zone, by_city, path=tmp_path / "master.xlsx")
+    book = openpyxl.load_workbook(path)
+    assert book.sheetnames == ['Summary', 'Zone 1', 'Zone 2', 'Zone 3', 'Zone 4', 'Market by Zone', 'Market by City']
+
+    zone1 = book['Zone 1']
+    assert _rows(zone1)[0] == list(MASTER.columns)
+    assert [r[0] for r in _rows(zone1)[1:]] == ['75019', '75063']
+    assert zone1['M3'].value is None  # missing income stays an empty cell
+    assert zone1.freeze_panes == 'A2' and zone1.auto_filter.ref == 'A1:M3'
+    assert (zone1['A1'].style, zone1['A2'].style, zone1['H2'].style, zone1['J2'].style, zone1['M2'].style) == \
+        ('dfw_header', 'dfw_text', 'dfw_count', 'dfw_percent', 'dfw_currency')
+    assert zone1['M2'].number_format == '$#,##0'
+
+    summary = _rows(book['Summary'])
+    assert summary[1] == ['Zone 1', 2, 3000, 1600, 53.3, 90000]
+    assert summary[-1] == ['Total', 5, 4300, 2700, 62.8, 97500]
+    assert book['Summary']['A6'].style == 'dfw_total' and book['Summary']['E6'].number_format == '0.0'
+    assert len(_rows(book['Market by City'])) == len(by_city) + 1
+    assert {s if isinstance(s, str) else s.name for s in book.named_styles} >= \
+        {'dfw_header', 'dfw_text', 'dfw_count', 'dfw_percent', 'dfw_currency', 'dfw_year', 'dfw_total'}
+
+    by_zone_sheet = book['Market by Zone']
+    headers = [c.value for c in by_zone_sheet[1]]
+    band = by_zone_sheet.cell(2, headers.index('Addressable Income N/A') + 1)
+    assert (band.style, band.number_format) == ('dfw_count', '#,##0')
+
+
+def test_year_and_band_columns_are_not_currency(tmp_path):
+    master = MASTER.assign(**{'Median Year Built': [1985, 1978, None, 2004, 1999]})
+    path = save_workbook(master, path=tmp_path / "years.xlsx")
+    zone1 = openpyxl.load_workbook(path)['Zone 1']
+    assert zone1['N1'].value == 'Median Year Built'
+    assert (zone1['N2'].value, zone1['N2'].style, zone1['N2'].number_format) == (1985, 'dfw_year', '0')
+
+
+def test_chunked_appends_match_one_append(tmp_path):
+    whole = ServiceAreaWorkbook(tmp_path / "whole.xlsx", MASTER.columns)
+    whole.append(MASTER)
+    chunked = ServiceAreaWorkbook(tmp_path / "chunked.xlsx", MASTER.columns)
+    for start in range(0, len(MASTER), 2):
+        chunked.append(MASTER.iloc[start:start + 2])
+    assert chunked.book.write_only
+    pd.testing.assert_frame_equal(whole.summary(), chunked.summary())
+
+    books = [openpyxl.load_workbook(b.close()) for b in (whole, chunked)]
+    for name in books[0].sheetnames:
+        assert _rows(books[0][name]) == _rows(books[1][name])
+    assert not (tmp_path / "whole.xlsx.tmp").exists()
+
+
+def test_column_styles():
+    assert column_style('Zip Code') == 'dfw_text'
+    assert column_style('Zone 2 (%)') == column_style('% Owner Occupied') == 'dfw_percent'
+    assert column_style('Avg Median Income') == column_style('Median Home Value') == 'dfw_currency'
+    assert column_style('Revenue Potential (Low)') == 'dfw_currency'
+    assert column_style('Addressable Homes') == column_style('Addressable Income N/A') == 'dfw_count'
+    assert column_style('Addressable $150k+') == column_style('Households $100k+') == 'dfw_count'
+    assert column_style('Median Year Built') == 'dfw_year'
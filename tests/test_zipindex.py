@@ -0,0 +1,71 @@
+"""
+Unit tests for demographics.zipindex (build, versioning, constant-time lookups).
+"""
+import json
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from demographics.zipindex import ZipIndex, ZipRecord, build_index, load_index, normalize_zip, write_index
+
+ROOT = Path(__file__).resolve().parents[1]
+MASTER_CSV = ROOT / "frontend/internal/DFW_HVAC_Master_Service_Area.csv"
+SHIPPED_INDEX = ROOT / "frontend/internal/DFW_HVAC_Zip_Index.json"
+
+
+@pytest.fixture(scope="module")
+def master():
+    return pd.read_csv(MASTER_CSV, dtype={'Zip Code': str})
+
+
+def test_every_master_row_round_trips(tmp_path, master):
+    index = ZipIndex.load(write_index(master, tmp_path / "index.json"))
+    assert len(index) == len(master)
+    for row in master.itertuples(index=False):
+        record = index[row[0]]
+        assert record.primary_zone == row[2]
+        assert record.city == row[1]
+        assert record.zone_pct == tuple(row[3:7])
+        assert record.total_units == row[7]
+        assert record.sf_pct == row[9]
+        if pd.isna(row[12]):
+            assert record.median_income is None
+        else:
+            assert record.median_income == int(row[12])
+
+
+def test_shipped_index_matches_master(master):
+    assert json.loads(SHIPPED_INDEX.read_text()) == json.loads(json.dumps(build_index(master)))
+
+
+def test_lookup_normalizes_zip_input(master):
+    index = ZipIndex(build_index(master))
+    record = index.get(" 75019-1234 ")
+    assert isinstance(record, ZipRecord)
+    assert (record.zip_code, record.primary_zone, record.city) == ("75019", 1, "Coppell")
+    assert index.get(75019) == record
+    assert normalize_zip(1001) == "01001"
+
+
+def test_unknown_zip(master):
+    index = ZipIndex(build_index(master))
+    assert index.get("99999") is None
+    assert "99999" not in index
+    with pytest.raises(KeyError):
+        index["99999"]
+
+
+def test_other_versions_are_rejected(master):
+    payload = build_index(master)
+    payload["version"] = 0
+    with pytest.raises(ValueError, match="version"):
+        ZipIndex(payload)
+
+
+def test_load_index_is_cached(tmp_path, master):
+    path = str(write_index(master, tmp_path / "index.json"))
+    try:
+        assert load_index(path) is load_index(path)
+    finally:
+        load_index.cache_clear()
@@ -0,0 +1,84 @@
+"""
+Regression tests for demographics.zones against the committed master CSV and
+the row-wise apply() implementation it replaced.
+"""
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from demographics.zones import primary_zone, sort_by_zone
+
+MASTER_CSV = Path(__file__).resolve().parents[1] / "frontend/internal/DFW_HVAC_Master_Service_Area.csv"
+
+
+@pytest.fixture(scope="module")
+def master():
+    return pd.read_csv(MASTER_CSV, dtype={'Zip Code': str})
+
+
+def legacy_zone_sort(df):
+    """The apply()-based classification + tuple Sort Key from merge_service_area"""
+    df = df.copy()
+
+    def get_primary_zone(row):
+        if row['Zone 1 (%)'] > 0:
+            return 1
+        elif row['Zone 2 (%)'] > 0:
+            return 2
+        elif row['Zone 3 (%)'] > 0:
+            return 3
+        else:
+            return 4
+
+    df['Primary Zone'] = df.apply(get_primary_zone, axis=1)
+    df['Sort Key'] = df.apply(
+        lambda r: (r['Primary Zone'], -r[f"Zone {int(r['Primary Zone'])} (%)"]), axis=1
+    )
+    return df.sort_values('Sort Key').drop('Sort Key', axis=1)
+
+
+def _sort_key(df):
+    zone = df['Primary Zone'].to_numpy()
+    pct = df[[f"Zone {z} (%)" for z in (1, 2, 3, 4)]].to_numpy()[np.arange(len(df)), zone - 1]
+    return list(zip(zone.tolist(), pct.tolist()))
+
+
+def test_master_csv_order_is_unchanged(master):
+    df = master.drop(columns=['Primary Zone'])
+    df['Primary Zone'] = primary_zone(df)
+    result = sort_by_zone(df)[master.columns]
+
+    pd.testing.assert_frame_equal(result.reset_index(drop=True), master)
+
+
+def test_primary_zone_matches_apply(master):
+    expected = legacy_zone_sort(master).sort_index()['Primary Zone']
+    assert primary_zone(master).tolist() == expected.tolist()
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_ordering_matches_legacy_sort_key(master, seed):
+    shuffled = master.drop(columns=['Primary Zone']).sample(frac=1, random_state=seed)
+    expected = legacy_zone_sort(shuffled)
+
+    df = shuffled.copy()
+    df['Primary Zone'] = primary_zone(df)
+    result = sort_by_zone(df)
+
+    # Same (zone, pct) sequence; ties now keep input order instead of quicksort's
+    assert _sort_key(result) == _sort_key(expected)
+    assert sorted(result['Zip Code']) == sorted(expected['Zip Code'])
+
+
+def test_ties_keep_input_order():
+    df = pd.DataFrame({
+        'Zip Code': ['a', 'b', 'c', 'd'],
+        'Zone 1 (%)': [0, 100, 0, 100],
+        'Zone 2 (%)': [50, 0, 50, 0],
+        'Zone 3 (%)': [0, 0, 0, 0],
+        'Zone 4 (%)': [0, 0, 0, 0],
+    })
+    df['Primary Zone'] = primary_zone(df)
+    assert sort_by_zone(df)['Zip Code'].tolist() == ['b', 'd', 'a', 'c']